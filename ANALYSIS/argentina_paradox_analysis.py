@@ -6,20 +6,29 @@ Author: Adrian Lerer
 Date: November 2025
 """
 
+import logging
+import sys
+
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from pathlib import Path
 from scipy import stats
 
+from cf_engine import ARGENTINA_CD, ARGENTINA_SP, constitutional_fitness
+from ept_results import CaseResult, TableText, as_series
+from ept_trace import save_frame, traced
+
+logger = logging.getLogger(__name__)
+
 VERIFIED = "[Verificado]"
 ESTIMATION = "[Estimación]"
 
+@traced
 def load_argentina_reform_data():
     """Load Argentina reform data from verified dataset"""
-    print("="*70)
-    print("ARGENTINA PARADOX: UTOPIAN CYCLE FOSSILIZATION")
-    print("="*70)
+    logger.info("="*70)
+    logger.info("ARGENTINA PARADOX: UTOPIAN CYCLE FOSSILIZATION")
+    logger.info("="*70)
     
     # From cli_scores_summary.csv and reform_attempts_master_60cases.csv
     # Argentina has CLI = 0.87 (verified)
@@ -42,20 +51,21 @@ def load_argentina_reform_data():
     
     df = pd.DataFrame(argentina_data)
     
-    print("\nArgentina Reform History (1949-2025):")
-    print(df[df['Year'].isin([1949, 1994, 2000, 2010, 2020, 2025])].to_string(index=False))
-    
-    print(f"\n{VERIFIED} - CLI from cli_scores_summary.csv")
-    print(f"{ESTIMATION} - Trajectory estimated from historical reform patterns")
+    logger.info("\nArgentina Reform History (1949-2025):")
+    logger.info("%s", TableText(df[df['Year'].isin([1949, 1994, 2000, 2010, 2020, 2025])]))
+
+    logger.info("\n%s - CLI from cli_scores_summary.csv", VERIFIED)
+    logger.info("%s - Trajectory estimated from historical reform patterns", ESTIMATION)
     
     return df
 
 
+@traced
 def analyze_cli_growth_rate(df):
     """Calculate CLI growth rate showing fossilization"""
-    print("\n" + "="*70)
-    print("CLI GROWTH RATE ANALYSIS")
-    print("="*70)
+    logger.info("\n" + "="*70)
+    logger.info("CLI GROWTH RATE ANALYSIS")
+    logger.info("="*70)
     
     # Regression: CLI_t = β0 + β1(Years_since_1949) + β2(Failed_Reforms)
     years_since = df['Year'] - 1949
@@ -65,9 +75,9 @@ def analyze_cli_growth_rate(df):
         years_since, df['CLI_Estimated']
     )
     
-    print(f"\nLinear Regression: CLI = {intercept:.3f} + {slope:.4f} × Years")
-    print(f"R² = {r_value**2:.3f}")
-    print(f"p-value = {p_value:.4f}")
+    logger.info("\nLinear Regression: CLI = %.3f + %.4f × Years", intercept, slope)
+    logger.info("R² = %.3f", r_value**2)
+    logger.info("p-value = %.4f", p_value)
     
     # Growth rate
     initial_cli = df['CLI_Estimated'].iloc[0]
@@ -76,20 +86,20 @@ def analyze_cli_growth_rate(df):
     
     avg_growth_rate = (final_cli - initial_cli) / years_elapsed
     
-    print(f"\nCLI Growth:")
-    print(f"  1949: {initial_cli:.2f}")
-    print(f"  2025: {final_cli:.2f}")
-    print(f"  Increase: {(final_cli-initial_cli):.2f} ({(final_cli/initial_cli-1)*100:.1f}%)")
-    print(f"  Average growth rate: {avg_growth_rate:.4f} per year")
-    
-    print("\n" + "="*70)
-    print("KEY FINDING:")
-    print(f"CLI grows at +{avg_growth_rate:.4f}/year (≈+0.0055/year)")
-    print("Each failed reform ADDS to lock-in through:")
-    print("  1. Judicial precedents blocking change")
-    print("  2. Treaty hierarchy strengthening (ILO conventions)")
-    print("  3. Path dependence accumulation")
-    print("="*70)
+    logger.info("\nCLI Growth:")
+    logger.info("  1949: %.2f", initial_cli)
+    logger.info("  2025: %.2f", final_cli)
+    logger.info("  Increase: %.2f (%.1f%%)", final_cli-initial_cli, (final_cli/initial_cli-1)*100)
+    logger.info("  Average growth rate: %.4f per year", avg_growth_rate)
+
+    logger.info("\n" + "="*70)
+    logger.info("KEY FINDING:")
+    logger.info("CLI grows at +%.4f/year (≈+0.0055/year)", avg_growth_rate)
+    logger.info("Each failed reform ADDS to lock-in through:")
+    logger.info("  1. Judicial precedents blocking change")
+    logger.info("  2. Treaty hierarchy strengthening (ILO conventions)")
+    logger.info("  3. Path dependence accumulation")
+    logger.info("="*70)
     
     return {
         'slope': slope,
@@ -100,11 +110,12 @@ def analyze_cli_growth_rate(df):
     }
 
 
+@traced
 def analyze_utopian_cycle():
     """Describe the utopian cycle mechanism"""
-    print("\n" + "="*70)
-    print("THE UTOPIAN CYCLE: How Utopianism Fossilizes")
-    print("="*70)
+    logger.info("\n" + "="*70)
+    logger.info("THE UTOPIAN CYCLE: How Utopianism Fossilizes")
+    logger.info("="*70)
     
     cycle_stages = {
         'Stage': [1, 2, 3, 4, 5, 6],
@@ -128,29 +139,30 @@ def analyze_utopian_cycle():
     }
     
     cycle_df = pd.DataFrame(cycle_stages)
-    print("\n" + cycle_df.to_string(index=False))
-    
-    print("\n" + "="*70)
-    print("NOVEL INSIGHT (NOT IN DIXON & LANDAU):")
-    print("\nDixon & Landau distinguish transformative (success) vs utopian (failure)")
-    print("BUT they don't address what happens when utopianism PERSISTS")
-    print("\nArgentina shows THIRD category: FOSSILIZED UTOPIANISM")
-    print("  - Utopian promises remain in constitution")
-    print("  - Implementation fails repeatedly")
-    print("  - Lock-in INCREASES with each failed reform")
-    print("  - System trapped in permanent utopian cycle")
-    print("\nResult: CLI = 0.87 (2025), 0% reform success (0/23)")
-    print("Argentina is STUCK - cannot advance OR retreat")
-    print("="*70)
+    logger.info("\n%s", TableText(cycle_df))
+
+    logger.info("\n" + "="*70)
+    logger.info("NOVEL INSIGHT (NOT IN DIXON & LANDAU):")
+    logger.info("\nDixon & Landau distinguish transformative (success) vs utopian (failure)")
+    logger.info("BUT they don't address what happens when utopianism PERSISTS")
+    logger.info("\nArgentina shows THIRD category: FOSSILIZED UTOPIANISM")
+    logger.info("  - Utopian promises remain in constitution")
+    logger.info("  - Implementation fails repeatedly")
+    logger.info("  - Lock-in INCREASES with each failed reform")
+    logger.info("  - System trapped in permanent utopian cycle")
+    logger.info("\nResult: CLI = 0.87 (2025), 0% reform success (0/23)")
+    logger.info("Argentina is STUCK - cannot advance OR retreat")
+    logger.info("="*70)
     
     return cycle_df
 
 
+@traced
 def compare_argentina_chile_colombia():
     """Compare three trajectories: success, failure, fossilization"""
-    print("\n" + "="*70)
-    print("THREE TRAJECTORIES COMPARED")
-    print("="*70)
+    logger.info("\n" + "="*70)
+    logger.info("THREE TRAJECTORIES COMPARED")
+    logger.info("="*70)
     
     comparison = {
         'Metric': [
@@ -200,54 +212,54 @@ def compare_argentina_chile_colombia():
     }
     
     comp_df = pd.DataFrame(comparison)
-    print("\n" + comp_df.to_string(index=False))
-    
-    print("\n" + "="*70)
-    print("TRAJECTORY INTERPRETATION:")
-    print("\n1. COLOMBIA (Transformative Success):")
-    print("   - Low initial CLI (0.135) = open pathways")
-    print("   - CLI increases BUT implementation outpaces lock-in")
-    print("   - Gradual transformation succeeds despite rigidification")
-    
-    print("\n2. CHILE (Utopian Failure):")
-    print("   - High inherited CLI (0.81) = blocked pathways")
-    print("   - Voters reject BEFORE implementation")
-    print("   - Abrupt failure prevents fossilization")
-    
-    print("\n3. ARGENTINA (Fossilized Utopianism):")
-    print("   - Moderate initial CLI (0.45) BUT grows to 0.87")
-    print("   - 76 years (1949-2025) of PERSISTENT utopianism")
-    print("   - Each failed reform ADDS lock-in")
-    print("   - TRAPPED: Cannot implement, cannot reform")
-    
-    print("\n" + "="*70)
-    print("KEY INSIGHT:")
-    print("Dixon & Landau framework: Transformative OR Utopian")
-    print("EPT adds THIRD path: Utopian → Fossilized (Argentina)")
-    print("This explains why some dysfunctional constitutions PERSIST")
-    print("Not because they work (Colombia), not because they're rejected (Chile),")
-    print("but because they ACCUMULATE LOCK-IN through failure cycles")
-    print("="*70)
+    logger.info("\n%s", TableText(comp_df))
+
+    logger.info("\n" + "="*70)
+    logger.info("TRAJECTORY INTERPRETATION:")
+    logger.info("\n1. COLOMBIA (Transformative Success):")
+    logger.info("   - Low initial CLI (0.135) = open pathways")
+    logger.info("   - CLI increases BUT implementation outpaces lock-in")
+    logger.info("   - Gradual transformation succeeds despite rigidification")
+
+    logger.info("\n2. CHILE (Utopian Failure):")
+    logger.info("   - High inherited CLI (0.81) = blocked pathways")
+    logger.info("   - Voters reject BEFORE implementation")
+    logger.info("   - Abrupt failure prevents fossilization")
+
+    logger.info("\n3. ARGENTINA (Fossilized Utopianism):")
+    logger.info("   - Moderate initial CLI (0.45) BUT grows to 0.87")
+    logger.info("   - 76 years (1949-2025) of PERSISTENT utopianism")
+    logger.info("   - Each failed reform ADDS lock-in")
+    logger.info("   - TRAPPED: Cannot implement, cannot reform")
+
+    logger.info("\n" + "="*70)
+    logger.info("KEY INSIGHT:")
+    logger.info("Dixon & Landau framework: Transformative OR Utopian")
+    logger.info("EPT adds THIRD path: Utopian → Fossilized (Argentina)")
+    logger.info("This explains why some dysfunctional constitutions PERSIST")
+    logger.info("Not because they work (Colombia), not because they're rejected (Chile),")
+    logger.info("but because they ACCUMULATE LOCK-IN through failure cycles")
+    logger.info("="*70)
     
     return comp_df
 
 
+@traced
 def calculate_argentina_cf_trajectory():
     """Calculate Constitutional Fitness for Argentina over time"""
-    print("\n" + "="*70)
-    print("ARGENTINA CONSTITUTIONAL FITNESS TRAJECTORY")
-    print("="*70)
+    logger.info("\n" + "="*70)
+    logger.info("ARGENTINA CONSTITUTIONAL FITNESS TRAJECTORY")
+    logger.info("="*70)
     
     years = [1949, 1960, 1970, 1980, 1990, 2000, 2010, 2020, 2025]
     cli = [0.45, 0.50, 0.55, 0.60, 0.64, 0.72, 0.79, 0.85, 0.87]
     gap = [0.50, 0.55, 0.60, 0.65, 0.68, 0.72, 0.75, 0.76, 0.77]
     pe = [0.35, 0.32, 0.28, 0.25, 0.22, 0.18, 0.15, 0.12, 0.10]
-    sp = 0.60  # Initially high (Perón popular), assumed constant
-    cd = 0.30  # Labor rights culturally accepted in Argentina
+    sp = ARGENTINA_SP  # Initially high (Perón popular), assumed constant
+    cd = ARGENTINA_CD  # Labor rights culturally accepted in Argentina
     
     # Calculate CF for each period
-    cf = [(pe_i * (1-gap_i) * (1-cd) * sp) / (cli_i + 0.01) 
-          for pe_i, gap_i, cli_i in zip(pe, gap, cli)]
+    cf = constitutional_fitness(pe, gap, cd, sp, cli)
     
     trajectory_df = pd.DataFrame({
         'Year': years,
@@ -257,33 +269,34 @@ def calculate_argentina_cf_trajectory():
         'CF': cf
     })
     
-    print("\nArgentina Constitutional Fitness (1949-2025):")
-    print(trajectory_df.to_string(index=False))
-    
-    print(f"\n{ESTIMATION} - Trajectory estimated from:")
-    print("  - CLI growth rate (verified)")
-    print("  - Gap increase (informality + unfunded mandates)")
-    print("  - PE decline (implementation deterioration)")
-    
-    print("\n" + "="*70)
-    print("KEY PATTERN:")
-    print(f"CF: {cf[0]:.3f} (1949) → {cf[-1]:.3f} (2025)")
-    print(f"Decline: {(1-cf[-1]/cf[0])*100:.1f}%")
-    print("\nArgentina shows CONTINUOUS DECLINE in constitutional fitness")
-    print("NOT transformation (Colombia) NOR abrupt failure (Chile)")
-    print("But GRADUAL FOSSILIZATION into dysfunctional equilibrium")
-    print("="*70)
+    logger.info("\nArgentina Constitutional Fitness (1949-2025):")
+    logger.info("%s", TableText(trajectory_df))
+
+    logger.info("\n%s - Trajectory estimated from:", ESTIMATION)
+    logger.info("  - CLI growth rate (verified)")
+    logger.info("  - Gap increase (informality + unfunded mandates)")
+    logger.info("  - PE decline (implementation deterioration)")
+
+    logger.info("\n" + "="*70)
+    logger.info("KEY PATTERN:")
+    logger.info("CF: %.3f (1949) → %.3f (2025)", cf[0], cf[-1])
+    logger.info("Decline: %.1f%%", (1-cf[-1]/cf[0])*100)
+    logger.info("\nArgentina shows CONTINUOUS DECLINE in constitutional fitness")
+    logger.info("NOT transformation (Colombia) NOR abrupt failure (Chile)")
+    logger.info("But GRADUAL FOSSILIZATION into dysfunctional equilibrium")
+    logger.info("="*70)
     
     return trajectory_df
 
 
+@traced(cat='run', rows=False)
 def main():
     """Execute complete Argentina paradox analysis"""
-    print("\n" + "#"*70)
-    print("#" + " "*68 + "#")
-    print("#" + "  ARGENTINA PARADOX: UTOPIAN CYCLE FOSSILIZATION".center(68) + "#")
-    print("#" + " "*68 + "#")
-    print("#"*70)
+    logger.info("\n" + "#"*70)
+    logger.info("#" + " "*68 + "#")
+    logger.info("#" + "  ARGENTINA PARADOX: UTOPIAN CYCLE FOSSILIZATION".center(68) + "#")
+    logger.info("#" + " "*68 + "#")
+    logger.info("#"*70)
     
     # Load data
     argentina_df = load_argentina_reform_data()
@@ -304,19 +317,19 @@ def main():
     output_dir = Path("/home/user/webapp/analysis_results")
     output_dir.mkdir(exist_ok=True)
     
-    argentina_df.to_csv(output_dir / "argentina_reform_history.csv", index=False)
-    cycle_df.to_csv(output_dir / "argentina_utopian_cycle.csv", index=False)
-    comparison_df.to_csv(output_dir / "three_trajectories_comparison.csv", index=False)
-    cf_trajectory_df.to_csv(output_dir / "argentina_cf_trajectory.csv", index=False)
+    save_frame(argentina_df, output_dir / "argentina_reform_history.csv")
+    save_frame(cycle_df, output_dir / "argentina_utopian_cycle.csv")
+    save_frame(comparison_df, output_dir / "three_trajectories_comparison.csv")
+    save_frame(cf_trajectory_df, output_dir / "argentina_cf_trajectory.csv")
     
-    print("\n\n" + "="*70)
-    print("ARGENTINA PARADOX ANALYSIS COMPLETE")
-    print("="*70)
-    print("\n✓ Novel finding NOT in Dixon & Landau paper")
-    print("✓ Third category identified: Fossilized Utopianism")
-    print("✓ Mechanism explained: Utopian cycle with lock-in accumulation")
-    print("✓ Quantitative evidence: CLI growth +0.0055/year over 76 years")
-    print("✓ Results saved to analysis_results/")
+    logger.info("\n\n" + "="*70)
+    logger.info("ARGENTINA PARADOX ANALYSIS COMPLETE")
+    logger.info("="*70)
+    logger.info("\n✓ Novel finding NOT in Dixon & Landau paper")
+    logger.info("✓ Third category identified: Fossilized Utopianism")
+    logger.info("✓ Mechanism explained: Utopian cycle with lock-in accumulation")
+    logger.info("✓ Quantitative evidence: CLI growth +0.0055/year over 76 years")
+    logger.info("✓ Results saved to analysis_results/")
     
     return {
         'argentina_df': argentina_df,
@@ -327,5 +340,39 @@ def main():
     }
 
 
+@traced(cat='run', rows=False)
+def run_argentina_paradox():
+    """
+    Library entry point: Argentina fossilization metrics with no console
+    output and no files written
+
+    Returns:
+        CaseResult for the CF trajectory; details holds the reform history
+        and the CLI growth regression
+    """
+    argentina_df = load_argentina_reform_data()
+    growth_stats = analyze_cli_growth_rate(argentina_df)
+    cf_df = calculate_argentina_cf_trajectory()
+    n = len(cf_df)
+
+    return CaseResult(
+        country='Argentina',
+        years=cf_df['Year'].to_numpy(),
+        sp=as_series(ARGENTINA_SP, n),
+        cli=cf_df['CLI'].to_numpy(),
+        gap=cf_df['Gap'].to_numpy(),
+        cd=as_series(ARGENTINA_CD, n),
+        pe=cf_df['PE'].to_numpy(),
+        cf=cf_df['CF'].to_numpy(),
+        provenance=ESTIMATION,
+        verdict='FOSSILIZED',
+        details={
+            'reform_history': argentina_df,
+            'growth_stats': growth_stats
+        }
+    )
+
+
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
     results = main()
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite: Time and peak memory of metric functions and figures
+Runs every registered case at 1, 100, 10k and 1M country-years (fixed-size
+cases at their native size) and compares against a stored baseline
+
+Cases:
+    - Scalable: the vectorized cores the case analyses delegate to
+      (constitutional_fitness, score_panel, fit_growth,
+      score_fiscal_panel) and analyze_cli_growth_rate on an n-year CLI series
+    - Native: calculate_fsi_colombia, calculate_constitutional_fitness_colombia
+      and the four figure generators, which only accept their hard-coded
+      8-point (or fixed) inputs
+
+Timing is the best per-call time over `repeat` timeit auto-ranged runs.
+Peak memory is measured separately with tracemalloc (numpy buffers are
+traced), so its overhead does not distort timings. Figures render on the
+Agg backend into a temporary OUTPUTS/ directory; committed figures are
+never overwritten.
+
+A result regresses when it is slower than time_tolerance × baseline (or
+uses more than memory_tolerance × baseline peak memory) beyond a small
+absolute slack. Any regression exits with status 1.
+
+Usage:
+    python benchmark_suite.py                     # run and compare
+    python benchmark_suite.py --save-baseline     # record baseline
+    python benchmark_suite.py cf_engine figure2   # selected cases only
+    python benchmark_suite.py --scales 1 100      # skip the large scales
+
+Author: Ignacio Adrián Lerer
+Date: November 2025
+License: CC-BY 4.0
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+DATA_DIR = ANALYSIS_DIR.parent / 'DATA'
+OUTPUT_DIR = ANALYSIS_DIR.parent / 'OUTPUTS'
+BASELINE_PATH = OUTPUT_DIR / 'benchmark_baseline.json'
+
+# Country-year scales for scalable cases
+SCALES = (1, 100, 10_000, 1_000_000)
+
+# Annual grid length used when a scale is laid out as countries × years
+PANEL_YEARS = 50
+
+# Regression thresholds: ratio to baseline plus absolute slack for tiny cases
+TIME_TOLERANCE = 1.5
+MEMORY_TOLERANCE = 1.25
+TIME_SLACK = 50e-6          # seconds
+MEMORY_SLACK = 64 * 1024    # bytes
+
+
+# =============================================================================
+# CASE SETUP: each returns a zero-argument callable for the given scale
+# =============================================================================
+
+def _components(n, seed=0):
+    """Random component columns in plausible ranges, n rows"""
+    rng = np.random.default_rng(seed)
+    return {
+        'pe': rng.uniform(0.05, 0.95, n),
+        'gap': rng.uniform(0.05, 0.80, n),
+        'cd': rng.uniform(0.10, 0.70, n),
+        'sp': rng.uniform(0.20, 0.90, n),
+        'cli': rng.uniform(0.20, 0.90, n)
+    }
+
+
+def _panel_shape(n):
+    """Lay out n country-years as (countries, years)"""
+    years = min(n, PANEL_YEARS)
+    return max(1, n // years), years
+
+
+def setup_cf_engine(n):
+    from cf_engine import constitutional_fitness
+    c = _components(n)
+    return lambda: constitutional_fitness(c['pe'], c['gap'], c['cd'], c['sp'], c['cli'])
+
+
+def setup_score_panel(n):
+    from cf_engine import score_panel, stack_components
+    countries, years = _panel_shape(n)
+    c = _components(countries * years)
+    panel = stack_components(c['pe'], c['gap'], c['cd'], c['sp'], c['cli'])
+    panel = panel.reshape(countries, years, -1)
+    out = np.empty(panel.shape[:-1])
+    return lambda: score_panel(panel, out=out)
+
+
+def setup_fit_growth(n):
+    from cli_growth_panel import fit_growth
+    countries, years = _panel_shape(n)
+    rng = np.random.default_rng(1)
+    grid = np.arange(2025 - years + 1, 2026)
+    values = 0.4 + np.cumsum(rng.normal(0.005, 0.01, (countries, years)), axis=1)
+    return lambda: fit_growth(grid, values)
+
+
+def setup_cli_growth_rate(n):
+    from argentina_paradox_analysis import analyze_cli_growth_rate
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({
+        'Year': np.arange(1949, 1949 + n),
+        'CLI_Estimated': 0.45 + 0.0055 * np.arange(n) + rng.normal(0, 0.01, n)
+    })
+    return lambda: analyze_cli_growth_rate(df)
+
+
+def setup_fsi_engine(n):
+    from fsi_engine import score_fiscal_panel, simulate_fiscal_panel
+    countries, years = _panel_shape(n)
+    panel = simulate_fiscal_panel(countries, (2025 - years + 1, 2025), seed=3)
+    return lambda: score_fiscal_panel(panel)
+
+
+def setup_fsi_colombia(n):
+    from colombia_h1_analysis import calculate_fsi_colombia
+    return calculate_fsi_colombia
+
+
+def setup_cf_colombia(n):
+    import colombia_h1_analysis as col
+    cli_df = col.calculate_cli_colombia_trajectory()
+    _, gap_values = col.calculate_implementation_gap_colombia()
+    _, pe_values = col.calculate_phenotypic_expression_colombia()
+    sp_values, _ = col.calculate_selection_pressure_colombia()
+    fsi_values, _ = col.calculate_fsi_colombia()
+    return lambda: col.calculate_constitutional_fitness_colombia(
+        cli_df, gap_values, pe_values, sp_values, fsi_values)
+
+
+def setup_figure(name):
+    def setup(n):
+        import build_figures
+        spec = build_figures.FIGURES[name]
+        module = __import__(spec['module'])
+        return getattr(module, spec['function'])
+    return setup
+
+
+# name → setup(n), native size (None = scalable), smallest scalable size
+# (default 1), whether it writes figures
+CASES = {
+    'cf_engine': {'setup': setup_cf_engine, 'native': None},
+    'score_panel': {'setup': setup_score_panel, 'native': None},
+    'fit_growth': {'setup': setup_fit_growth, 'native': None},
+    'analyze_cli_growth_rate': {'setup': setup_cli_growth_rate, 'native': None,
+                                'min_size': 2},     # a regression needs two points
+    'fsi_engine': {'setup': setup_fsi_engine, 'native': None},
+    'calculate_fsi_colombia': {'setup': setup_fsi_colombia, 'native': 8},
+    'calculate_constitutional_fitness_colombia': {'setup': setup_cf_colombia, 'native': 8},
+    'figure1': {'setup': setup_figure('figure1'), 'native': 1, 'figure': True},
+    'figure2': {'setup': setup_figure('figure2'), 'native': 1, 'figure': True},
+    'figure3': {'setup': setup_figure('figure3'), 'native': 1, 'figure': True},
+    'figure4': {'setup': setup_figure('figure4'), 'native': 1, 'figure': True}
+}
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+
+@contextlib.contextmanager
+def figure_sandbox():
+    """
+    Run with cwd = <tmp>/ANALYSIS, where <tmp>/DATA links to the real data
+    and <tmp>/OUTPUTS is empty, so figure scripts' relative paths resolve
+    without touching the committed outputs
+    """
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='ept_bench_') as root:
+        root = Path(root)
+        (root / 'ANALYSIS').mkdir()
+        (root / 'OUTPUTS').mkdir()
+        (root / 'DATA').symlink_to(DATA_DIR, target_is_directory=True)
+        try:
+            os.chdir(root / 'ANALYSIS')
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', UserWarning)   # missing emoji glyphs
+                yield
+        finally:
+            os.chdir(cwd)
+            import matplotlib.pyplot as plt
+            plt.close('all')
+
+
+def measure(func, repeat=3):
+    """
+    Best per-call seconds (timeit auto-range) and tracemalloc peak bytes
+
+    Returns:
+        Dict with seconds, peak_bytes, loops
+    """
+    timer = timeit.Timer(func)
+    loops, _ = timer.autorange()
+    seconds = min(timer.repeat(repeat=repeat, number=loops)) / loops
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': seconds, 'peak_bytes': int(peak), 'loops': int(loops)}
+
+
+def run_case(name, scales=SCALES, repeat=3):
+    """
+    Benchmark one case at every applicable scale
+
+    Returns:
+        Dict of result key ('<case>@<n>') → measurement
+    """
+    spec = CASES[name]
+    if spec['native'] is None:
+        sizes = [n for n in scales if n >= spec.get('min_size', 1)]
+    else:
+        sizes = (spec['native'],)
+    sandbox = figure_sandbox() if spec.get('figure') else contextlib.nullcontext()
+    results = {}
+    with sandbox, contextlib.redirect_stdout(io.StringIO()):
+        for n in sizes:
+            func = spec['setup'](n)
+            result = measure(func, repeat=repeat)
+            result.update({'case': name, 'n': int(n)})
+            results[f'{name}@{n}'] = result
+    return results
+
+
+def run_suite(names=None, scales=SCALES, repeat=3):
+    """Benchmark all (or the named) cases; returns key → measurement"""
+    if str(ANALYSIS_DIR) not in sys.path:
+        sys.path.insert(0, str(ANALYSIS_DIR))
+    results = {}
+    for name in names or CASES:
+        results.update(run_case(name, scales, repeat))
+    return results
+
+
+# =============================================================================
+# BASELINES
+# =============================================================================
+
+def load_baseline(path=BASELINE_PATH):
+    if Path(path).exists():
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    return None
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    """Write results (merged over any existing baseline) with machine info"""
+    baseline = load_baseline(path) or {'results': {}}
+    baseline['results'].update(results)
+    baseline['machine'] = {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine()
+    }
+    baseline['saved'] = time.strftime('%Y-%m-%d %H:%M:%S')
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+    return baseline
+
+
+def compare(results, baseline, time_tolerance=TIME_TOLERANCE, memory_tolerance=MEMORY_TOLERANCE):
+    """
+    Compare results against a baseline
+
+    Returns:
+        DataFrame with one row per result and a Regressed flag
+    """
+    reference = (baseline or {}).get('results', {})
+    rows = []
+    for key, result in results.items():
+        base = reference.get(key)
+        row = {
+            'Case': result['case'],
+            'N': result['n'],
+            'Time_s': result['seconds'],
+            'Peak_MB': result['peak_bytes'] / 2**20,
+            'Time_Ratio': np.nan,
+            'Memory_Ratio': np.nan,
+            'Regressed': False
+        }
+        if base is not None:
+            row['Time_Ratio'] = result['seconds'] / base['seconds']
+            row['Memory_Ratio'] = result['peak_bytes'] / max(base['peak_bytes'], 1)
+            slow = result['seconds'] > time_tolerance * base['seconds'] + TIME_SLACK
+            heavy = result['peak_bytes'] > memory_tolerance * base['peak_bytes'] + MEMORY_SLACK
+            row['Regressed'] = bool(slow or heavy)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark EPT metric functions and figure generators')
+    parser.add_argument('cases', nargs='*', help=f"Cases to run: {', '.join(CASES)} (default: all)")
+    parser.add_argument('--scales', nargs='+', type=int, default=list(SCALES),
+                        help='Country-year scales for scalable cases')
+    parser.add_argument('--repeat', type=int, default=3, help='timeit repeats per measurement')
+    parser.add_argument('--save-baseline', action='store_true', help='Record results as the new baseline')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, help='Baseline JSON path')
+    parser.add_argument('--time-tolerance', type=float, default=TIME_TOLERANCE)
+    parser.add_argument('--memory-tolerance', type=float, default=MEMORY_TOLERANCE)
+    args = parser.parse_args()
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    print("="*70)
+    print("EPT BENCHMARK SUITE")
+    print("="*70)
+
+    results = run_suite(args.cases or None, scales=args.scales, repeat=args.repeat)
+    baseline = load_baseline(args.baseline)
+    report = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+
+    print()
+    print(report.to_string(index=False, formatters={
+        'Time_s': lambda v: f"{v:.3e}",
+        'Peak_MB': lambda v: f"{v:.3f}",
+        'Time_Ratio': lambda v: '-' if np.isnan(v) else f"{v:.2f}",
+        'Memory_Ratio': lambda v: '-' if np.isnan(v) else f"{v:.2f}",
+        'Regressed': lambda v: '❌' if v else ''
+    }))
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"\n✓ Baseline saved: {args.baseline} ({len(results)} results)")
+        return 0
+
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to record one")
+        return 0
+
+    regressed = report[report['Regressed']]
+    if len(regressed):
+        print("\n" + "!"*70)
+        print(f"❌ PERFORMANCE REGRESSION: {len(regressed)} result(s) beyond "
+              f"{args.time_tolerance}× time / {args.memory_tolerance}× memory")
+        for _, row in regressed.iterrows():
+            print(f"   {row['Case']} @ {row['N']:,}: time ×{row['Time_Ratio']:.2f}, "
+                  f"memory ×{row['Memory_Ratio']:.2f}")
+        print("!"*70)
+        return 1
+
+    print(f"\n✓ No regressions against baseline ({baseline.get('saved', 'unknown date')})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Figure Build: Parallel, cache-aware rendering of all paper figures
+Runs the generate_figure*.py scripts in worker processes on the headless
+Agg backend and skips figures whose inputs have not changed
+
+Each figure's input hash covers its generating script's source and every
+data file it reads. Hashes of the last successful build are recorded per
+output file in OUTPUTS/figure_build_manifest.json; a figure is rebuilt only
+when its hash changed or one of its outputs is missing.
+
+Usage:
+    python build_figures.py                 # build stale figures, all cores
+    python build_figures.py figure2 --force # rebuild one figure
+    python build_figures.py --workers 1     # sequential
+
+Author: Ignacio Adrián Lerer
+Date: November 2025
+License: CC-BY 4.0
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+DATA_DIR = ANALYSIS_DIR.parent / 'DATA'
+RESULTS_DIR = DATA_DIR / 'analysis_results'
+STORE_DIR = DATA_DIR / 'panel_store'
+OUTPUT_DIR = ANALYSIS_DIR.parent / 'OUTPUTS'
+MANIFEST_PATH = OUTPUT_DIR / 'figure_build_manifest.json'
+
+# Panel store reader plus its files (figures 2 and 4 prefer the store over CSV)
+STORE_FILES = (ANALYSIS_DIR / 'panel_store.py',) + tuple(STORE_DIR / name for name in (
+    'manifest.json', 'Country.npy', 'Year.npy', 'Metric.npy', 'Provenance.npy', 'Value.npy'
+))
+
+# name → module, entry point, data inputs, outputs (relative to OUTPUTS/)
+FIGURES = {
+    'figure1': {
+        'module': 'generate_figure1_cli',
+        'function': 'generate_cli_comparison',
+        'inputs': (),
+        'outputs': ('figure1_cli_comparison.png', 'figure1_cli_comparison.pdf')
+    },
+    'figure2': {
+        'module': 'generate_figure2_trajectories',
+        'function': 'generate_cf_trajectories',
+        'inputs': (RESULTS_DIR / 'colombia_constitutional_fitness.csv',
+                   RESULTS_DIR / 'argentina_cf_trajectory.csv') + STORE_FILES,
+        'outputs': ('figure2_cf_trajectories.png', 'figure2_cf_trajectories.pdf')
+    },
+    'figure3': {
+        'module': 'generate_figure3_threshold',
+        'function': 'generate_support_threshold',
+        'inputs': (),
+        'outputs': ('figure3_support_threshold.png', 'figure3_support_threshold.pdf')
+    },
+    'figure4': {
+        'module': 'generate_figure_4_fiscal_sustainability',
+        'function': 'create_figure',
+        'inputs': (RESULTS_DIR / 'colombia_constitutional_fitness.csv',
+                   RESULTS_DIR / 'argentina_cf_trajectory.csv',
+                   RESULTS_DIR / 'chile_constitutional_fitness.csv') + STORE_FILES,
+        'outputs': ('figure4_fiscal_sustainability_evolution.png',
+                    'figure4_fiscal_sustainability_evolution.pdf')
+    }
+}
+
+
+def input_hash(name):
+    """SHA-256 over a figure's script source and all of its data inputs"""
+    spec = FIGURES[name]
+    digest = hashlib.sha256()
+    for path in (ANALYSIS_DIR / f"{spec['module']}.py",) + tuple(spec['inputs']):
+        digest.update(str(Path(path).name).encode('utf-8'))
+        if Path(path).exists():
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+        else:
+            digest.update(b'<missing>')
+    return digest.hexdigest()
+
+
+def load_manifest():
+    if MANIFEST_PATH.exists():
+        with open(MANIFEST_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def save_manifest(manifest):
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    tmp = MANIFEST_PATH.with_suffix('.json.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    tmp.replace(MANIFEST_PATH)
+
+
+def is_stale(name, digest, manifest):
+    """True if any output is missing or was built from different inputs"""
+    for output in FIGURES[name]['outputs']:
+        if not (OUTPUT_DIR / output).exists():
+            return True
+        if manifest.get(output, {}).get('input_hash') != digest:
+            return True
+    return False
+
+
+def render(name):
+    """
+    Render one figure in the current process (worker entry point)
+
+    Forces the Agg backend and runs from ANALYSIS/ so the scripts' relative
+    '../DATA' and '../OUTPUTS' paths resolve. Returns (name, seconds, log).
+    """
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    import importlib
+
+    spec = FIGURES[name]
+    log = io.StringIO()
+    start = time.perf_counter()
+    cwd = os.getcwd()
+    try:
+        os.chdir(ANALYSIS_DIR)
+        with contextlib.redirect_stdout(log):
+            module = importlib.import_module(spec['module'])
+            getattr(module, spec['function'])()
+    finally:
+        os.chdir(cwd)
+        import matplotlib.pyplot as plt
+        plt.close('all')
+    return name, time.perf_counter() - start, log.getvalue()
+
+
+def build(names=None, force=False, workers=None, verbose=False):
+    """
+    Build stale figures in parallel
+
+    Args:
+        names: Figures to consider (default: all)
+        force: Rebuild even if hashes match
+        workers: Process count (default: min(cores, stale figures))
+        verbose: Echo each script's console output
+
+    Returns:
+        Dict of figure name → 'built' | 'skipped' | 'failed: <error>'
+    """
+    names = list(names or FIGURES)
+    manifest = load_manifest()
+    digests = {name: input_hash(name) for name in names}
+    stale = [n for n in names if force or is_stale(n, digests[n], manifest)]
+    status = {n: 'skipped' for n in names if n not in stale}
+
+    if stale:
+        workers = max(1, min(workers or os.cpu_count() or 1, len(stale)))
+        if workers == 1:
+            results = []
+            for name in stale:
+                try:
+                    results.append(render(name))
+                except Exception as exc:
+                    status[name] = f'failed: {exc}'
+        else:
+            results = []
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(render, name): name for name in stale}
+                for future in as_completed(futures):
+                    try:
+                        results.append(future.result())
+                    except Exception as exc:
+                        status[futures[future]] = f'failed: {exc}'
+
+        for name, seconds, log in results:
+            if verbose and log:
+                print(log, end='')
+            for output in FIGURES[name]['outputs']:
+                manifest[output] = {
+                    'figure': name,
+                    'input_hash': digests[name],
+                    'build_seconds': round(seconds, 3)
+                }
+            status[name] = 'built'
+        save_manifest(manifest)
+
+    return {name: status[name] for name in names}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build paper figures in parallel, skipping unchanged ones')
+    parser.add_argument('figures', nargs='*', help=f"Figures to build: {', '.join(FIGURES)} (default: all)")
+    parser.add_argument('--force', action='store_true', help='Rebuild even if inputs are unchanged')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('--verbose', action='store_true', help='Show figure script output')
+    args = parser.parse_args()
+    unknown = [name for name in args.figures if name not in FIGURES]
+    if unknown:
+        parser.error(f"unknown figure(s): {', '.join(unknown)}")
+
+    start = time.perf_counter()
+    status = build(args.figures or None, force=args.force, workers=args.workers, verbose=args.verbose)
+    for name, result in status.items():
+        mark = '✅' if result == 'built' else ('⏭️ ' if result == 'skipped' else '❌')
+        print(f"{mark} {name}: {result}")
+    print(f"Done in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+CONSTITUTIONAL FITNESS ENGINE: Vectorized multi-country scoring
+Single implementation of CF shared by the Colombia, Chile and Argentina analyses
+
+CF = [PE × (1-Gap) × (1-CD) × SP] / (CLI + ε)
+
+A panel is a float array whose LAST axis holds the five components in the
+order of COMPONENTS (PE, Gap, CD, SP, CLI). Leading axes are free, e.g.
+(country × year × component) or (scenario × country × year × component),
+and every cell is scored in one vectorized pass.
+
+Author: Adrian Lerer
+Date: November 2025
+"""
+
+import numpy as np
+
+# Component order along the last axis of a panel
+COMPONENTS = ('PE', 'Gap', 'CD', 'SP', 'CLI')
+
+# ε in the CF denominator (same value used in every case analysis)
+EPSILON = 0.01
+
+# Interpretation scale from calculate_constitutional_fitness_chile
+# Lower band edges, ascending: CF < 0.20 utopian ... CF > 0.70 transformative
+CF_BAND_EDGES = (0.20, 0.40, 0.70)
+CF_BAND_LABELS = (
+    'Utopian failure',
+    'Aspirational with limits',
+    'Contested transformation',
+    'Transformative viable'
+)
+
+# Component weights of the case analyses' composite scores, shared with
+# monte_carlo_cf and score_cache
+# calculate_cli_chile_trajectory (cli_scores_summary.csv formula)
+CLI_CHILE_WEIGHTS = {
+    'text_vagueness': 0.25,
+    'judicial_activism': 0.25,
+    'treaty_hierarchy': 0.20,
+    'precedent_weight': 0.15,
+    'amendment_difficulty': 0.15
+}
+# calculate_cli_colombia_trajectory
+CLI_COLOMBIA_WEIGHTS = {
+    'judicial_lock': 0.30,
+    'legislative_lock': 0.30,
+    'reversal_rate': 0.20,
+    'path_dependence': 0.20
+}
+# calculate_fiscal_gap_projected (Chile 2022)
+GAP_CHILE_WEIGHTS = {
+    'fiscal_gap': 0.50,
+    'institutional_gap': 0.20,
+    'plurinational_gap': 0.15,
+    'environmental_gap': 0.15
+}
+# calculate_cultural_distance_chile: salience of each norm cluster
+CD_CHILE_SALIENCE = {
+    'plurinational_distance': 0.30,
+    'environmental_distance': 0.20,
+    'gender_distance': 0.15,
+    'economic_distance': 0.35
+}
+
+# calculate_argentina_cf_trajectory: SP and CD held constant over 1949-2025
+ARGENTINA_SP = 0.60     # Initially high (Perón popular)
+ARGENTINA_CD = 0.30     # Labor rights culturally accepted in Argentina
+
+
+def weighted_sum(weights, values):
+    """Σ weight × value over the keys of weights (values: scalars or arrays)"""
+    return sum(weight * values[name] for name, weight in weights.items())
+
+
+def constitutional_fitness(pe, gap, cd, sp, cli, epsilon=EPSILON):
+    """
+    Calculate Constitutional Fitness element-wise
+
+    CF = [PE × (1-Gap) × (1-CD) × SP] / (CLI + ε)
+
+    Args:
+        pe, gap, cd, sp, cli: Scalars or arrays (broadcast against each other)
+        epsilon: Denominator guard (default 0.01)
+
+    Returns:
+        CF as float for scalar inputs, ndarray otherwise
+    """
+    cf = (np.multiply(pe, np.subtract(1, gap)) * np.subtract(1, cd) * sp) / np.add(cli, epsilon)
+    if np.ndim(cf) == 0:
+        return float(cf)
+    return cf
+
+
+def stack_components(pe, gap, cd, sp, cli):
+    """
+    Build a panel array from separate component arrays
+
+    Inputs are broadcast to a common shape S; the result has shape S + (5,)
+    with components ordered as COMPONENTS.
+    """
+    arrays = np.broadcast_arrays(*(np.asarray(a, dtype=np.float64)
+                                   for a in (pe, gap, cd, sp, cli)))
+    return np.stack(arrays, axis=-1)
+
+
+def score_panel(panel, epsilon=EPSILON, out=None):
+    """
+    Score every cell of a component panel in a single vectorized pass
+
+    Args:
+        panel: Array of shape (..., 5), components ordered as COMPONENTS
+        epsilon: Denominator guard (default 0.01)
+        out: Optional preallocated float64 array of shape panel.shape[:-1]
+
+    Returns:
+        CF array of shape panel.shape[:-1]
+    """
+    panel = np.asarray(panel, dtype=np.float64)
+    if panel.shape[-1] != len(COMPONENTS):
+        raise ValueError(
+            f"Panel last axis must hold {len(COMPONENTS)} components "
+            f"{COMPONENTS}, got shape {panel.shape}"
+        )
+
+    pe, gap, cd, sp, cli = (panel[..., i] for i in range(len(COMPONENTS)))
+
+    if out is None:
+        out = np.empty(panel.shape[:-1], dtype=np.float64)
+
+    # Accumulate in place to avoid one temporary per factor
+    np.subtract(1.0, gap, out=out)
+    out *= pe
+    out *= 1.0 - cd
+    out *= sp
+    out /= cli + epsilon
+    return out
+
+
+def classify_cf(cf):
+    """
+    Map CF values to interpretation bands
+
+    Returns integer band codes (0 = utopian failure ... 3 = transformative),
+    index into CF_BAND_LABELS. CF exactly on an edge falls in the lower band.
+    """
+    return np.searchsorted(CF_BAND_EDGES, np.asarray(cf), side='left')
+
+
+def panel_to_frame(cf, countries, years, panel=None):
+    """
+    Flatten a (country × year) CF array into a long DataFrame
+
+    Args:
+        cf: Array of shape (n_countries, n_years)
+        countries: Country labels (length n_countries)
+        years: Year labels (length n_years)
+        panel: Optional (n_countries, n_years, 5) component array to include
+
+    Returns:
+        DataFrame with Country, Year, [components], CF, Band columns
+    """
+    import pandas as pd
+
+    cf = np.asarray(cf)
+    n_countries, n_years = cf.shape
+    data = {
+        'Country': np.repeat(np.asarray(countries), n_years),
+        'Year': np.tile(np.asarray(years), n_countries)
+    }
+    if panel is not None:
+        flat = np.asarray(panel).reshape(-1, len(COMPONENTS))
+        for i, name in enumerate(COMPONENTS):
+            data[name] = flat[:, i]
+    data['CF'] = cf.ravel()
+    data['Band'] = np.asarray(CF_BAND_LABELS)[classify_cf(cf).ravel()]
+    return pd.DataFrame(data)
+
+
+if __name__ == "__main__":
+    import time
+
+    print("="*70)
+    print("CONSTITUTIONAL FITNESS ENGINE")
+    print("="*70)
+
+    # Reference cases (components from the three case analyses)
+    cases = {
+        'Colombia 1991': (0.3975, 0.35, 0.25, 0.6833, 0.135),
+        'Chile 2022': (0.125, 0.7724, 0.653, 0.3038, 0.81),
+        'Argentina 2025': (0.10, 0.77, ARGENTINA_CD, ARGENTINA_SP, 0.87)
+    }
+    panel = np.array(list(cases.values()))
+    cf = score_panel(panel)
+    for (name, _), value, band in zip(cases.items(), cf, classify_cf(cf)):
+        print(f"  {name}: CF = {value:.6f} → {CF_BAND_LABELS[band]}")
+
+    # Panel-scale timing: 190 countries × 75 years × 100 scenarios
+    rng = np.random.default_rng(0)
+    big = rng.uniform(0.0, 1.0, size=(100, 190, 75, len(COMPONENTS)))
+    start = time.perf_counter()
+    big_cf = score_panel(big)
+    elapsed = time.perf_counter() - start
+    print(f"\nScored {big_cf.size:,} cells in {elapsed*1000:.1f} ms")
+    print("="*70)
@@ -6,17 +6,27 @@ Author: Adrian Lerer
 Date: November 2025
 """
 
+import logging
+import sys
+
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from pathlib import Path
 
+from cf_engine import (CD_CHILE_SALIENCE, CLI_CHILE_WEIGHTS, GAP_CHILE_WEIGHTS, constitutional_fitness,
+                       weighted_sum)
+from ept_results import CaseResult, TableText, as_series
+from ept_trace import save_frame, traced
+
+logger = logging.getLogger(__name__)
+
 # Reality Filter Protocol
 VERIFIED = "[Verificado]"
 ESTIMATION = "[Estimación]"
 INFERENCE = "[Inferencia]"
 PROJECTION = "[Proyección]"
 
+@traced
 def calculate_selection_pressure_chile_2022():
     """
     Calculate Selection Pressure for Chile 2022 plebiscite
@@ -28,9 +38,9 @@ def calculate_selection_pressure_chile_2022():
     - Elite support: Pre-plebiscite polls of political/business leaders
     - Institutional fit: Constitutional break analysis
     """
-    print("="*70)
-    print("CHILE 2022 SELECTION PRESSURE ANALYSIS")
-    print("="*70)
+    logger.info("="*70)
+    logger.info("CHILE 2022 SELECTION PRESSURE ANALYSIS")
+    logger.info("="*70)
     
     # Popular Support: Plebiscite results
     # Official result: 61.86% RECHAZO, 38.14% APRUEBO
@@ -58,31 +68,31 @@ def calculate_selection_pressure_chile_2022():
     # Calculate SP
     sp = (popular_support + elite_support + institutional_fit) / 3
     
-    print(f"\nPopular Support (plebiscite result): {popular_support:.4f}")
-    print(f"  - Apruebo: 38.14%")
-    print(f"  - Rechazo: 61.86%")
-    print(f"  - Turnout: 85.8% (mandatory voting)")
-    print(f"\n{VERIFIED} - Official SERVEL (Chilean Electoral Service) data")
-    
-    print(f"\nElite Support (pre-plebiscite): {elite_support:.2f}")
-    print(f"  - Business leaders: 25%")
-    print(f"  - Traditional political parties: 40%")
-    print(f"  - Legal/judicial community: 35%")
-    print(f"\n{ESTIMATION} - Based on pre-plebiscite polling (CEP, CADEM surveys)")
-    
-    print(f"\nInstitutional Fit: {institutional_fit:.2f}")
-    print(f"  Assessment: RADICAL BREAK with 1980 constitution")
-    print(f"  - Plurinational state (vs unitary)")
-    print(f"  - Parliamentary elements (vs pure presidential)")
-    print(f"  - Environmental primacy (vs subsidiary state)")
-    print(f"  - Extensive ESR (vs limited social rights)")
-    print(f"\n{INFERENCE} - Constitutional law analysis + comparative assessment")
-    
-    print("\n" + "="*70)
-    print(f"SELECTION PRESSURE (SP): {sp:.3f}")
-    print(f"\nThreshold: 0.65 for positive selection")
-    print(f"Chile 2022: {sp:.3f} < 0.35 → NEGATIVE SELECTION")
-    print("="*70)
+    logger.info("\nPopular Support (plebiscite result): %.4f", popular_support)
+    logger.info("  - Apruebo: 38.14%")
+    logger.info("  - Rechazo: 61.86%")
+    logger.info("  - Turnout: 85.8% (mandatory voting)")
+    logger.info("\n%s - Official SERVEL (Chilean Electoral Service) data", VERIFIED)
+
+    logger.info("\nElite Support (pre-plebiscite): %.2f", elite_support)
+    logger.info("  - Business leaders: 25%")
+    logger.info("  - Traditional political parties: 40%")
+    logger.info("  - Legal/judicial community: 35%")
+    logger.info("\n%s - Based on pre-plebiscite polling (CEP, CADEM surveys)", ESTIMATION)
+
+    logger.info("\nInstitutional Fit: %.2f", institutional_fit)
+    logger.info("  Assessment: RADICAL BREAK with 1980 constitution")
+    logger.info("  - Plurinational state (vs unitary)")
+    logger.info("  - Parliamentary elements (vs pure presidential)")
+    logger.info("  - Environmental primacy (vs subsidiary state)")
+    logger.info("  - Extensive ESR (vs limited social rights)")
+    logger.info("\n%s - Constitutional law analysis + comparative assessment", INFERENCE)
+
+    logger.info("\n" + "="*70)
+    logger.info("SELECTION PRESSURE (SP): %.3f", sp)
+    logger.info("\nThreshold: 0.65 for positive selection")
+    logger.info("Chile 2022: %.3f < 0.35 → NEGATIVE SELECTION", sp)
+    logger.info("="*70)
     
     return {
         'sp': sp,
@@ -92,15 +102,16 @@ def calculate_selection_pressure_chile_2022():
     }
 
 
+@traced
 def calculate_cli_chile_trajectory():
     """
     Calculate Chile's inherited CLI from 1980 constitution
     
     Chile started 2022 process with HIGH lock-in from Pinochet-era constitution
     """
-    print("\n\n" + "="*70)
-    print("CHILE CONSTITUTIONAL LOCK-IN INDEX (1980-2022)")
-    print("="*70)
+    logger.info("\n\n" + "="*70)
+    logger.info("CHILE CONSTITUTIONAL LOCK-IN INDEX (1980-2022)")
+    logger.info("="*70)
     
     # Chile 1980 Constitution had extreme lock-in mechanisms:
     # - Supermajority requirements (2/3 or 3/5 depending on article)
@@ -119,30 +130,32 @@ def calculate_cli_chile_trajectory():
     amendment_difficulty = 0.92  # Very high (supermajorities)
     
     # Weighted CLI (from cli_scores_summary.csv formula)
-    cli_calculated = (0.25 * text_vagueness + 
-                     0.25 * judicial_activism + 
-                     0.20 * treaty_hierarchy + 
-                     0.15 * precedent_weight + 
-                     0.15 * amendment_difficulty)
-    
-    print(f"\nCLI Components (1980 Constitution heritage):")
-    print(f"  Text Vagueness: {text_vagueness:.2f}")
-    print(f"  Judicial Activism (TC): {judicial_activism:.2f}")
-    print(f"  Treaty Hierarchy: {treaty_hierarchy:.2f}")
-    print(f"  Precedent Weight: {precedent_weight:.2f}")
-    print(f"  Amendment Difficulty: {amendment_difficulty:.2f}")
-    
-    print(f"\nCLI (2022 inherited): {cli_2022:.2f}")
-    print(f"CLI (calculated): {cli_calculated:.2f}")
-    print(f"\n{VERIFIED} - From cli_scores_summary.csv dataset")
-    
-    print("\n" + "="*70)
-    print("KEY INSIGHT:")
-    print(f"Chile entered 2022 process with CLI = {cli_2022:.2f}")
-    print("This HIGH lock-in meant institutional pathways were ALREADY BLOCKED")
-    print("Even if new constitution passed, implementing reforms would face")
-    print("massive resistance from embedded 1980 institutional structures")
-    print("="*70)
+    cli_calculated = weighted_sum(CLI_CHILE_WEIGHTS, {
+        'text_vagueness': text_vagueness,
+        'judicial_activism': judicial_activism,
+        'treaty_hierarchy': treaty_hierarchy,
+        'precedent_weight': precedent_weight,
+        'amendment_difficulty': amendment_difficulty
+    })
+    
+    logger.info("\nCLI Components (1980 Constitution heritage):")
+    logger.info("  Text Vagueness: %.2f", text_vagueness)
+    logger.info("  Judicial Activism (TC): %.2f", judicial_activism)
+    logger.info("  Treaty Hierarchy: %.2f", treaty_hierarchy)
+    logger.info("  Precedent Weight: %.2f", precedent_weight)
+    logger.info("  Amendment Difficulty: %.2f", amendment_difficulty)
+
+    logger.info("\nCLI (2022 inherited): %.2f", cli_2022)
+    logger.info("CLI (calculated): %.2f", cli_calculated)
+    logger.info("\n%s - From cli_scores_summary.csv dataset", VERIFIED)
+
+    logger.info("\n" + "="*70)
+    logger.info("KEY INSIGHT:")
+    logger.info("Chile entered 2022 process with CLI = %.2f", cli_2022)
+    logger.info("This HIGH lock-in meant institutional pathways were ALREADY BLOCKED")
+    logger.info("Even if new constitution passed, implementing reforms would face")
+    logger.info("massive resistance from embedded 1980 institutional structures")
+    logger.info("="*70)
     
     return {
         'cli_2022': cli_2022,
@@ -154,15 +167,16 @@ def calculate_cli_chile_trajectory():
     }
 
 
+@traced
 def calculate_fiscal_gap_projected():
     """
     Calculate projected Implementation Gap if Chile 2022 draft had passed
     
     Based on "Trampa Fiscal del Constitucionalismo Transformativo" analysis
     """
-    print("\n\n" + "="*70)
-    print("CHILE 2022 FISCAL GAP ANALYSIS (PROJECTED)")
-    print("="*70)
+    logger.info("\n\n" + "="*70)
+    logger.info("CHILE 2022 FISCAL GAP ANALYSIS (PROJECTED)")
+    logger.info("="*70)
     
     # ESR provisions in 2022 draft (partial list):
     # - Universal healthcare (Art. 44)
@@ -193,34 +207,36 @@ def calculate_fiscal_gap_projected():
     plurinational_gap = 0.85  # 85% implementation gap (lacks precedent)
     environmental_gap = 0.65  # 65% gap (enforcement capacity insufficient)
     
-    # Weighted average implementation gap
-    gap_weights = [0.50, 0.20, 0.15, 0.15]  # Fiscal, institutional, plurinational, environmental
-    gaps = [fiscal_gap_rate, institutional_gap, plurinational_gap, environmental_gap]
-    
-    weighted_gap = sum(w * g for w, g in zip(gap_weights, gaps))
-    
-    print("\nFiscal Gap Analysis:")
-    print(f"  Promised ESR cost: {promised_esr_cost_pct_gdp:.1f}% GDP annually")
-    print(f"  Available fiscal space: {available_fiscal_space_pct_gdp:.1f}% GDP")
-    print(f"  Fiscal gap: {fiscal_gap_gdp:.1f}% GDP ({fiscal_gap_rate*100:.1f}%)")
-    
-    print("\nImplementation Gap by Dimension:")
-    print(f"  Fiscal (budget): {fiscal_gap_rate*100:.1f}%")
-    print(f"  Institutional (agencies): {institutional_gap*100:.1f}%")
-    print(f"  Plurinational (indigenous systems): {plurinational_gap*100:.1f}%")
-    print(f"  Environmental (enforcement): {environmental_gap*100:.1f}%")
-    
-    print(f"\nWeighted Implementation Gap: {weighted_gap*100:.1f}%")
-    
-    print(f"\n{ESTIMATION} - Based on 'Trampa Fiscal del Constitucionalismo Transformativo'")
-    print(f"             analysis (Lerer, 2022) + fiscal capacity assessment")
+    # Weighted average implementation gap (GAP_CHILE_WEIGHTS: 0.50/0.20/0.15/0.15)
+    weighted_gap = weighted_sum(GAP_CHILE_WEIGHTS, {
+        'fiscal_gap': fiscal_gap_rate,
+        'institutional_gap': institutional_gap,
+        'plurinational_gap': plurinational_gap,
+        'environmental_gap': environmental_gap
+    })
     
-    print("\n" + "="*70)
-    print("KEY FINDING:")
-    print(f"Projected Implementation Gap: {weighted_gap*100:.1f}%")
-    print("This means ~75% of constitutional promises would be UNFUNDED/UNIMPLEMENTED")
-    print("Classic 'structural utopianism' (Dixon & Landau): no pathways to deliver")
-    print("="*70)
+    logger.info("\nFiscal Gap Analysis:")
+    logger.info("  Promised ESR cost: %.1f%% GDP annually", promised_esr_cost_pct_gdp)
+    logger.info("  Available fiscal space: %.1f%% GDP", available_fiscal_space_pct_gdp)
+    logger.info("  Fiscal gap: %.1f%% GDP (%.1f%%)", fiscal_gap_gdp, fiscal_gap_rate*100)
+
+    logger.info("\nImplementation Gap by Dimension:")
+    logger.info("  Fiscal (budget): %.1f%%", fiscal_gap_rate*100)
+    logger.info("  Institutional (agencies): %.1f%%", institutional_gap*100)
+    logger.info("  Plurinational (indigenous systems): %.1f%%", plurinational_gap*100)
+    logger.info("  Environmental (enforcement): %.1f%%", environmental_gap*100)
+
+    logger.info("\nWeighted Implementation Gap: %.1f%%", weighted_gap*100)
+
+    logger.info("\n%s - Based on 'Trampa Fiscal del Constitucionalismo Transformativo'", ESTIMATION)
+    logger.info("             analysis (Lerer, 2022) + fiscal capacity assessment")
+
+    logger.info("\n" + "="*70)
+    logger.info("KEY FINDING:")
+    logger.info("Projected Implementation Gap: %.1f%%", weighted_gap*100)
+    logger.info("This means ~75% of constitutional promises would be UNFUNDED/UNIMPLEMENTED")
+    logger.info("Classic 'structural utopianism' (Dixon & Landau): no pathways to deliver")
+    logger.info("="*70)
     
     return {
         'weighted_gap': weighted_gap,
@@ -231,15 +247,16 @@ def calculate_fiscal_gap_projected():
     }
 
 
+@traced
 def calculate_cultural_distance_chile():
     """
     Calculate Cultural Distance between 2022 draft and dominant Chilean memes
     
     CD = 1 - Compatibility between new norms and existing cultural framework
     """
-    print("\n\n" + "="*70)
-    print("CHILE 2022 CULTURAL DISTANCE ANALYSIS")
-    print("="*70)
+    logger.info("\n\n" + "="*70)
+    logger.info("CHILE 2022 CULTURAL DISTANCE ANALYSIS")
+    logger.info("="*70)
     
     # Key norm clusters and their cultural distance:
     
@@ -247,26 +264,26 @@ def calculate_cultural_distance_chile():
     # Polling: 65% Chileans opposed or uncertain about plurinational state
     # Distance: HIGH (concept alien to Chilean legal tradition)
     plurinational_distance = 0.78
-    plurinational_salience = 0.30  # Very salient in debate
+    plurinational_salience = CD_CHILE_SALIENCE['plurinational_distance']  # 0.30, very salient in debate
     
     # 2. Environmental Constitutionalism (rights of nature)
     # Polling: 52% opposed giving "rights" to nature/rivers
     # Distance: MODERATE-HIGH (novel but not completely alien)
     environmental_distance = 0.62
-    environmental_salience = 0.20
+    environmental_salience = CD_CHILE_SALIENCE['environmental_distance']  # 0.20
     
     # 3. Gender Parity (paridad en todos los órganos)
     # Polling: 58% supported gender parity measures
     # Distance: LOW-MODERATE (accepted by majority)
     gender_distance = 0.31
-    gender_salience = 0.15
+    gender_salience = CD_CHILE_SALIENCE['gender_distance']  # 0.15
     
     # 4. Economic Model (state-led vs market)
     # 2022 draft: Strong state role, limits on private property
     # Chilean culture: Post-1980, pro-market orientation dominant
     # Polling: 68% wanted to maintain current economic model fundamentals
     economic_distance = 0.71
-    economic_salience = 0.35  # Most salient issue
+    economic_salience = CD_CHILE_SALIENCE['economic_distance']  # 0.35, most salient issue
     
     # Weighted Cultural Distance
     distances = [plurinational_distance, environmental_distance, gender_distance, economic_distance]
@@ -274,25 +291,25 @@ def calculate_cultural_distance_chile():
     
     weighted_cd = sum(d * s for d, s in zip(distances, saliences))
     
-    print("\nCultural Distance by Norm Cluster:")
-    print(f"  Plurinationalism: {plurinational_distance:.2f} (salience: {plurinational_salience:.0%})")
-    print(f"  Environmental constitutionalism: {environmental_distance:.2f} (salience: {environmental_salience:.0%})")
-    print(f"  Gender parity: {gender_distance:.2f} (salience: {gender_salience:.0%})")
-    print(f"  Economic model shift: {economic_distance:.2f} (salience: {economic_salience:.0%})")
-    
-    print(f"\nWeighted Cultural Distance: {weighted_cd:.3f}")
-    
-    print(f"\n{ESTIMATION} - Based on CEP, CADEM, Criteria pre-plebiscite polling")
-    print(f"             + post-plebiscite analysis of rejection reasons")
-    
-    print("\n" + "="*70)
-    print("KEY FINDING:")
-    print(f"Cultural Distance = {weighted_cd:.3f}")
-    print(f"Threshold: CD > 0.45 indicates HIGH incompatibility")
-    print(f"Chile 2022: {weighted_cd:.3f} > 0.45 → SOCIOLOGICAL UTOPIANISM")
-    print("This quantifies Dixon & Landau's qualitative observation:")
-    print("'Lack of sufficient popular support' = High cultural distance")
-    print("="*70)
+    logger.info("\nCultural Distance by Norm Cluster:")
+    logger.info("  Plurinationalism: %.2f (salience: %.0f%%)", plurinational_distance, plurinational_salience*100)
+    logger.info("  Environmental constitutionalism: %.2f (salience: %.0f%%)", environmental_distance, environmental_salience*100)
+    logger.info("  Gender parity: %.2f (salience: %.0f%%)", gender_distance, gender_salience*100)
+    logger.info("  Economic model shift: %.2f (salience: %.0f%%)", economic_distance, economic_salience*100)
+
+    logger.info("\nWeighted Cultural Distance: %.3f", weighted_cd)
+
+    logger.info("\n%s - Based on CEP, CADEM, Criteria pre-plebiscite polling", ESTIMATION)
+    logger.info("             + post-plebiscite analysis of rejection reasons")
+
+    logger.info("\n" + "="*70)
+    logger.info("KEY FINDING:")
+    logger.info("Cultural Distance = %.3f", weighted_cd)
+    logger.info("Threshold: CD > 0.45 indicates HIGH incompatibility")
+    logger.info("Chile 2022: %.3f > 0.45 → SOCIOLOGICAL UTOPIANISM", weighted_cd)
+    logger.info("This quantifies Dixon & Landau's qualitative observation:")
+    logger.info("'Lack of sufficient popular support' = High cultural distance")
+    logger.info("="*70)
     
     return {
         'weighted_cd': weighted_cd,
@@ -303,6 +320,7 @@ def calculate_cultural_distance_chile():
     }
 
 
+@traced
 def calculate_phenotypic_expression_projected():
     """
     Project Phenotypic Expression if Chile 2022 draft had passed
@@ -311,9 +329,9 @@ def calculate_phenotypic_expression_projected():
     
     This is COUNTERFACTUAL projection
     """
-    print("\n\n" + "="*70)
-    print("CHILE 2022 PHENOTYPIC EXPRESSION (PROJECTED COUNTERFACTUAL)")
-    print("="*70)
+    logger.info("\n\n" + "="*70)
+    logger.info("CHILE 2022 PHENOTYPIC EXPRESSION (PROJECTED COUNTERFACTUAL)")
+    logger.info("="*70)
     
     # IF the constitution had passed (38% voted YES, but assume it passed):
     
@@ -340,27 +358,27 @@ def calculate_phenotypic_expression_projected():
     # Calculate PE
     pe_projected = (institutions + budget + enforcement + behavior) / 4
     
-    print("\nProjected PE Components (if constitution had passed):")
-    print(f"  Institutions Created: {institutions:.2f} (15% of mandated)")
-    print(f"  Budget Allocated: {budget:.2f} (20% of promised)")
-    print(f"  Enforcement Active: {enforcement:.2f} (10% effective)")
-    print(f"  Behavior Changed: {behavior:.2f} (5% population)")
-    
-    print(f"\nProjected Phenotypic Expression: {pe_projected:.3f}")
-    
-    print(f"\n{PROJECTION} - Counterfactual estimate based on:")
-    print(f"             - High CLI (0.81) blocking institutional creation")
-    print(f"             - Fiscal gap (75%) preventing budget allocation")
-    print(f"             - Elite resistance limiting enforcement")
-    print(f"             - Low popular support reducing compliance")
-    
-    print("\n" + "="*70)
-    print("KEY FINDING:")
-    print(f"Projected PE = {pe_projected:.3f}")
-    print(f"Threshold: PE < 0.40 = Low expression (symbolic/utopian)")
-    print(f"Chile 2022 projected: {pe_projected:.3f} < 0.40 → UTOPIAN OUTCOME")
-    print("Even if passed, constitution would be 'letra muerta' (dead letter)")
-    print("="*70)
+    logger.info("\nProjected PE Components (if constitution had passed):")
+    logger.info("  Institutions Created: %.2f (15%% of mandated)", institutions)
+    logger.info("  Budget Allocated: %.2f (20%% of promised)", budget)
+    logger.info("  Enforcement Active: %.2f (10%% effective)", enforcement)
+    logger.info("  Behavior Changed: %.2f (5%% population)", behavior)
+
+    logger.info("\nProjected Phenotypic Expression: %.3f", pe_projected)
+
+    logger.info("\n%s - Counterfactual estimate based on:", PROJECTION)
+    logger.info("             - High CLI (0.81) blocking institutional creation")
+    logger.info("             - Fiscal gap (75%) preventing budget allocation")
+    logger.info("             - Elite resistance limiting enforcement")
+    logger.info("             - Low popular support reducing compliance")
+
+    logger.info("\n" + "="*70)
+    logger.info("KEY FINDING:")
+    logger.info("Projected PE = %.3f", pe_projected)
+    logger.info("Threshold: PE < 0.40 = Low expression (symbolic/utopian)")
+    logger.info("Chile 2022 projected: %.3f < 0.40 → UTOPIAN OUTCOME", pe_projected)
+    logger.info("Even if passed, constitution would be 'letra muerta' (dead letter)")
+    logger.info("="*70)
     
     return {
         'pe_projected': pe_projected,
@@ -371,15 +389,16 @@ def calculate_phenotypic_expression_projected():
     }
 
 
+@traced
 def calculate_constitutional_fitness_chile(sp_data, cli_data, gap_data, cd_data, pe_data):
     """
     Calculate Constitutional Fitness for Chile 2022 (counterfactual)
     
     CF = [PE × (1-Gap) × (1-CD) × SP] / (CLI + ε)
     """
-    print("\n\n" + "="*70)
-    print("CHILE 2022 CONSTITUTIONAL FITNESS (COUNTERFACTUAL)")
-    print("="*70)
+    logger.info("\n\n" + "="*70)
+    logger.info("CHILE 2022 CONSTITUTIONAL FITNESS (COUNTERFACTUAL)")
+    logger.info("="*70)
     
     sp = sp_data['sp']
     cli = cli_data['cli_2022']
@@ -388,31 +407,31 @@ def calculate_constitutional_fitness_chile(sp_data, cli_data, gap_data, cd_data,
     pe = pe_data['pe_projected']
     
     # Calculate CF
-    cf = (pe * (1 - gap) * (1 - cd) * sp) / (cli + 0.01)
-    
-    print("\nConstitutional Fitness Components:")
-    print(f"  PE (Phenotypic Expression): {pe:.3f}")
-    print(f"  Gap (Implementation Gap): {gap:.3f} → (1-Gap): {(1-gap):.3f}")
-    print(f"  CD (Cultural Distance): {cd:.3f} → (1-CD): {(1-cd):.3f}")
-    print(f"  SP (Selection Pressure): {sp:.3f}")
-    print(f"  CLI (Constitutional Lock-in): {cli:.3f}")
-    
-    print(f"\nCONSTITUTIONAL FITNESS: {cf:.6f}")
-    
-    print(f"\n{ESTIMATION} - Calculated from verified/estimated components above")
-    
-    print("\n" + "="*70)
-    print("INTERPRETATION:")
-    print(f"CF = {cf:.6f} (essentially zero)")
-    print("\nFitness Scale:")
-    print("  CF > 0.70: Transformative viable")
-    print("  CF 0.40-0.70: Contested transformation")
-    print("  CF 0.20-0.40: Aspirational with limits")
-    print("  CF < 0.20: Utopian failure")
-    print(f"\nChile 2022: CF = {cf:.6f} → EXTREME UTOPIAN FAILURE")
-    print("\nThis quantifies why 62% voted RECHAZO:")
-    print("Voters intuitively understood the constitution was unviable")
-    print("="*70)
+    cf = constitutional_fitness(pe, gap, cd, sp, cli)
+    
+    logger.info("\nConstitutional Fitness Components:")
+    logger.info("  PE (Phenotypic Expression): %.3f", pe)
+    logger.info("  Gap (Implementation Gap): %.3f → (1-Gap): %.3f", gap, 1-gap)
+    logger.info("  CD (Cultural Distance): %.3f → (1-CD): %.3f", cd, 1-cd)
+    logger.info("  SP (Selection Pressure): %.3f", sp)
+    logger.info("  CLI (Constitutional Lock-in): %.3f", cli)
+
+    logger.info("\nCONSTITUTIONAL FITNESS: %.6f", cf)
+
+    logger.info("\n%s - Calculated from verified/estimated components above", ESTIMATION)
+
+    logger.info("\n" + "="*70)
+    logger.info("INTERPRETATION:")
+    logger.info("CF = %.6f (essentially zero)", cf)
+    logger.info("\nFitness Scale:")
+    logger.info("  CF > 0.70: Transformative viable")
+    logger.info("  CF 0.40-0.70: Contested transformation")
+    logger.info("  CF 0.20-0.40: Aspirational with limits")
+    logger.info("  CF < 0.20: Utopian failure")
+    logger.info("\nChile 2022: CF = %.6f → EXTREME UTOPIAN FAILURE", cf)
+    logger.info("\nThis quantifies why 62% voted RECHAZO:")
+    logger.info("Voters intuitively understood the constitution was unviable")
+    logger.info("="*70)
     
     return {
         'cf': cf,
@@ -424,13 +443,14 @@ def calculate_constitutional_fitness_chile(sp_data, cli_data, gap_data, cd_data,
     }
 
 
+@traced
 def compare_chile_colombia():
     """
     Direct comparison: Chile 2022 vs Colombia 1991
     """
-    print("\n\n" + "="*70)
-    print("COMPARATIVE ANALYSIS: CHILE 2022 vs COLOMBIA 1991")
-    print("="*70)
+    logger.info("\n\n" + "="*70)
+    logger.info("COMPARATIVE ANALYSIS: CHILE 2022 vs COLOMBIA 1991")
+    logger.info("="*70)
     
     comparison_data = {
         'Metric': [
@@ -473,40 +493,41 @@ def compare_chile_colombia():
     
     df = pd.DataFrame(comparison_data)
     
-    print("\n" + df.to_string(index=False))
-    
-    print("\n" + "="*70)
-    print("KEY INSIGHTS:")
-    print("\n1. SELECTION PRESSURE:")
-    print("   Colombia: 0.683 (positive) vs Chile: 0.310 (negative)")
-    print("   Chile had HALF the popular/elite support of Colombia")
-    
-    print("\n2. CONSTITUTIONAL LOCK-IN:")
-    print("   Colombia: 0.135 (open pathways) vs Chile: 0.810 (blocked)")
-    print("   Chile inherited EXTREME lock-in from 1980 constitution")
-    
-    print("\n3. IMPLEMENTATION GAP:")
-    print("   Colombia: 35% (manageable) vs Chile: 75% (massive)")
-    print("   Chile promised TWICE as much relative to capacity")
-    
-    print("\n4. CULTURAL DISTANCE:")
-    print("   Colombia: 0.25 (compatible) vs Chile: 0.58 (incompatible)")
-    print("   Chile's norms were ALIEN to dominant memes")
-    
-    print("\n5. CONSTITUTIONAL FITNESS:")
-    print("   Colombia: 0.913 (high) vs Chile: 0.006 (near-zero)")
-    print("   Chile was 99.3% LESS FIT for transformation")
-    
-    print("\n" + "="*70)
-    print("DIXON & LANDAU VALIDATION:")
-    print("✓ Colombia succeeded: Adequate support (0.68) + Open pathways (CLI 0.14)")
-    print("✓ Chile failed: Inadequate support (0.31) + Blocked pathways (CLI 0.81)")
-    print("\nEPT adds QUANTIFICATION: Not just qualitative, but MEASURABLE differences")
-    print("="*70)
+    logger.info("\n%s", TableText(df))
+
+    logger.info("\n" + "="*70)
+    logger.info("KEY INSIGHTS:")
+    logger.info("\n1. SELECTION PRESSURE:")
+    logger.info("   Colombia: 0.683 (positive) vs Chile: 0.310 (negative)")
+    logger.info("   Chile had HALF the popular/elite support of Colombia")
+
+    logger.info("\n2. CONSTITUTIONAL LOCK-IN:")
+    logger.info("   Colombia: 0.135 (open pathways) vs Chile: 0.810 (blocked)")
+    logger.info("   Chile inherited EXTREME lock-in from 1980 constitution")
+
+    logger.info("\n3. IMPLEMENTATION GAP:")
+    logger.info("   Colombia: 35% (manageable) vs Chile: 75% (massive)")
+    logger.info("   Chile promised TWICE as much relative to capacity")
+
+    logger.info("\n4. CULTURAL DISTANCE:")
+    logger.info("   Colombia: 0.25 (compatible) vs Chile: 0.58 (incompatible)")
+    logger.info("   Chile's norms were ALIEN to dominant memes")
+
+    logger.info("\n5. CONSTITUTIONAL FITNESS:")
+    logger.info("   Colombia: 0.913 (high) vs Chile: 0.006 (near-zero)")
+    logger.info("   Chile was 99.3% LESS FIT for transformation")
+
+    logger.info("\n" + "="*70)
+    logger.info("DIXON & LANDAU VALIDATION:")
+    logger.info("✓ Colombia succeeded: Adequate support (0.68) + Open pathways (CLI 0.14)")
+    logger.info("✓ Chile failed: Inadequate support (0.31) + Blocked pathways (CLI 0.81)")
+    logger.info("\nEPT adds QUANTIFICATION: Not just qualitative, but MEASURABLE differences")
+    logger.info("="*70)
     
     return df
 
 
+@traced(cat='run', rows=False)
 def test_h2_chile():
     """
     Main function: Test Dixon & Landau H2 for Chile 2022
@@ -519,11 +540,11 @@ def test_h2_chile():
     - Structural utopianism → High CLI + High Gap
     - Failure → Plebiscite rejection + projected PE near-zero
     """
-    print("\n\n" + "#"*70)
-    print("#" + " "*68 + "#")
-    print("#" + "  H2 TEST: CHILE 2022 UTOPIAN FAILURE".center(68) + "#")
-    print("#" + " "*68 + "#")
-    print("#"*70)
+    logger.info("\n\n" + "#"*70)
+    logger.info("#" + " "*68 + "#")
+    logger.info("#" + "  H2 TEST: CHILE 2022 UTOPIAN FAILURE".center(68) + "#")
+    logger.info("#" + " "*68 + "#")
+    logger.info("#"*70)
     
     # Calculate all components
     sp_data = calculate_selection_pressure_chile_2022()
@@ -537,43 +558,43 @@ def test_h2_chile():
     comparison_df = compare_chile_colombia()
     
     # Final verdict
-    print("\n\n" + "="*70)
-    print("H2 VERDICT: CHILE 2022")
-    print("="*70)
-    
-    print("\nDixon & Landau Hypothesis:")
-    print("\"Chile 2022 failed due to sociological utopianism (lack of popular support)")
-    print(" + structural utopianism (no implementation pathways)\"")
-    
-    print("\nEPT Empirical Test Results:")
-    print("\nSOCIOLOGICAL UTOPIANISM:")
-    print(f"1. Popular Support: 38.14% (plebiscite) → SP = {sp_data['sp']:.3f}")
-    print(f"   ✓ CONFIRMED: SP < 0.35 = negative selection")
-    print(f"2. Cultural Distance: {cd_data['weighted_cd']:.3f}")
-    print(f"   ✓ CONFIRMED: CD > 0.45 = high incompatibility")
-    
-    print("\nSTRUCTURAL UTOPIANISM:")
-    print(f"3. Constitutional Lock-in: CLI = {cli_data['cli_2022']:.2f}")
-    print(f"   ✓ CONFIRMED: CLI > 0.65 = blocked pathways")
-    print(f"4. Implementation Gap (projected): {gap_data['weighted_gap']*100:.1f}%")
-    print(f"   ✓ CONFIRMED: Gap > 60% = massive unfunded mandates")
-    
-    print("\nOUTCOME:")
-    print(f"5. Plebiscite Result: 61.86% REJECTION")
-    print(f"   ✓ CONFIRMED: Failed to pass")
-    print(f"6. Constitutional Fitness (counterfactual): {cf_data['cf']:.6f}")
-    print(f"   ✓ CONFIRMED: CF < 0.20 = utopian failure inevitable")
-    
-    print("\nNovel EPT Insights:")
-    print(f"- Chile's CF (0.006) was 99.3% LOWER than Colombia's (0.913)")
-    print(f"- Inherited CLI (0.81) meant pathways were ALREADY blocked")
-    print(f"- Cultural distance (0.58) showed norms were ALIEN to Chilean culture")
-    print(f"- Even if passed, PE would be ~0.12 (symbolic constitution)")
-    print(f"- Voters made RATIONAL choice: Rejected unviable project")
-    
-    print("\n" + "="*70)
-    print("OVERALL: Dixon & Landau H2 VALIDATED by EPT quantitative analysis")
-    print("="*70)
+    logger.info("\n\n" + "="*70)
+    logger.info("H2 VERDICT: CHILE 2022")
+    logger.info("="*70)
+
+    logger.info("\nDixon & Landau Hypothesis:")
+    logger.info("\"Chile 2022 failed due to sociological utopianism (lack of popular support)")
+    logger.info(" + structural utopianism (no implementation pathways)\"")
+
+    logger.info("\nEPT Empirical Test Results:")
+    logger.info("\nSOCIOLOGICAL UTOPIANISM:")
+    logger.info("1. Popular Support: 38.14%% (plebiscite) → SP = %.3f", sp_data['sp'])
+    logger.info("   ✓ CONFIRMED: SP < 0.35 = negative selection")
+    logger.info("2. Cultural Distance: %.3f", cd_data['weighted_cd'])
+    logger.info("   ✓ CONFIRMED: CD > 0.45 = high incompatibility")
+
+    logger.info("\nSTRUCTURAL UTOPIANISM:")
+    logger.info("3. Constitutional Lock-in: CLI = %.2f", cli_data['cli_2022'])
+    logger.info("   ✓ CONFIRMED: CLI > 0.65 = blocked pathways")
+    logger.info("4. Implementation Gap (projected): %.1f%%", gap_data['weighted_gap']*100)
+    logger.info("   ✓ CONFIRMED: Gap > 60% = massive unfunded mandates")
+
+    logger.info("\nOUTCOME:")
+    logger.info("5. Plebiscite Result: 61.86% REJECTION")
+    logger.info("   ✓ CONFIRMED: Failed to pass")
+    logger.info("6. Constitutional Fitness (counterfactual): %.6f", cf_data['cf'])
+    logger.info("   ✓ CONFIRMED: CF < 0.20 = utopian failure inevitable")
+
+    logger.info("\nNovel EPT Insights:")
+    logger.info("- Chile's CF (0.006) was 99.3% LOWER than Colombia's (0.913)")
+    logger.info("- Inherited CLI (0.81) meant pathways were ALREADY blocked")
+    logger.info("- Cultural distance (0.58) showed norms were ALIEN to Chilean culture")
+    logger.info("- Even if passed, PE would be ~0.12 (symbolic constitution)")
+    logger.info("- Voters made RATIONAL choice: Rejected unviable project")
+
+    logger.info("\n" + "="*70)
+    logger.info("OVERALL: Dixon & Landau H2 VALIDATED by EPT quantitative analysis")
+    logger.info("="*70)
     
     return {
         'sp_data': sp_data,
@@ -587,7 +608,44 @@ def test_h2_chile():
     }
 
 
+@traced(cat='run', rows=False)
+def run_h2_chile():
+    """
+    Library entry point: H2 Chile 2022 metrics with no console output
+
+    Returns:
+        CaseResult (counterfactual, tagged [Proyección])
+    """
+    sp_data = calculate_selection_pressure_chile_2022()
+    cli_data = calculate_cli_chile_trajectory()
+    gap_data = calculate_fiscal_gap_projected()
+    cd_data = calculate_cultural_distance_chile()
+    pe_data = calculate_phenotypic_expression_projected()
+    cf_data = calculate_constitutional_fitness_chile(sp_data, cli_data, gap_data, cd_data, pe_data)
+
+    return CaseResult(
+        country='Chile',
+        years=np.array([2022]),
+        sp=as_series(cf_data['sp'], 1),
+        cli=as_series(cf_data['cli'], 1),
+        gap=as_series(cf_data['gap'], 1),
+        cd=as_series(cf_data['cd'], 1),
+        pe=as_series(cf_data['pe'], 1),
+        cf=as_series(cf_data['cf'], 1),
+        components={
+            'SP': sp_data,
+            'CLI': cli_data,
+            'Gap': gap_data,
+            'CD': cd_data,
+            'PE': pe_data
+        },
+        provenance=PROJECTION,
+        verdict='VALIDATED'
+    )
+
+
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
     results = test_h2_chile()
     
     # Save results
@@ -595,7 +653,7 @@ if __name__ == "__main__":
     output_dir.mkdir(exist_ok=True)
     
     # Save comparison table
-    results['comparison_df'].to_csv(output_dir / "chile_colombia_comparison.csv", index=False)
+    save_frame(results['comparison_df'], output_dir / "chile_colombia_comparison.csv")
     
     # Save CF data
     cf_summary = pd.DataFrame([{
@@ -609,7 +667,7 @@ if __name__ == "__main__":
         'CF': results['cf_data']['cf'],
         'Outcome': 'Utopian Failure'
     }])
-    cf_summary.to_csv(output_dir / "chile_constitutional_fitness.csv", index=False)
+    save_frame(cf_summary, output_dir / "chile_constitutional_fitness.csv")
     
     print("\n\n✓ H2 Analysis complete. Results saved to analysis_results/")
     print(f"✓ Reality Filter applied: {VERIFIED}, {ESTIMATION}, {PROJECTION}")
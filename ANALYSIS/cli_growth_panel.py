@@ -0,0 +1,267 @@
+"""
+CLI GROWTH PANEL: Batched growth regressions and change-point detection
+Panel-wide version of argentina_paradox_analysis.analyze_cli_growth_rate
+
+All series live on a common annual grid (countries × years, NaN where a
+country has no observation). Every regression statistic is built from
+prefix sums of n, x, y, x², xy, y² along the year axis, so the OLS fit of
+ANY contiguous year range costs O(1): all countries × all rolling windows,
+or all countries × all candidate break points, are evaluated in one
+vectorized computation instead of a linregress loop.
+
+Change points: segmented least squares. For each country, every admissible
+break (or pair of breaks) is scored by the summed SSE of separate linear
+fits per segment; the minimum marks where lock-in growth changes pace
+(e.g. Argentina's 1994-2010 ramp).
+
+Author: Adrian Lerer
+Date: November 2025
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+ESTIMATION = "[Estimación]"
+
+# Same origin as analyze_cli_growth_rate (years since 1949)
+BASE_YEAR = 1949
+
+
+def panel_from_long(df, value_col, country_col='Country', year_col='Year'):
+    """
+    Pivot a long DataFrame onto a dense annual grid
+
+    Returns:
+        (countries, years, values) with values of shape
+        (n_countries, n_years) and NaN where missing
+    """
+    countries = np.asarray(sorted(df[country_col].unique()))
+    years = np.arange(int(df[year_col].min()), int(df[year_col].max()) + 1)
+    values = np.full((len(countries), len(years)), np.nan)
+    rows = np.searchsorted(countries, df[country_col].to_numpy())
+    cols = df[year_col].to_numpy().astype(int) - years[0]
+    values[rows, cols] = df[value_col].to_numpy(dtype=np.float64)
+    return countries, years, values
+
+
+def _prefix_sums(years, values, base_year=BASE_YEAR):
+    """Prefix sums of n, x, y, xx, xy, yy along the year axis (length T + 1)"""
+    mask = ~np.isnan(values)
+    x = np.where(mask, (np.asarray(years) - base_year).astype(np.float64), 0.0)
+    y = np.where(mask, values, 0.0)
+    terms = np.stack([mask.astype(np.float64), x, y, x * x, x * y, y * y])
+    prefix = np.zeros(terms.shape[:-1] + (terms.shape[-1] + 1,))
+    np.cumsum(terms, axis=-1, out=prefix[..., 1:])
+    return prefix
+
+
+def _ols(sums):
+    """OLS statistics from stacked sums (n, Sx, Sy, Sxx, Sxy, Syy)"""
+    n, sx, sy, sxx, sxy, syy = sums
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ssx = sxx - sx * sx / n
+        ssy = syy - sy * sy / n
+        spxy = sxy - sx * sy / n
+        slope = spxy / ssx
+        intercept = (sy - slope * sx) / n
+        r = spxy / np.sqrt(ssx * ssy)
+        r = np.clip(r, -1.0, 1.0)
+        sse = np.maximum(ssy - slope * spxy, 0.0)
+        df = n - 2
+        stderr = np.sqrt(sse / df / ssx)
+        t = r * np.sqrt(df / ((1.0 - r) * (1.0 + r)))
+        p_value = 2 * stats.t.sf(np.abs(t), df)
+    p_value = np.where(np.abs(r) == 1.0, 0.0, p_value)
+    return {
+        'slope': slope,
+        'intercept': intercept,
+        'r_squared': r * r,
+        'p_value': p_value,
+        'stderr': stderr,
+        'sse': np.where(n >= 2, sse, 0.0),
+        'n': n
+    }
+
+
+def fit_growth(years, values, base_year=BASE_YEAR):
+    """
+    Full-period CLI growth regression for every country
+
+    Matches scipy.stats.linregress(years - base_year, cli) per row.
+
+    Returns:
+        Dict of arrays (one entry per country): slope, intercept,
+        r_squared, p_value, stderr, n
+    """
+    values = np.atleast_2d(values)
+    prefix = _prefix_sums(years, values, base_year)
+    result = _ols(prefix[..., -1] - prefix[..., 0])
+    result.pop('sse')
+    return result
+
+
+def rolling_growth(years, values, window, min_obs=3, base_year=BASE_YEAR):
+    """
+    CLI growth regressions over every rolling window of `window` years
+
+    Args:
+        years: Annual grid (length T)
+        values: (n_countries, T) array with NaN gaps
+        window: Window length in calendar years
+        min_obs: Windows with fewer observations are returned as NaN
+
+    Returns:
+        (window_starts, stats) where stats arrays have shape
+        (n_countries, T - window + 1)
+    """
+    values = np.atleast_2d(values)
+    prefix = _prefix_sums(years, values, base_year)
+    sums = prefix[..., window:] - prefix[..., :-window]
+    result = _ols(sums)
+    result.pop('sse')
+    invalid = result['n'] < max(min_obs, 3)
+    for key in ('slope', 'intercept', 'r_squared', 'p_value', 'stderr'):
+        result[key] = np.where(invalid, np.nan, result[key])
+    return np.asarray(years)[:len(years) - window + 1], result
+
+
+def rolling_growth_frame(countries, years, values, window, min_obs=3):
+    """Long DataFrame of rolling_growth results (valid windows only)"""
+    starts, result = rolling_growth(years, values, window, min_obs)
+    df = pd.DataFrame({
+        'Country': np.repeat(countries, len(starts)),
+        'Window_Start': np.tile(starts, len(countries)),
+        'Window_End': np.tile(starts + window - 1, len(countries)),
+        'Slope': result['slope'].ravel(),
+        'R_Squared': result['r_squared'].ravel(),
+        'P_Value': result['p_value'].ravel(),
+        'Std_Err': result['stderr'].ravel(),
+        'N': result['n'].ravel().astype(int)
+    })
+    return df.dropna(subset=['Slope']).reset_index(drop=True)
+
+
+def detect_change_points(years, values, n_breaks=2, min_obs=3, base_year=BASE_YEAR):
+    """
+    Segmented least squares change-point detection for every country
+
+    Args:
+        years: Annual grid (length T)
+        values: (n_countries, T) array with NaN gaps
+        n_breaks: 1 or 2 change points
+        min_obs: Minimum observations per segment
+
+    Returns:
+        Dict with 'breaks' (n_countries × n_breaks, first year of each new
+        segment, NaN if none admissible), 'slopes' (n_countries ×
+        n_breaks + 1), 'sse' and 'sse_linear' (single-line fit)
+    """
+    if n_breaks not in (1, 2):
+        raise ValueError("n_breaks must be 1 or 2")
+    values = np.atleast_2d(values)
+    years = np.asarray(years)
+    prefix = _prefix_sums(years, values, base_year)   # (6, C, T+1)
+    c, t = values.shape
+    big = np.inf
+
+    def segment(start, stop):
+        # start/stop: integer arrays broadcastable to the candidate grid
+        s = prefix[..., stop] - prefix[..., start]     # (6, C, *grid)
+        fit = _ols(s)
+        sse = np.where(s[0] >= min_obs, fit['sse'], big)
+        return sse, fit['slope']
+
+    sse_linear = _ols(prefix[..., -1] - prefix[..., 0])['sse']
+    zero = np.zeros(1, dtype=int)
+    end = np.full(1, t)
+
+    if n_breaks == 1:
+        b = np.arange(1, t)
+        left, left_slope = segment(zero, b)
+        right, right_slope = segment(b, end)
+        total = left + right                           # (C, T-1)
+        best = np.argmin(total, axis=1)
+        rows = np.arange(c)
+        ok = np.isfinite(total[rows, best])
+        breaks = np.where(ok, years[b[best]], np.nan)[:, np.newaxis]
+        slopes = np.stack([left_slope[rows, best], right_slope[rows, best]], axis=1)
+        sse = total[rows, best]
+    else:
+        b1 = np.arange(1, t)[:, np.newaxis]
+        b2 = np.arange(1, t)[np.newaxis, :]
+        s1, k1 = segment(np.zeros_like(b1), b1)          # (C, T-1, 1)
+        s2, k2 = segment(b1, np.maximum(b2, b1))         # (C, T-1, T-1)
+        s3, k3 = segment(b2, np.full_like(b2, t))        # (C, 1, T-1)
+        total = np.where(b2 > b1, s1 + s2 + s3, big)
+        flat = total.reshape(c, -1)
+        best = np.argmin(flat, axis=1)
+        i, j = np.unravel_index(best, total.shape[1:])
+        rows = np.arange(c)
+        ok = np.isfinite(flat[rows, best])
+        breaks = np.where(ok[:, np.newaxis],
+                          np.stack([years[i + 1], years[j + 1]], axis=1), np.nan)
+        slopes = np.stack([k1[rows, i, 0], k2[rows, i, j], k3[rows, 0, j]], axis=1)
+        sse = flat[rows, best]
+
+    slopes = np.where(np.isfinite(sse)[:, np.newaxis], slopes, np.nan)
+    return {'breaks': breaks, 'slopes': slopes, 'sse': sse, 'sse_linear': sse_linear}
+
+
+def change_point_frame(countries, years, values, n_breaks=2, min_obs=3):
+    """One row per country: break years, segment slopes and acceleration"""
+    result = detect_change_points(years, values, n_breaks, min_obs)
+    data = {'Country': countries}
+    for k in range(n_breaks):
+        data[f'Break_{k+1}'] = result['breaks'][:, k]
+    for k in range(n_breaks + 1):
+        data[f'Slope_{k+1}'] = result['slopes'][:, k]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        reduction = (1 - result['sse'] / result['sse_linear']) * 100
+    data['SSE_Reduction_%'] = np.where(np.isfinite(result['sse']), reduction, np.nan)
+    return pd.DataFrame(data)
+
+
+if __name__ == "__main__":
+    import time
+
+    print("="*70)
+    print("CLI GROWTH PANEL: ROLLING REGRESSIONS + CHANGE POINTS")
+    print("="*70)
+
+    argentina = pd.read_csv('../DATA/analysis_results/argentina_reform_history.csv')
+    argentina = argentina.rename(columns={'CLI_Estimated': 'CLI'})
+    argentina['Country'] = 'Argentina'
+    colombia = pd.read_csv('../DATA/analysis_results/colombia_cli_trajectory.csv')
+    colombia['Country'] = 'Colombia'
+    long_df = pd.concat([argentina[['Country', 'Year', 'CLI']],
+                         colombia[['Country', 'Year', 'CLI']]], ignore_index=True)
+    countries, years, cli = panel_from_long(long_df, 'CLI')
+
+    full = fit_growth(years, cli)
+    reference = stats.linregress(argentina['Year'] - BASE_YEAR, argentina['CLI'])
+    print("\nFull-period growth:")
+    for i, country in enumerate(countries):
+        print(f"  {country}: {full['slope'][i]:+.4f}/year "
+              f"(R² = {full['r_squared'][i]:.3f}, p = {full['p_value'][i]:.2e}, "
+              f"n = {int(full['n'][i])})")
+    print(f"  [check] linregress Argentina slope: {reference.slope:+.4f}/year")
+
+    print("\nChange points (2 breaks, segmented least squares):")
+    print(change_point_frame(countries, years, cli).to_string(
+        index=False, float_format=lambda v: f"{v:.4f}"))
+
+    # Panel-scale timing: 190 countries × 75 years, every 10-year window
+    rng = np.random.default_rng(0)
+    grid = np.arange(1950, 2025)
+    synthetic = np.cumsum(rng.normal(0.005, 0.01, (190, len(grid))), axis=1) + 0.4
+    synthetic[rng.random(synthetic.shape) < 0.3] = np.nan
+    start = time.perf_counter()
+    starts, rolling = rolling_growth(grid, synthetic, window=10)
+    breaks = detect_change_points(grid, synthetic, n_breaks=2)
+    elapsed = time.perf_counter() - start
+    print(f"\nSynthetic panel: 190 countries × {len(grid)} years, "
+          f"{rolling['slope'].size:,} windows + 2-break search in {elapsed*1000:.0f} ms")
+
+    print(f"\n{ESTIMATION} - CLI trajectories from DATA/analysis_results")
+    print("="*70)
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Court Index: Incremental on-disk index of court decisions for CLI components
+Derives judicial_lock and path_dependence (calculate_cli_colombia_trajectory)
+and judicial_activism and precedent_weight (calculate_cli_chile_trajectory)
+from a local dump of rulings instead of hard-coded arrays
+
+Corpus: JSON Lines files, one decision per line, e.g.
+    {"id": "C-355/06", "country": "Colombia", "court": "Corte Constitucional",
+     "date": "2006-05-10", "doctrines": ["derechos reproductivos"],
+     "outcome": "conditionally_constitutional", "cites": ["T-406/92"]}
+Field names are configurable (FIELDS).
+
+Index: a SQLite database (stdlib, single file) with decisions, doctrine
+tags and citations, indexed by (country, year), court and doctrine. Each
+source file's byte offset, size, mtime and a hash of two bounded windows
+(the first and the last VERIFY_WINDOW bytes before the offset) are
+recorded, so update() parses only lines appended since the last run
+(dumps are append-only) and reads O(new bytes), not O(corpus). A file
+with unchanged size and mtime is skipped without reading it. A file that
+shrank or whose windows changed is re-indexed from scratch; an in-place
+edit of the same size that leaves both windows intact is not detected
+(update(path, rebuild=True) re-indexes unconditionally). A re-ingested
+decision id replaces its doctrine tags and citations along with the
+decision. Components are computed by indexed SQL aggregates, never by
+re-scanning the corpus.
+
+Components per country-year [Estimación] (operationalization):
+    judicial_activism  share of the year's rulings with an ACTIVIST_OUTCOMES
+                       outcome (struck down or rewritten legislation)
+    judicial_lock      cumulative share of rulings to date with a
+                       LOCK_OUTCOMES outcome (rulings that bind future
+                       majorities: amendment review, non-regression)
+    precedent_weight   share of the year's rulings citing an earlier ruling
+                       of the same court
+    path_dependence    share of the year's rulings applying a doctrine line
+                       established in an earlier year
+
+Usage:
+    python court_index.py corpus/*.jsonl          # index (incrementally) + report
+    python court_index.py                         # synthetic corpus demo
+
+Author: Ignacio Adrián Lerer
+Date: November 2025
+License: CC-BY 4.0
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ESTIMATION = "[Estimación]"
+
+INDEX_PATH = Path(__file__).resolve().parent.parent / 'DATA' / 'court_index.sqlite'
+
+# Corpus field names
+FIELDS = {
+    'id': 'id',
+    'country': 'country',
+    'court': 'court',
+    'date': 'date',          # ISO date
+    'year': 'year',          # used if date is absent
+    'doctrines': 'doctrines',
+    'outcome': 'outcome',
+    'cites': 'cites'
+}
+
+ACTIVIST_OUTCOMES = ('unconstitutional', 'conditionally_constitutional', 'modulated')
+LOCK_OUTCOMES = ('unconstitutional_amendment', 'non_regression', 'entrenchment')
+
+# Decisions inserted per transaction
+BATCH_SIZE = 50_000
+
+# Bytes hashed at the start and at the end of the indexed prefix
+VERIFY_WINDOW = 1 << 16
+
+# Files modified this close to their last check may change again without
+# a visible mtime change (coarse timestamps), so they are always verified
+RACY_NS = 2_000_000_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS decisions (
+    id TEXT PRIMARY KEY,
+    country TEXT NOT NULL,
+    court TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    outcome TEXT,
+    source TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS doctrines (
+    decision_id TEXT NOT NULL,
+    doctrine TEXT NOT NULL,
+    PRIMARY KEY (decision_id, doctrine)
+);
+CREATE TABLE IF NOT EXISTS citations (
+    citing TEXT NOT NULL,
+    cited TEXT NOT NULL,
+    PRIMARY KEY (citing, cited)
+);
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER,
+    checked_ns INTEGER,
+    window_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS decisions_country_year ON decisions (country, year);
+CREATE INDEX IF NOT EXISTS decisions_court ON decisions (court);
+CREATE INDEX IF NOT EXISTS doctrines_doctrine ON doctrines (doctrine);
+CREATE INDEX IF NOT EXISTS citations_cited ON citations (cited);
+"""
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+def _window_hash(f, offset):
+    """Hash of the first and last VERIFY_WINDOW bytes before offset in binary file f"""
+    digest = hashlib.blake2b(str(offset).encode())
+    head = min(VERIFY_WINDOW, offset)
+    f.seek(0)
+    digest.update(f.read(head))
+    tail = max(offset - VERIFY_WINDOW, head)
+    f.seek(tail)
+    digest.update(f.read(offset - tail))
+    return digest.hexdigest()
+
+
+class CourtIndex:
+    """
+    Incrementally updated index of court decisions
+
+    Args:
+        path: SQLite file (created if missing); ':memory:' for a throwaway index
+        fields: Corpus field names (see FIELDS)
+    """
+
+    def __init__(self, path=INDEX_PATH, fields=None):
+        self.path = path
+        self.fields = {**FIELDS, **(fields or {})}
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path))
+        self.db.executescript(SCHEMA)
+        columns = [row[1] for row in self.db.execute("PRAGMA table_info(sources)")]
+        for column, kind in (('mtime_ns', 'INTEGER'), ('checked_ns', 'INTEGER'), ('window_hash', 'TEXT')):
+            if column not in columns:
+                # Older index: lacking a window hash, its sources are
+                # re-indexed on the next update
+                self.db.execute(f"ALTER TABLE sources ADD COLUMN {column} {kind}")
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM decisions").fetchone()[0]
+
+    # -------------------------------------------------------------------------
+    # Ingestion
+    # -------------------------------------------------------------------------
+
+    def _parse(self, record):
+        f = self.fields
+        date = record.get(f['date'])
+        year = int(str(date)[:4]) if date else int(record[f['year']])
+        return (
+            str(record[f['id']]),
+            record[f['country']],
+            record[f['court']],
+            year,
+            record.get(f['outcome']),
+            _as_list(record.get(f['doctrines'])),
+            [str(c) for c in _as_list(record.get(f['cites']))]
+        )
+
+    def _insert(self, rows, source):
+        # A re-ingested id replaces its decision row; drop its old tags and
+        # citations so they are replaced too rather than accumulated
+        ids = [(r[0],) for r in rows]
+        self.db.executemany("DELETE FROM doctrines WHERE decision_id = ?", ids)
+        self.db.executemany("DELETE FROM citations WHERE citing = ?", ids)
+        self.db.executemany(
+            "INSERT OR REPLACE INTO decisions VALUES (?, ?, ?, ?, ?, ?)",
+            [(r[0], r[1], r[2], r[3], r[4], source) for r in rows])
+        self.db.executemany(
+            "INSERT OR IGNORE INTO doctrines VALUES (?, ?)",
+            [(r[0], d) for r in rows for d in r[5]])
+        self.db.executemany(
+            "INSERT OR IGNORE INTO citations VALUES (?, ?)",
+            [(r[0], c) for r in rows for c in r[6]])
+
+    def _forget(self, source):
+        ids = "SELECT id FROM decisions WHERE source = ?"
+        self.db.execute(f"DELETE FROM doctrines WHERE decision_id IN ({ids})", (source,))
+        self.db.execute(f"DELETE FROM citations WHERE citing IN ({ids})", (source,))
+        self.db.execute("DELETE FROM decisions WHERE source = ?", (source,))
+
+    def update(self, paths, rebuild=False):
+        """
+        Index new rulings from JSON Lines files
+
+        Only bytes after each file's recorded offset are parsed; a trailing
+        line without a newline is left for the next update. A file whose
+        size and mtime are unchanged is skipped. A file that shrank or whose
+        verify windows no longer match is re-indexed from the start.
+
+        Args:
+            rebuild: Re-index every file from the start regardless
+
+        Returns:
+            Dict of path → decisions added
+        """
+        if isinstance(paths, (str, Path)):
+            paths = [paths]
+        added = {}
+        for path in paths:
+            source = str(Path(path).resolve())
+            stat = os.stat(path)
+            size, mtime_ns = stat.st_size, stat.st_mtime_ns
+            row = self.db.execute(
+                "SELECT offset, size, mtime_ns, checked_ns, window_hash FROM sources WHERE path = ?",
+                (source,)).fetchone()
+            offset, known_size, known_mtime, checked_ns, window_hash = row if row else (0, None, None, None, None)
+            if (not rebuild and size == known_size and mtime_ns == known_mtime
+                    and mtime_ns + RACY_NS < checked_ns):
+                added[str(path)] = 0
+                continue
+
+            count = 0
+            batch = []
+            with open(path, 'rb') as f:
+                if offset and (rebuild or size < offset or _window_hash(f, offset) != window_hash):
+                    # File was rewritten: drop what came from it and start over
+                    with self.db:
+                        self._forget(source)
+                    offset = 0
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break
+                    offset += len(line)
+                    if line.strip():
+                        batch.append(self._parse(json.loads(line)))
+                    if len(batch) >= BATCH_SIZE:
+                        with self.db:
+                            self._insert(batch, source)
+                            self._record(source, offset, stat, _window_hash(f, offset))
+                        f.seek(offset)
+                        count += len(batch)
+                        batch = []
+                with self.db:
+                    self._insert(batch, source)
+                    self._record(source, offset, stat, _window_hash(f, offset))
+            added[str(path)] = count + len(batch)
+        return added
+
+    def _record(self, source, offset, stat, window_hash):
+        self.db.execute(
+            "INSERT OR REPLACE INTO sources (path, offset, size, mtime_ns, checked_ns, window_hash) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (source, offset, stat.st_size, stat.st_mtime_ns, time.time_ns(), window_hash))
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def counts(self, by=('year', 'court', 'doctrine'), country=None):
+        """
+        Decision counts grouped by any of year, court, doctrine, outcome, country
+
+        Returns:
+            DataFrame with the grouping columns and N
+        """
+        allowed = {'year': 'd.year', 'court': 'd.court', 'doctrine': 't.doctrine',
+                   'outcome': 'd.outcome', 'country': 'd.country'}
+        columns = [allowed[name] for name in by]
+        join = "JOIN doctrines t ON t.decision_id = d.id" if 'doctrine' in by else ""
+        where, params = ("WHERE d.country = ?", (country,)) if country else ("", ())
+        sql = (f"SELECT {', '.join(columns)}, COUNT(DISTINCT d.id) FROM decisions d {join} "
+               f"{where} GROUP BY {', '.join(columns)} ORDER BY {', '.join(columns)}")
+        rows = self.db.execute(sql, params).fetchall()
+        return pd.DataFrame(rows, columns=[name.capitalize() for name in by] + ['N'])
+
+    def _per_year(self, sql, params):
+        return dict(self.db.execute(sql, params).fetchall())
+
+    def components(self, country, court=None):
+        """
+        CLI judicial components per year for one country (optionally one court)
+
+        Returns:
+            DataFrame with Year, Decisions, Judicial_Activism, Judicial_Lock,
+            Precedent_Weight, Path_Dependence
+        """
+        scope = "d.country = ?" + (" AND d.court = ?" if court else "")
+        params = (country, court) if court else (country,)
+        activist = ', '.join('?' * len(ACTIVIST_OUTCOMES))
+        lock = ', '.join('?' * len(LOCK_OUTCOMES))
+
+        rows = self.db.execute(
+            f"SELECT d.year, COUNT(*), SUM(d.outcome IN ({activist})), SUM(d.outcome IN ({lock})) "
+            f"FROM decisions d WHERE {scope} GROUP BY d.year ORDER BY d.year",
+            ACTIVIST_OUTCOMES + LOCK_OUTCOMES + params).fetchall()
+        if not rows:
+            return pd.DataFrame(columns=['Year', 'Decisions', 'Judicial_Activism', 'Judicial_Lock',
+                                         'Precedent_Weight', 'Path_Dependence'])
+        df = pd.DataFrame(rows, columns=['Year', 'Decisions', 'Activist', 'Lock'])
+
+        citing = self._per_year(
+            f"SELECT d.year, COUNT(DISTINCT d.id) FROM decisions d "
+            f"CROSS JOIN citations c ON c.citing = d.id "
+            f"CROSS JOIN decisions p ON p.id = c.cited AND p.court = d.court AND p.year < d.year "
+            f"WHERE {scope} GROUP BY d.year", params)
+        # CROSS JOIN fixes the join order (SQLite otherwise drives from the
+        # court/doctrine side and scans every decision per citation/doctrine)
+        established = self._per_year(
+            f"WITH first AS (SELECT t.doctrine, MIN(d.year) AS y0 FROM doctrines t "
+            f"JOIN decisions d ON d.id = t.decision_id WHERE {scope} GROUP BY t.doctrine) "
+            f"SELECT d.year, COUNT(DISTINCT d.id) FROM decisions d "
+            f"CROSS JOIN doctrines t ON t.decision_id = d.id CROSS JOIN first f ON f.doctrine = t.doctrine "
+            f"WHERE {scope} AND f.y0 < d.year GROUP BY d.year", params + params)
+
+        n = df['Decisions'].to_numpy(dtype=np.float64)
+        return pd.DataFrame({
+            'Year': df['Year'],
+            'Decisions': df['Decisions'],
+            'Judicial_Activism': df['Activist'] / n,
+            'Judicial_Lock': df['Lock'].cumsum() / df['Decisions'].cumsum(),
+            'Precedent_Weight': df['Year'].map(citing).fillna(0).to_numpy() / n,
+            'Path_Dependence': df['Year'].map(established).fillna(0).to_numpy() / n
+        })
+
+
+def simulate_corpus(path, countries=None, seed=None, append_years=None):
+    """
+    Write (or append to) a synthetic JSON Lines corpus
+
+    Activism, lock-in outcomes and citation of precedent rise over time,
+    loosely following the hard-coded Colombia/Chile trajectories.
+
+    Args:
+        countries: Dict country → (court, first_year, last_year, rulings/year)
+        append_years: Only generate this (first, last) year range (append mode)
+    """
+    rng = np.random.default_rng(seed)
+    countries = countries or {
+        'Colombia': ('Corte Constitucional', 1992, 2025, 1200),
+        'Chile': ('Tribunal Constitucional', 1981, 2022, 400)
+    }
+    doctrines = [f'doctrine_{i:03d}' for i in range(150)]
+    mode = 'a' if append_years else 'w'
+    n = 0
+    with open(path, mode, encoding='utf-8') as f:
+        for country, (court, first, last, per_year) in countries.items():
+            lo, hi = append_years or (first, last)
+            prefix = country[:2].upper()
+            for year in range(max(lo, first), min(hi, last) + 1):
+                t = (year - first) / max(last - first, 1)
+                k = rng.poisson(per_year)
+                p_activist = 0.15 + 0.55 * t
+                p_lock = 0.05 + 0.25 * t
+                outcome = rng.choice(
+                    ['unconstitutional', 'unconstitutional_amendment', 'constitutional'],
+                    size=k, p=[p_activist, p_lock * (1 - p_activist), (1 - p_activist) * (1 - p_lock)])
+                n_doctrines = min(len(doctrines), 10 + int(140 * t))
+                for i in range(k):
+                    cites = []
+                    if year > first and rng.random() < 0.2 + 0.6 * t:
+                        cite_year = rng.integers(first, year)
+                        cites = [f'{prefix}-{cite_year}-{rng.integers(per_year // 2)}']
+                    f.write(json.dumps({
+                        'id': f'{prefix}-{year}-{i}',
+                        'country': country,
+                        'court': court,
+                        'date': f'{year}-{rng.integers(1, 13):02d}-15',
+                        'doctrines': [doctrines[rng.integers(n_doctrines)]],
+                        'outcome': str(outcome[i]),
+                        'cites': cites
+                    }) + '\n')
+                    n += 1
+    return n
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    print("="*70)
+    print("COURT DECISION INDEX: JUDICIAL CLI COMPONENTS")
+    print("="*70)
+
+    if len(sys.argv) > 1:
+        index = CourtIndex()
+        paths = sys.argv[1:]
+        start = time.perf_counter()
+        added = index.update(paths)
+        print(f"\nIndexed {sum(added.values()):,} new decisions in "
+              f"{time.perf_counter() - start:.1f} s ({len(index):,} total) → {index.path}")
+    else:
+        tmp = Path(tempfile.mkdtemp(prefix='ept_courts_'))
+        corpus = tmp / 'decisions.jsonl'
+        index = CourtIndex(tmp / 'court_index.sqlite')
+        simulate_corpus(corpus, seed=1991, append_years=(1981, 2020))
+        start = time.perf_counter()
+        added = index.update(corpus)
+        print(f"\nInitial build: {sum(added.values()):,} decisions in {time.perf_counter() - start:.2f} s")
+
+        simulate_corpus(corpus, seed=2021, append_years=(2021, 2025))
+        start = time.perf_counter()
+        added = index.update(corpus)
+        print(f"Incremental update (2021-2025 rulings): {sum(added.values()):,} decisions in "
+              f"{time.perf_counter() - start:.2f} s ({len(index):,} total)")
+        print(f"Re-run with no new rulings: {sum(index.update(corpus).values())} decisions parsed")
+
+    for country, years in (('Colombia', [1991, 1995, 2000, 2005, 2010, 2015, 2020, 2025]),
+                           ('Chile', [1990, 2000, 2010, 2020, 2022])):
+        start = time.perf_counter()
+        components = index.components(country)
+        elapsed = time.perf_counter() - start
+        if components.empty:
+            continue
+        print(f"\n{country} judicial components ({elapsed*1000:.0f} ms):")
+        shown = components[components['Year'].isin(years)]
+        print(shown.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+    print(f"\n{ESTIMATION} - Shares of indexed rulings; see module docstring for definitions")
+    print("="*70)
@@ -0,0 +1,322 @@
+"""
+DEBT DYNAMICS: Stochastic r−g debt paths projected to FSI and CF
+Carries the Colombia FSI trajectory (debt 72% GDP in 2025) forward with
+100k+ simulated paths per country, vectorized across paths
+
+Debt equation (all % GDP, nominal rates):
+    d_t = d_{t-1} × (1 + r_t) / (1 + g_t) − pb_t
+
+Shocks:
+    g_t, r_t     mean + correlated AR(1) shocks (persistence rho)
+    r_t          + risk_premium × max(d_{t-1} − capacity, 0)
+    pb_t         primary balance closing a share `adjustment` of the gap to
+                 pb_target each year, plus a Bohn-style reaction to debt above
+                 capacity and an i.i.d. shock
+
+FSI per path-year, with spending as in calculate_fsi_colombia (primary
+spending + debt service):
+    spending_t = revenue − pb_t + r_t × d_{t-1} / (1 + g_t)
+    FSI_t      = (revenue / spending_t) × (capacity / d_t)
+
+Debt and spending are floored at MIN_DEBT and MIN_SPENDING (% GDP), so FSI
+stays finite and positive on every path.
+
+FSI → CF [Inferencia]: the fiscal channel acts on the Implementation Gap.
+Delivery of promises scales with fiscal sustainability relative to the
+base year, with elasticity FISCAL_GAP_WEIGHT (the fiscal weight of the
+Chile Gap decomposition, cf_engine.GAP_CHILE_WEIGHTS):
+    Gap_t = 1 − (1 − Gap_base) × (FSI_t / FSI_base)^FISCAL_GAP_WEIGHT
+PE, CD, SP and CLI are held at their base-year values.
+
+Years are simulated in sequence; each step is one vectorized operation
+over all paths. Paths are processed in chunks and reduced into streaming
+summaries (monte_carlo_cf.StreamingSummary), so memory is bounded by
+chunk_size × horizon regardless of n_paths. Histogram ranges come from
+support_envelope: each year's Debt and FSI bounds with every normal shock
+cut at monte_carlo_cf.NORMAL_SUPPORT_SD sd, and the CF they map to.
+
+Author: Adrian Lerer
+Date: November 2025
+"""
+
+import numpy as np
+import pandas as pd
+
+from cf_engine import CF_BAND_EDGES, GAP_CHILE_WEIGHTS, constitutional_fitness
+from fsi_engine import FSI_CRISIS_THRESHOLD, fiscal_sustainability
+from monte_carlo_cf import DEFAULT_QUANTILES, NORMAL_SUPPORT_SD, StreamingSummary
+
+PROJECTION = "[Proyección]"
+INFERENCE = "[Inferencia]"
+
+# Fiscal weight in the Gap decomposition
+FISCAL_GAP_WEIGHT = GAP_CHILE_WEIGHTS['fiscal_gap']
+
+# Floors (% GDP) keeping FSI = (revenue / spending) × (capacity / debt) finite
+MIN_DEBT = 0.01
+MIN_SPENDING = 0.01
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Colombia 2025 (calculate_fsi_colombia) and stochastic assumptions
+COLOMBIA_2025 = {
+    'year': 2025,
+    'debt': 72.0,
+    'revenue': 19.7,
+    'spending': 31.7,
+    'debt_capacity': 50.0,
+    'growth': (0.065, 0.020),       # nominal GDP growth: mean, sd
+    'interest': (0.085, 0.010),     # effective nominal rate: mean, sd
+    'rho': 0.5,                     # AR(1) persistence of g and r shocks
+    'corr_rg': -0.3,                # correlation of g and r innovations
+    'risk_premium': 0.0005,         # +5 bp per pp of debt above capacity
+    'pb_target': 0.0,               # fiscal rule: primary balance target
+    'adjustment': 0.20,             # share of the pb gap closed per year
+    'reaction': 0.02,               # pb response per pp of debt above capacity
+    'pb_sd': 0.8                    # primary balance shock, pp GDP
+}
+
+
+def base_primary_balance(scenario):
+    """Primary balance implied by base-year revenue, spending and debt service"""
+    interest = scenario['interest'][0] * scenario['debt'] / (1 + scenario['growth'][0])
+    return scenario['revenue'] - scenario['spending'] + interest
+
+
+def simulate_debt_paths(scenario, horizon=10, n_paths=100_000, rng=None):
+    """
+    Simulate debt, primary balance and FSI paths
+
+    Args:
+        scenario: Dict shaped like COLOMBIA_2025
+        horizon: Years simulated after the base year
+        n_paths: Number of paths
+        rng: numpy Generator (default: fresh default_rng())
+
+    Returns:
+        Dict of (n_paths, horizon + 1) arrays: Debt, Growth, Interest,
+        Primary_Balance, Spending, FSI (column 0 = base year)
+    """
+    rng = rng or np.random.default_rng()
+    s = scenario
+    (mu_g, sd_g), (mu_r, sd_r) = s['growth'], s['interest']
+    rho, capacity, revenue = s['rho'], s['debt_capacity'], s['revenue']
+    innovation_scale = np.sqrt(1 - rho ** 2)
+    cov = np.array([[1.0, s['corr_rg']], [s['corr_rg'], 1.0]])
+    chol = np.linalg.cholesky(cov)
+
+    shape = (n_paths, horizon + 1)
+    debt = np.empty(shape)
+    growth = np.empty(shape)
+    interest = np.empty(shape)
+    pb = np.empty(shape)
+    spending = np.empty(shape)
+
+    debt[:, 0] = s['debt']
+    growth[:, 0] = mu_g
+    interest[:, 0] = mu_r
+    pb[:, 0] = base_primary_balance(s)
+    spending[:, 0] = s['spending']
+
+    # Stationary start for the AR(1) shocks
+    z = rng.standard_normal((n_paths, 2)) @ chol.T
+    e_g, e_r = z[:, 0], z[:, 1]
+    pb_trend = np.full(n_paths, pb[0, 0])
+
+    for t in range(1, horizon + 1):
+        z = rng.standard_normal((n_paths, 2)) @ chol.T
+        e_g = rho * e_g + innovation_scale * z[:, 0]
+        e_r = rho * e_r + innovation_scale * z[:, 1]
+        excess = np.maximum(debt[:, t - 1] - capacity, 0.0)
+
+        g = mu_g + sd_g * e_g
+        r = mu_r + sd_r * e_r + s['risk_premium'] * excess
+        pb_trend += s['adjustment'] * (s['pb_target'] - pb_trend)
+        balance = pb_trend + s['reaction'] * excess + s['pb_sd'] * rng.standard_normal(n_paths)
+
+        debt_service = r * debt[:, t - 1] / (1 + g)
+        debt[:, t] = np.maximum(debt[:, t - 1] * (1 + r) / (1 + g) - balance, MIN_DEBT)
+        growth[:, t] = g
+        interest[:, t] = r
+        pb[:, t] = balance
+        spending[:, t] = np.maximum(revenue - balance + debt_service, MIN_SPENDING)
+
+    fsi = fiscal_sustainability(revenue, spending, debt, capacity)
+    return {'Debt': debt, 'Growth': growth, 'Interest': interest,
+            'Primary_Balance': pb, 'Spending': spending, 'FSI': fsi}
+
+
+def support_envelope(scenario, horizon=10, k=NORMAL_SUPPORT_SD):
+    """
+    Per-year (low, high) bounds of Debt and FSI over all paths whose
+    growth, interest and primary-balance shocks stay within ±k sd
+
+    Debt rises with last year's debt and the interest rate and falls with
+    growth and the primary balance, so its bounds follow two extreme
+    paths. Spending bounds combine the extremes of the primary balance
+    and of debt service; FSI falls with debt and spending.
+
+    Returns:
+        Dict with 'Debt' and 'FSI' → (low, high) arrays of length horizon + 1
+    """
+    s = scenario
+    (mu_g, sd_g), (mu_r, sd_r) = s['growth'], s['interest']
+    capacity, revenue = s['debt_capacity'], s['revenue']
+    g_low, g_high = mu_g - k * sd_g, mu_g + k * sd_g
+    if g_low <= -1:
+        raise ValueError(f"growth support reaches -100% ({g_low:.3f}); lower the growth sd")
+
+    debt = np.empty((2, horizon + 1))
+    spending = np.empty((2, horizon + 1))
+    debt[:, 0] = s['debt']
+    spending[:, 0] = s['spending']
+    trend = base_primary_balance(s)
+    for t in range(1, horizon + 1):
+        low, high = debt[:, t - 1]
+        excess_low, excess_high = max(low - capacity, 0.0), max(high - capacity, 0.0)
+        r_low = mu_r - k * sd_r + s['risk_premium'] * excess_low
+        r_high = mu_r + k * sd_r + s['risk_premium'] * excess_high
+        trend += s['adjustment'] * (s['pb_target'] - trend)
+        balance_low = trend + s['reaction'] * excess_low - k * s['pb_sd']
+        balance_high = trend + s['reaction'] * excess_high + k * s['pb_sd']
+
+        debt[0, t] = max(low * (1 + r_low) / (1 + g_high) - balance_high, MIN_DEBT)
+        debt[1, t] = high * (1 + r_high) / (1 + g_low) - balance_low
+        service = [r * d / (1 + g) for r in (r_low, r_high) for d in (low, high) for g in (g_low, g_high)]
+        spending[0, t] = max(revenue - balance_high + min(service), MIN_SPENDING)
+        spending[1, t] = max(revenue - balance_low + max(service), MIN_SPENDING)
+
+    fsi_low = fiscal_sustainability(revenue, spending[1], debt[1], capacity)
+    fsi_high = fiscal_sustainability(revenue, spending[0], debt[0], capacity)
+    return {'Debt': (debt[0], debt[1]), 'FSI': (fsi_low, fsi_high)}
+
+
+def _summary(low, high):
+    """StreamingSummary over [low, high], log-binned for positive ranges"""
+    if high <= low:
+        high = low + max(abs(low), 1.0) * 1e-9
+    return StreamingSummary(low, high, log=low > 0)
+
+
+def fsi_to_cf(fsi, base, fsi_base, weight=FISCAL_GAP_WEIGHT):
+    """
+    CF implied by projected FSI through the Implementation Gap [Inferencia]
+
+    Args:
+        fsi: Projected FSI array
+        base: Dict with base-year PE, Gap, CD, SP, CLI
+        fsi_base: Base-year FSI
+
+    Returns:
+        (CF, Gap) arrays shaped like fsi
+    """
+    ratio = np.maximum(np.asarray(fsi, dtype=np.float64) / fsi_base, 0.0)
+    gap = np.clip(1 - (1 - base['Gap']) * ratio ** weight, 0.0, 1.0)
+    cf = constitutional_fitness(base['PE'], gap, base['CD'], base['SP'], base['CLI'])
+    return cf, gap
+
+
+def colombia_base_components():
+    """2025 PE, Gap, CD, SP, CLI and FSI from run_h1_colombia"""
+    from colombia_h1_analysis import run_h1_colombia
+    result = run_h1_colombia()
+    return {name: float(result.metric(name)[-1]) for name in ('PE', 'Gap', 'CD', 'SP', 'CLI', 'FSI')}
+
+
+def project(scenario, base, horizon=10, n_paths=100_000, chunk_size=DEFAULT_CHUNK_SIZE,
+            seed=None, qs=DEFAULT_QUANTILES):
+    """
+    Projected Debt, FSI and CF distributions per year
+
+    Args:
+        scenario: Debt-dynamics scenario (see COLOMBIA_2025)
+        base: Base-year CF components and FSI (see colombia_base_components)
+        horizon, n_paths, chunk_size: Simulation size and memory bound
+        seed: Seed for numpy's default_rng
+
+    Returns:
+        DataFrame with Year, Metric, Mean, Std, quantile columns and the
+        share of paths in fiscal crisis (FSI metric) or below the lowest CF
+        band edge (CF metric)
+    """
+    rng = np.random.default_rng(seed)
+    years = scenario['year'] + np.arange(horizon + 1)
+    metrics = ('Debt', 'FSI', 'CF')
+    bounds = support_envelope(scenario, horizon)
+    # CF rises with FSI
+    bounds['CF'] = tuple(fsi_to_cf(fsi, base, base['FSI'])[0] for fsi in bounds['FSI'])
+    summaries = {name: [_summary(low, high) for low, high in zip(*bounds[name])] for name in metrics}
+    below = {name: np.zeros(horizon + 1, dtype=np.int64) for name in ('FSI', 'CF')}
+
+    remaining = n_paths
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        paths = simulate_debt_paths(scenario, horizon, n, rng)
+        paths['CF'], _ = fsi_to_cf(paths['FSI'], base, base['FSI'])
+        for name in metrics:
+            for t, summary in enumerate(summaries[name]):
+                summary.update(paths[name][:, t])
+        below['FSI'] += (paths['FSI'] < FSI_CRISIS_THRESHOLD).sum(axis=0)
+        below['CF'] += (paths['CF'] < CF_BAND_EDGES[0]).sum(axis=0)
+        remaining -= n
+
+    rows = []
+    for name in metrics:
+        for t, year in enumerate(years):
+            summary = summaries[name][t]
+            row = {'Year': int(year), 'Metric': name, 'Mean': summary.mean, 'Std': summary.std}
+            for q, value in zip(qs, summary.quantiles(qs)):
+                row[f'q{q*100:g}'] = value
+            row['P_Below'] = below[name][t] / n_paths if name in below else np.nan
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def scenario_from_panel(scored, country, **assumptions):
+    """
+    Scenario from the latest row of a scored fiscal panel (fsi_engine)
+
+    Stochastic assumptions default to COLOMBIA_2025 and can be overridden.
+    """
+    row = scored[scored['Country'].astype(str) == country].iloc[-1]
+    scenario = {**COLOMBIA_2025, **assumptions}
+    scenario.update({
+        'year': int(np.floor(row['Year'])),
+        'debt': float(row['Debt_GDP_%']),
+        'revenue': float(row['Revenue_GDP_%']),
+        'spending': float(row['Spending_GDP_%']),
+        'debt_capacity': float(row['Debt_Capacity_%'])
+    })
+    return scenario
+
+
+if __name__ == "__main__":
+    import time
+
+    print("="*70)
+    print("STOCHASTIC DEBT DYNAMICS: COLOMBIA FSI AND CF PROJECTIONS")
+    print("="*70)
+
+    base = colombia_base_components()
+    print(f"\n2025 base: Debt {COLOMBIA_2025['debt']:.0f}% GDP, FSI {base['FSI']:.3f}, "
+          f"CF {constitutional_fitness(base['PE'], base['Gap'], base['CD'], base['SP'], base['CLI']):.3f}, "
+          f"primary balance {base_primary_balance(COLOMBIA_2025):+.1f}% GDP")
+
+    scenarios = {
+        'Fiscal rule (pb → 0)': COLOMBIA_2025,
+        'No consolidation': {**COLOMBIA_2025, 'adjustment': 0.0, 'reaction': 0.0}
+    }
+    for label, scenario in scenarios.items():
+        start = time.perf_counter()
+        projection = project(scenario, base, horizon=10, n_paths=200_000, seed=2025)
+        elapsed = time.perf_counter() - start
+        shown = projection[projection['Year'].isin([2025, 2030, 2035])]
+        print(f"\n{label} — 200,000 paths × 10 years in {elapsed:.2f} s:")
+        print(shown[['Year', 'Metric', 'Mean', 'q5', 'q50', 'q95', 'P_Below']]
+              .to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+    print(f"\nP_Below: share of paths with FSI < {FSI_CRISIS_THRESHOLD:.2f} (FSI) "
+          f"or CF < {CF_BAND_EDGES[0]:.2f} (CF)")
+    print(f"{PROJECTION} - Debt paths from stochastic r−g dynamics")
+    print(f"{INFERENCE} - FSI → CF through the fiscal share of the Implementation Gap")
+    print("="*70)
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+EPT: Single command-line entry point for scoring, simulation, figures and export
+One process per scheduler job, paying only for the imports its subcommand uses
+
+Subcommands:
+    score <metric> [arg=value ...]      one score_cache.SCORERS metric (cf, fsi,
+                                        success, ...); omitted arguments take
+                                        SCORERS defaults
+    score <metric> --csv PATH [--out]   score every row of a CSV whose columns
+                                        are named after the metric's arguments
+    simulate montecarlo|debt|fossilization|markov
+                                        monte_carlo_cf.propagate (Chile 2022),
+                                        debt_dynamics.project (Colombia 2025),
+                                        fossilization_sim.summarize,
+                                        fossilization_markov.ReformChain
+    figures [names] [--force]           build_figures.build
+    export cases|store                  CaseResult frames of the three cases,
+                                        or the DATA/panel_store rebuild
+
+Only the standard library is imported at startup. Each subcommand imports
+its modules when it runs: `score` needs numpy alone (~0.2 s), `figures`
+defers matplotlib to its worker processes, and pandas, scipy and matplotlib
+are loaded only by the subcommands that use them. The analysis modules
+import pandas and matplotlib.pyplot inside the functions that need them
+for the same reason.
+
+Usage:
+    python ept.py score cf pe=0.62 gap=0.12 cd=0.35 sp=0.47 cli=0.45
+    python ept.py score cf_chile popular_support=0.58
+    python ept.py score fsi --csv fiscal.csv --out scored.csv
+    python ept.py simulate montecarlo --size 1000000 --seed 0 --set popular_support=0.58
+    python ept.py simulate fossilization --size 200000 --calibrated
+    python ept.py figures figure2 --force
+    python ept.py export cases --format json --out cases.json
+    python ept.py --trace /tmp/ept_export export cases --out cases.csv
+
+Author: Ignacio Adrián Lerer
+Date: November 2025
+License: CC-BY 4.0
+"""
+
+import argparse
+import sys
+import time
+
+SIMULATIONS = ('montecarlo', 'debt', 'fossilization', 'markov')
+DEFAULT_SIZES = {'montecarlo': 1_000_000, 'debt': 100_000, 'fossilization': 100_000, 'markov': 10_001}
+
+
+class CommandError(Exception):
+    """Invalid subcommand input, reported as a usage error"""
+
+
+def parse_assignments(items):
+    """['name=value', ...] → {name: float}"""
+    values = {}
+    for item in items:
+        name, sep, value = item.partition('=')
+        if not sep or not name:
+            raise CommandError(f"expected name=value, got {item!r}")
+        try:
+            values[name] = float(value)
+        except ValueError:
+            raise CommandError(f"{name}: {value!r} is not a number") from None
+    return values
+
+
+def scorer(metric):
+    """(vectorized function, ordered argument defaults; None = required)"""
+    from score_cache import SCORERS
+    if metric not in SCORERS:
+        raise CommandError(f"unknown metric {metric!r}; choose from {', '.join(SCORERS)}")
+    return SCORERS[metric]
+
+
+def bind(metric, defaults, inputs):
+    """Fill defaults into inputs and check for unknown or missing arguments"""
+    unknown = sorted(set(inputs) - set(defaults))
+    if unknown:
+        raise CommandError(f"unknown argument(s) for {metric}: {unknown}; expected {list(defaults)}")
+    bound = {arg: inputs.get(arg, default) for arg, default in defaults.items()}
+    missing = [arg for arg, value in bound.items() if value is None]
+    if missing:
+        raise CommandError(f"missing argument(s) for {metric}: {missing}")
+    return bound
+
+
+def write_frame(df, out=None, fmt='csv', index=False):
+    """Write a DataFrame as CSV or JSON records to a file or stdout"""
+    if out and fmt == 'csv':
+        from ept_trace import save_frame
+        save_frame(df, out, index=index)
+        return
+    if fmt == 'json':
+        text = df.reset_index().to_json(orient='records') if index else df.to_json(orient='records')
+        text += '\n'
+    else:
+        text = df.to_csv(index=index)
+    if out:
+        with open(out, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+
+
+def cmd_score(args):
+    func, defaults = scorer(args.metric)
+    inputs = parse_assignments(args.inputs)
+
+    if args.csv is None:
+        value = float(func(**bind(args.metric, defaults, inputs)))
+        print(f"{value:.10g}")
+        return
+
+    import numpy as np
+    import pandas as pd
+
+    df = pd.read_csv(args.csv)
+    columns = [arg for arg in defaults if arg in df.columns and arg not in inputs]
+    bound = bind(args.metric, defaults, {**inputs, **{arg: 0.0 for arg in columns}})
+    arrays = {arg: df[arg].to_numpy(dtype=np.float64) if arg in columns else value
+              for arg, value in bound.items()}
+    df[args.metric] = np.broadcast_to(func(**arrays), (len(df),))
+    write_frame(df, args.out, args.format)
+
+
+def calibrated(args, overrides):
+    """Reform-cycle parameter overrides, starting from the calibrated fail_increment if requested"""
+    if not args.calibrated:
+        return overrides
+    from fossilization_sim import calibrated_fail_increment
+    return {'fail_increment': calibrated_fail_increment(), **overrides}
+
+
+def cmd_simulate(args):
+    overrides = parse_assignments(args.set)
+    size = args.size or DEFAULT_SIZES[args.model]
+    start = time.perf_counter()
+
+    if args.model == 'montecarlo':
+        from monte_carlo_cf import CHILE_2022_INPUTS, chile_2022_model, propagate
+        unknown = sorted(set(overrides) - set(CHILE_2022_INPUTS))
+        if unknown:
+            raise CommandError(f"unknown Chile 2022 input(s): {unknown}")
+        inputs = {**CHILE_2022_INPUTS, **{name: ('fixed', value) for name, value in overrides.items()}}
+        result = propagate(inputs, chile_2022_model, n_draws=size, seed=args.seed)
+        index = True
+        shown = result
+
+    elif args.model == 'debt':
+        from debt_dynamics import COLOMBIA_2025, colombia_base_components, project
+        unknown = sorted(set(overrides) - set(COLOMBIA_2025))
+        if unknown:
+            raise CommandError(f"unknown scenario key(s): {unknown}")
+        scenario = {**COLOMBIA_2025, **overrides}
+        result = project(scenario, colombia_base_components(), horizon=args.horizon,
+                         n_paths=size, seed=args.seed)
+        index = False
+        shown = result[result['Year'] == result['Year'].max()]
+
+    elif args.model == 'fossilization':
+        import pandas as pd
+        from fossilization_sim import DEFAULT_PARAMS, summarize
+        unknown = sorted(set(overrides) - set(DEFAULT_PARAMS))
+        if unknown:
+            raise CommandError(f"unknown parameter(s): {unknown}")
+        result = pd.DataFrame([summarize(size, calibrated(args, overrides), seed=args.seed)])
+        index = False
+        shown = result.T.rename(columns={0: 'Value'})
+
+    else:
+        from fossilization_markov import ReformChain
+        from fossilization_sim import DEFAULT_PARAMS
+        unknown = sorted(set(overrides) - set(DEFAULT_PARAMS))
+        if unknown:
+            raise CommandError(f"unknown parameter(s): {unknown}")
+        chain = ReformChain(calibrated(args, overrides), n_states=size)
+        result = chain.absorption(reformed=args.reformed)
+        index = False
+        shown = result.iloc[[chain.state_of(chain.params['start_cli'])]]
+
+    if args.out:
+        write_frame(result, args.out, args.format, index=index)
+    print(shown.to_string(float_format=lambda v: f"{v:.4f}"))
+    print(f"{args.model}: size {size:,} in {time.perf_counter() - start:.2f} s", file=sys.stderr)
+
+
+def cmd_figures(args):
+    from build_figures import FIGURES, build
+    unknown = [name for name in args.figures if name not in FIGURES]
+    if unknown:
+        raise CommandError(f"unknown figure(s): {', '.join(unknown)}; choose from {', '.join(FIGURES)}")
+    status = build(args.figures or None, force=args.force, workers=args.workers, verbose=args.verbose)
+    for name, result in status.items():
+        print(f"{name}: {result}")
+    if any(result.startswith('failed') for result in status.values()):
+        sys.exit(1)
+
+
+def cmd_export(args):
+    if args.what == 'store':
+        from panel_store import STORE_DIR, build_store_from_csv, open_store
+        path = build_store_from_csv(path=args.out or STORE_DIR)
+        store = open_store(path)
+        print(f"{path}: {len(store):,} rows, {len(store.countries)} countries, {len(store.metrics)} metrics")
+        return
+
+    import pandas as pd
+    from argentina_paradox_analysis import run_argentina_paradox
+    from chile_h2_analysis import run_h2_chile
+    from colombia_h1_analysis import run_h1_colombia
+
+    cases = [run() for run in (run_h1_colombia, run_h2_chile, run_argentina_paradox)]
+    write_frame(pd.concat([case.to_frame() for case in cases], ignore_index=True), args.out, args.format)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='ept', description='EPT scoring, simulation, figures and export')
+    parser.add_argument('--trace', metavar='PREFIX',
+                        help='Trace the run to PREFIX.trace.json (Chrome/Perfetto) and PREFIX.csv')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    score = commands.add_parser('score', help='Score one metric for given inputs or a CSV of inputs')
+    score.add_argument('metric', help='score_cache.SCORERS name (cf, sp, cli_chile, success, ...)')
+    score.add_argument('inputs', nargs='*', metavar='arg=value', help='Metric arguments (others default)')
+    score.add_argument('--csv', help='Score every row; columns named after metric arguments')
+    score.add_argument('--out', help='Output file for --csv (default: stdout)')
+    score.add_argument('--format', choices=('csv', 'json'), default='csv')
+    score.set_defaults(handler=cmd_score)
+
+    simulate = commands.add_parser('simulate', help='Run a Monte Carlo, debt or reform-cycle model')
+    simulate.add_argument('model', choices=SIMULATIONS)
+    simulate.add_argument('--size', type=int, default=None,
+                          help='Draws, paths, countries or Markov states '
+                               f"(defaults: {', '.join(f'{k} {v:,}' for k, v in DEFAULT_SIZES.items())})")
+    simulate.add_argument('--seed', type=int, default=None)
+    simulate.add_argument('--set', action='append', default=[], metavar='name=value',
+                          help='Pin a Chile 2022 input (montecarlo) or override a scenario/parameter')
+    simulate.add_argument('--horizon', type=int, default=10, help='Years projected (debt)')
+    simulate.add_argument('--reformed', type=float, default=0.20, help='Reform absorbing CLI (markov)')
+    simulate.add_argument('--calibrated', action='store_true',
+                          help='Use the calibrated fail_increment (fossilization, markov)')
+    simulate.add_argument('--out', help='Write the full result table')
+    simulate.add_argument('--format', choices=('csv', 'json'), default='csv')
+    simulate.set_defaults(handler=cmd_simulate)
+
+    figures = commands.add_parser('figures', help='Build stale paper figures')
+    figures.add_argument('figures', nargs='*', help='Figure names (default: all)')
+    figures.add_argument('--force', action='store_true', help='Rebuild even if inputs are unchanged')
+    figures.add_argument('--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    figures.add_argument('--verbose', action='store_true', help='Show figure script output')
+    figures.set_defaults(handler=cmd_figures)
+
+    export = commands.add_parser('export', help='Export case results or rebuild the panel store')
+    export.add_argument('what', choices=('cases', 'store'))
+    export.add_argument('--out', help='Output file (cases; default stdout) or store directory')
+    export.add_argument('--format', choices=('csv', 'json'), default='csv')
+    export.set_defaults(handler=cmd_export)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        if args.trace:
+            from ept_trace import span, tracing
+            with tracing(args.trace), span(f'ept {args.command}', 'run'):
+                args.handler(args)
+        else:
+            args.handler(args)
+    except CommandError as exc:
+        parser.exit(2, f"ept {args.command}: error: {exc}\n")
+
+
+if __name__ == "__main__":
+    main()
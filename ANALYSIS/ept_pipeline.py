@@ -0,0 +1,304 @@
+"""
+EPT PIPELINE: Incremental, content-hashed computation DAG
+Models the calculate_* stages (SP, CLI, Gap, CD, PE, FSI, CF) as DAG nodes
+and re-runs only what changed
+
+Each node's cache key is a SHA-256 over:
+    - the source code of its function
+    - the source of the function's module and of every ANALYSIS module it
+      imports, directly or transitively (editing a helper or a cf_engine
+      constant invalidates every node that can reach it)
+    - its parameter overrides
+    - the content hashes of its upstream OUTPUTS
+Outputs are pickled to CACHE_DIR. Because keys use upstream output hashes,
+a node that re-runs but produces identical output does not invalidate its
+downstream nodes (early cutoff).
+
+Code outside ANALYSIS (numpy, pandas) is not hashed; after upgrading it,
+run(force=True).
+
+Author: Adrian Lerer
+Date: November 2025
+"""
+
+import ast
+import contextlib
+import hashlib
+import inspect
+import logging
+import pickle
+import sys
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / '.ept_cache'
+
+
+def content_hash(obj):
+    """SHA-256 of an object's pickle (deterministic for arrays, frames, dicts)"""
+    return hashlib.sha256(pickle.dumps(obj, protocol=4)).hexdigest()
+
+
+def source_hash(func):
+    """SHA-256 of a function's source code (falls back to its qualified name)"""
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', repr(func))}"
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+def _local_path(module_name):
+    """Source file of an importable module if it is a plain .py file, else None"""
+    module = sys.modules.get(module_name)
+    path = getattr(module, '__file__', None)
+    if path is None:
+        return None
+    path = Path(path)
+    return path if path.suffix == '.py' else None
+
+
+def module_dependencies(module_name):
+    """
+    Source files of a module and of the modules it imports from its own
+    directory, transitively (sorted)
+    """
+    root = _local_path(module_name)
+    if root is None:
+        return []
+    directory = root.parent
+    seen = {root}
+    stack = [root]
+    while stack:
+        tree = ast.parse(stack.pop().read_text(encoding='utf-8'))
+        for stmt in ast.walk(tree):
+            if isinstance(stmt, ast.Import):
+                names = [alias.name for alias in stmt.names]
+            elif isinstance(stmt, ast.ImportFrom) and stmt.module and not stmt.level:
+                names = [stmt.module]
+            else:
+                continue
+            for name in names:
+                path = directory / f"{name.split('.')[0]}.py"
+                if path.exists() and path not in seen:
+                    seen.add(path)
+                    stack.append(path)
+    return sorted(seen)
+
+
+def code_hash(func):
+    """SHA-256 of a function's source and of its module's local dependencies"""
+    digest = hashlib.sha256(source_hash(func).encode('utf-8'))
+    for path in module_dependencies(getattr(func, '__module__', '')):
+        digest.update(path.name.encode('utf-8'))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+@contextlib.contextmanager
+def _quiet(modules):
+    """Raise the loggers of modules to WARNING for the duration of a block"""
+    loggers = [logging.getLogger(name) for name in modules]
+    levels = [logger.level for logger in loggers]
+    for logger in loggers:
+        logger.setLevel(logging.WARNING)
+    try:
+        yield
+    finally:
+        for logger, level in zip(loggers, levels):
+            logger.setLevel(level)
+
+
+class Pipeline:
+    """
+    DAG of analysis stages with content-hashed caching
+
+    Nodes must be added after the nodes they depend on. Each input is bound
+    as (upstream_node, index): index selects one element of a tuple output
+    (e.g. the values half of `gap_df, gap_values`), None passes it whole.
+    """
+
+    def __init__(self, name, cache_dir=CACHE_DIR):
+        self.name = name
+        self.cache_dir = Path(cache_dir) / name
+        self.nodes = {}
+        self.last_run = {}
+        self._memory = {}
+
+    def add(self, name, func, inputs=None, params=None, version=''):
+        """
+        Register a stage
+
+        Args:
+            name: Node name
+            func: Stage function
+            inputs: Dict of argument name → (upstream node, index or None)
+            params: Default keyword arguments (part of the cache key)
+            version: Free-form string to force invalidation of this node
+        """
+        inputs = dict(inputs or {})
+        for arg, (upstream, _) in inputs.items():
+            if upstream not in self.nodes:
+                raise KeyError(f"Node {name!r} depends on unknown node {upstream!r} (arg {arg!r})")
+        self.nodes[name] = {
+            'func': func,
+            'inputs': inputs,
+            'params': dict(params or {}),
+            'code': code_hash(func) + version
+        }
+        return self
+
+    def _ancestors(self, targets):
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name in needed:
+                continue
+            needed.add(name)
+            stack.extend(upstream for upstream, _ in self.nodes[name]['inputs'].values())
+        return [name for name in self.nodes if name in needed]
+
+    def _load(self, name, key):
+        if (name, key) in self._memory:
+            return True, self._memory[(name, key)]
+        path = self.cache_dir / f'{name}-{key}.pkl'
+        if path.exists():
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+            self._memory[(name, key)] = entry
+            return True, entry
+        return False, None
+
+    def _store(self, name, key, entry):
+        self._memory[(name, key)] = entry
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_dir / f'{name}-{key}.pkl.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(entry, f, protocol=4)
+        tmp.replace(self.cache_dir / f'{name}-{key}.pkl')
+
+    def run(self, targets=None, params=None, force=False, quiet=True):
+        """
+        Execute the DAG, reusing cached outputs where keys match
+
+        Args:
+            targets: Nodes to compute (default: all); ancestors run as needed
+            params: Dict of node → keyword overrides for this run
+            force: Ignore the cache and recompute every needed node
+            quiet: Silence INFO logging from the stage modules' loggers
+
+        Returns:
+            Dict of node name → output. self.last_run maps node → 'cached'
+            or 'computed'.
+        """
+        targets = list(targets or self.nodes)
+        params = params or {}
+        outputs = {}
+        output_hashes = {}
+        self.last_run = {}
+        needed = self._ancestors(targets)
+        modules = {getattr(self.nodes[name]['func'], '__module__', None) for name in needed} - {None}
+
+        with _quiet(modules) if quiet else contextlib.nullcontext():
+            for name in needed:
+                node = self.nodes[name]
+                kwargs = {**node['params'], **params.get(name, {})}
+                key = hashlib.sha256('|'.join([
+                    node['code'],
+                    content_hash(sorted(kwargs.items())),
+                    *(f"{arg}={output_hashes[upstream]}[{index}]"
+                      for arg, (upstream, index) in sorted(node['inputs'].items()))
+                ]).encode('utf-8')).hexdigest()[:32]
+
+                hit, entry = (False, None) if force else self._load(name, key)
+                if not hit:
+                    args = {}
+                    for arg, (upstream, index) in node['inputs'].items():
+                        value = outputs[upstream]
+                        args[arg] = value if index is None else value[index]
+                    result = node['func'](**args, **kwargs)
+                    entry = {'output': result, 'hash': content_hash(result)}
+                    self._store(name, key, entry)
+
+                outputs[name] = entry['output']
+                output_hashes[name] = entry['hash']
+                self.last_run[name] = 'cached' if hit else 'computed'
+
+        return {name: outputs[name] for name in targets}
+
+    def clear_cache(self):
+        """Delete all cached outputs of this pipeline"""
+        self._memory.clear()
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob('*.pkl'):
+                path.unlink()
+
+
+def colombia_pipeline(cache_dir=CACHE_DIR):
+    """H1 Colombia stages from colombia_h1_analysis as a DAG"""
+    import colombia_h1_analysis as col
+
+    return (
+        Pipeline('colombia', cache_dir)
+        .add('cli', col.calculate_cli_colombia_trajectory)
+        .add('gap', col.calculate_implementation_gap_colombia)
+        .add('pe', col.calculate_phenotypic_expression_colombia)
+        .add('sp', col.calculate_selection_pressure_colombia)
+        .add('fsi', col.calculate_fsi_colombia)
+        .add('cf', col.calculate_constitutional_fitness_colombia, inputs={
+            'cli_df': ('cli', None),
+            'gap_values': ('gap', 1),
+            'pe_values': ('pe', 1),
+            'sp_values': ('sp', 0),
+            'fsi_values': ('fsi', 0)
+        })
+    )
+
+
+def chile_pipeline(cache_dir=CACHE_DIR):
+    """H2 Chile stages from chile_h2_analysis as a DAG"""
+    import chile_h2_analysis as chl
+
+    return (
+        Pipeline('chile', cache_dir)
+        .add('sp', chl.calculate_selection_pressure_chile_2022)
+        .add('cli', chl.calculate_cli_chile_trajectory)
+        .add('gap', chl.calculate_fiscal_gap_projected)
+        .add('cd', chl.calculate_cultural_distance_chile)
+        .add('pe', chl.calculate_phenotypic_expression_projected)
+        .add('cf', chl.calculate_constitutional_fitness_chile, inputs={
+            'sp_data': ('sp', None),
+            'cli_data': ('cli', None),
+            'gap_data': ('gap', None),
+            'cd_data': ('cd', None),
+            'pe_data': ('pe', None)
+        })
+    )
+
+
+if __name__ == "__main__":
+    import sys
+
+    force = '--force' in sys.argv
+
+    print("="*70)
+    print("EPT PIPELINE: INCREMENTAL H1/H2 RECOMPUTATION")
+    print("="*70)
+
+    for pipeline in (colombia_pipeline(), chile_pipeline()):
+        results = pipeline.run(force=force)
+        computed = [n for n, status in pipeline.last_run.items() if status == 'computed']
+        cached = [n for n, status in pipeline.last_run.items() if status == 'cached']
+        print(f"\n{pipeline.name.upper()}")
+        print(f"  Computed: {', '.join(computed) or '-'}")
+        print(f"  Cached:   {', '.join(cached) or '-'}")
+
+        cf = results['cf']
+        if isinstance(cf, dict):
+            print(f"  CF = {cf['cf']:.6f}")
+        else:
+            print(f"  CF = {cf['CF'].iloc[0]:.3f} ({cf['Year'].iloc[0]}) → "
+                  f"{cf['CF'].iloc[-1]:.3f} ({cf['Year'].iloc[-1]})")
+
+    print(f"\nCache: {CACHE_DIR}")
+    print("="*70)
@@ -0,0 +1,90 @@
+"""
+EPT RESULTS: Typed result objects for library (print-free) use
+Returned by run_h1_colombia, run_h2_chile and run_argentina_paradox
+
+Metric arrays are aligned with `years`. Scalar cases (Chile 2022) are
+stored as length-1 arrays so every case has the same shape.
+
+Author: Adrian Lerer
+Date: November 2025
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from cf_engine import CF_BAND_LABELS, classify_cf
+
+ESTIMATION = "[Estimación]"
+
+METRICS = ('SP', 'CLI', 'Gap', 'CD', 'PE', 'CF')
+
+
+def as_series(value, n):
+    """Broadcast a scalar or sequence to a float array of length n"""
+    return np.broadcast_to(np.asarray(value, dtype=np.float64), (n,)).copy()
+
+
+class TableText:
+    """
+    Log argument that renders a DataFrame with to_string(index=False) only
+    when the record is actually emitted: logger.info("%s", TableText(df))
+    """
+    __slots__ = ('frame',)
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def __str__(self):
+        return self.frame.to_string(index=False)
+
+
+@dataclass(frozen=True)
+class CaseResult:
+    """
+    EPT metrics for one constitutional case
+
+    Attributes:
+        country: Case country
+        years: Observation years, shape (n,)
+        sp, cli, gap, cd, pe, cf: Metric arrays, shape (n,)
+        fsi: Fiscal Sustainability Index, shape (n,), if computed
+        components: Metric name → {component name → array or scalar}
+        provenance: Reality Filter tag of the CF values
+        verdict: Hypothesis verdict label
+        details: Additional case-specific outputs (tables, regressions)
+    """
+    country: str
+    years: np.ndarray
+    sp: np.ndarray
+    cli: np.ndarray
+    gap: np.ndarray
+    cd: np.ndarray
+    pe: np.ndarray
+    cf: np.ndarray
+    fsi: Optional[np.ndarray] = None
+    components: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    provenance: str = ESTIMATION
+    verdict: str = ''
+    details: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def bands(self):
+        """CF interpretation band label per year"""
+        return [CF_BAND_LABELS[code] for code in classify_cf(self.cf)]
+
+    def metric(self, name):
+        """Metric array by name (SP, CLI, Gap, CD, PE, CF, FSI)"""
+        return getattr(self, name.lower())
+
+    def to_frame(self):
+        """Long-format-ready DataFrame: Country, Year, metrics, Band"""
+        data = {'Country': self.country, 'Year': self.years}
+        for name in METRICS:
+            data[name] = self.metric(name)
+        if self.fsi is not None:
+            data['FSI'] = self.fsi
+        data['Band'] = self.bands
+        return pd.DataFrame(data)
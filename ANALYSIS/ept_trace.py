@@ -0,0 +1,307 @@
+"""
+EPT TRACE: Built-in stage timing and counters for analysis runs
+Spans around every calculate_*, load and save step plus rows-processed
+and bytes-written counters, exportable to Chrome trace / Perfetto JSON and
+to a flat CSV summary
+
+Instrumentation:
+    @traced                  span named after the function (module.qualname);
+                             category 'calculate' for calculate_* functions,
+                             'load' for load_*, 'stage' otherwise. The rows
+                             of DataFrame / array outputs are recorded on the
+                             span and added to the 'rows' counter.
+    span(name, cat, **args)  context manager for any other block
+    count(name, value)       add to a named counter
+    save_frame(df, path)     DataFrame.to_csv inside a 'save' span that adds
+                             rows and file size to 'rows_written' and
+                             'bytes_written'
+
+Tracing is off by default and every hook returns after one attribute check,
+so instrumented functions cost ~0.1 µs extra when nobody is tracing. It is
+switched on by tracing(), by TRACER.start(), or for a whole process by the
+environment variable EPT_TRACE=<prefix>, which writes <prefix>.trace.json
+and <prefix>.csv at exit.
+
+Per-span statistics (calls, total, self and max time, rows, bytes) are
+aggregated as spans close, so the CSV summary covers the entire run. Raw
+events for the Chrome trace are kept up to max_events; later events are
+counted as dropped rather than stored, bounding memory in multi-hour runs.
+
+Open the trace at chrome://tracing or https://ui.perfetto.dev.
+
+Author: Adrian Lerer
+Date: November 2025
+"""
+
+import atexit
+import contextlib
+import csv
+import functools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_MAX_EVENTS = 1_000_000
+
+SUMMARY_FIELDS = ('Category', 'Name', 'Calls', 'Total_ms', 'Self_ms', 'Mean_ms', 'Max_ms',
+                  'Rows', 'Bytes')
+
+
+def _rows(result):
+    """
+    Rows of a DataFrame / array result; for a tuple, list or dict, of its
+    longest DataFrame or array (calculate_* return e.g. `values, df`)
+    """
+    if isinstance(result, dict):
+        result = list(result.values())
+    if isinstance(result, (tuple, list)):
+        return max((_rows(item) for item in result if hasattr(item, 'shape')), default=0)
+    shape = getattr(result, 'shape', None)
+    return int(shape[0]) if shape else 0
+
+
+class Tracer:
+    """
+    Collects spans and counters for one process
+
+    Args:
+        max_events: Raw events kept for the Chrome trace
+    """
+
+    def __init__(self, max_events=DEFAULT_MAX_EVENTS):
+        self.max_events = max_events
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        """Drop all events, statistics and counters"""
+        with self._lock:
+            self.events = []
+            self.dropped = 0
+            self.stats = {}
+            self.counters = {}
+            self._origin = time.perf_counter_ns()
+
+    def start(self):
+        self.enabled = True
+        return self
+
+    def stop(self):
+        self.enabled = False
+        return self
+
+    def _now_us(self):
+        return (time.perf_counter_ns() - self._origin) / 1e3
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, event):
+        if len(self.events) < self.max_events:
+            self.events.append(event)
+        else:
+            self.dropped += 1
+
+    @contextlib.contextmanager
+    def span(self, name, cat='stage', **args):
+        """
+        Time a block; yields the span's args dict so the block can add
+        fields (e.g. rows) that are recorded when it closes
+        """
+        if not self.enabled:
+            yield args
+            return
+        stack = self._stack()
+        frame = [0.0]                       # time spent in child spans, µs
+        stack.append(frame)
+        start = self._now_us()
+        try:
+            yield args
+        finally:
+            duration = self._now_us() - start
+            stack.pop()
+            if stack:
+                stack[-1][0] += duration
+            self._close(name, cat, start, duration, duration - frame[0], args)
+
+    def _close(self, name, cat, start, duration, self_time, args):
+        with self._lock:
+            self._record({'name': name, 'cat': cat, 'ph': 'X', 'ts': start, 'dur': duration,
+                          'pid': os.getpid(), 'tid': threading.get_ident(), 'args': args})
+            stat = self.stats.get((cat, name))
+            if stat is None:
+                stat = self.stats[(cat, name)] = {'calls': 0, 'total': 0.0, 'self': 0.0, 'max': 0.0,
+                                                  'rows': 0, 'bytes': 0}
+            stat['calls'] += 1
+            stat['total'] += duration
+            stat['self'] += self_time
+            stat['max'] = max(stat['max'], duration)
+            stat['rows'] += args.get('rows', 0)
+            stat['bytes'] += args.get('bytes', 0)
+
+    def count(self, name, value=1):
+        """Add value to a counter (a Chrome trace counter track)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            total = self.counters[name] = self.counters.get(name, 0) + value
+            self._record({'name': name, 'ph': 'C', 'ts': self._now_us(), 'pid': os.getpid(),
+                          'args': {name: total}})
+
+    def traced(self, func=None, *, name=None, cat=None, rows=True):
+        """
+        Decorator: run func inside a span
+
+        Args:
+            name: Span name (default: module.qualname)
+            cat: Category (default: from the function name, see module docstring)
+            rows: Record the rows of the result and add them to 'rows'
+        """
+        if func is None:
+            return functools.partial(self.traced, name=name, cat=cat, rows=rows)
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+        if cat is None:
+            cat = ('calculate' if func.__name__.startswith('calculate_')
+                   else 'load' if func.__name__.startswith('load_') else 'stage')
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return func(*args, **kwargs)
+            with self.span(span_name, cat) as span_args:
+                result = func(*args, **kwargs)
+                if rows:
+                    n = _rows(result)
+                    span_args['rows'] = n
+                    self.count('rows', n)
+            return result
+        return wrapper
+
+    def summary(self):
+        """Per-span statistics as a list of dicts (SUMMARY_FIELDS), slowest first"""
+        with self._lock:
+            items = sorted(self.stats.items(), key=lambda item: -item[1]['total'])
+        return [{
+            'Category': cat,
+            'Name': name,
+            'Calls': stat['calls'],
+            'Total_ms': round(stat['total'] / 1e3, 3),
+            'Self_ms': round(stat['self'] / 1e3, 3),
+            'Mean_ms': round(stat['total'] / stat['calls'] / 1e3, 3),
+            'Max_ms': round(stat['max'] / 1e3, 3),
+            'Rows': stat['rows'],
+            'Bytes': stat['bytes']
+        } for (cat, name), stat in items]
+
+    def export_chrome(self, path):
+        """Write a Chrome trace / Perfetto JSON file; returns the path"""
+        with self._lock:
+            events = list(self.events)
+            metadata = {'dropped_events': self.dropped, 'counters': dict(self.counters)}
+        events.append({'name': 'process_name', 'ph': 'M', 'pid': os.getpid(),
+                       'args': {'name': 'EPT analysis'}})
+        path = Path(path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms', 'metadata': metadata}, f)
+        return path
+
+    def export_csv(self, path):
+        """Write the per-span summary, then one row per counter; returns the path"""
+        path = Path(path)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.summary())
+            for name, total in sorted(self.counters.items()):
+                field = 'Bytes' if name.startswith('bytes') else 'Rows'
+                writer.writerow({'Category': 'counter', 'Name': name, field: total})
+        return path
+
+    def export(self, prefix):
+        """<prefix>.trace.json and <prefix>.csv; returns both paths"""
+        prefix = str(prefix)
+        return self.export_chrome(f'{prefix}.trace.json'), self.export_csv(f'{prefix}.csv')
+
+
+# Process-wide tracer used by the instrumented analysis modules
+TRACER = Tracer()
+traced = TRACER.traced
+span = TRACER.span
+count = TRACER.count
+
+
+@contextlib.contextmanager
+def tracing(prefix=None, tracer=TRACER):
+    """
+    Enable tracing for a block (fresh events), exporting to prefix on exit
+    if given; yields the tracer
+    """
+    tracer.reset()
+    tracer.start()
+    try:
+        yield tracer
+    finally:
+        tracer.stop()
+        if prefix is not None:
+            tracer.export(prefix)
+
+
+def save_frame(df, path, index=False, **to_csv_kwargs):
+    """DataFrame.to_csv in a 'save' span counting rows and bytes written"""
+    path = Path(path)
+    with span(f'save {path.name}', 'save') as args:
+        df.to_csv(path, index=index, **to_csv_kwargs)
+        if TRACER.enabled:
+            args['rows'] = len(df)
+            args['bytes'] = path.stat().st_size
+            count('rows_written', len(df))
+            count('bytes_written', args['bytes'])
+    return path
+
+
+if os.environ.get('EPT_TRACE'):
+    TRACER.start()
+    atexit.register(TRACER.export, os.environ['EPT_TRACE'])
+
+
+if __name__ == "__main__":
+    import io
+    import logging
+    import sys
+    import tempfile
+
+    import argentina_paradox_analysis
+    import chile_h2_analysis
+    import colombia_h1_analysis
+    # The analyses are instrumented through the importable module, not __main__
+    from ept_trace import span, tracing
+
+    print("="*70)
+    print("EPT TRACE: FULL H1 + H2 + ARGENTINA RUN")
+    print("="*70)
+
+    # Run with the analyses' console logging on (as their scripts do), captured
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=io.StringIO())
+    with tracing() as tracer:
+        with span('full run', 'run'):
+            colombia_h1_analysis.test_h1_colombia()
+            chile_h2_analysis.test_h2_chile()
+            argentina_paradox_analysis.main()
+
+    prefix = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(tempfile.gettempdir()) / 'ept_run'
+    trace_path, csv_path = tracer.export(prefix)
+    print(f"\nChrome trace: {trace_path} ({len(tracer.events):,} events)")
+    print(f"CSV summary:  {csv_path}\n")
+    print(f"{'Category':10s} {'Calls':>5s} {'Total ms':>9s} {'Self ms':>9s} {'Rows':>6s} {'Bytes':>7s}  Name")
+    for row in tracer.summary()[:15]:
+        print(f"{row['Category']:10s} {row['Calls']:5d} {row['Total_ms']:9.2f} {row['Self_ms']:9.2f} "
+              f"{row['Rows']:6d} {row['Bytes']:7d}  {row['Name']}")
+    print(f"\nCounters: {tracer.counters}")
+    print("="*70)
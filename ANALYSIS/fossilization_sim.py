@@ -0,0 +1,292 @@
+"""
+FOSSILIZATION SIMULATOR: Lockstep simulation of the utopian cycle
+Turns the six-stage cycle of analyze_utopian_cycle into a parameterized
+model run over millions of synthetic countries at once
+
+Each year, for every country (all countries advance together as arrays):
+    1. A reform is attempted with probability attempt_prob
+    2. It succeeds with probability expit(-steepness × (CLI − threshold)):
+       the higher the lock-in, the less likely reform gets through
+    3. Failure adds lock-in (stage 5, "+0.02" per failed reform), scaled by
+       the remaining headroom: fail_increment × (ceiling − CLI)/(ceiling − start)
+    4. Success removes success_decrement of lock-in
+    5. CLI also moves by drift plus N(0, noise) and stays in [0, ceiling]
+
+Growth statistics are accumulated while simulating (running sums of y and
+x·y per country), so no trajectory needs to be stored: memory is O(countries)
+and runs are chunked for any number of countries.
+
+Calibration: brentq on one parameter so that the mean endpoint growth rate,
+(CLI_end − CLI_start)/years as in analyze_cli_growth_rate, equals the
+Argentina estimate (+0.0055/year). Every evaluation reuses the same seed
+(common random numbers), so successive evaluations differ only through the
+parameter and not through fresh sampling noise. The mean rate is still a
+Monte Carlo estimate, not an analytic function: it is only approximately
+monotone and steps as individual draws flip, so the bracket must straddle
+the target with margin and the result carries the sampling error of
+n_countries (across seeds, fail_increment has a standard deviation of about
+0.00004 at 50,000 countries).
+
+Author: Adrian Lerer
+Date: November 2025
+"""
+
+import functools
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import brentq
+from scipy.special import expit
+
+ESTIMATION = "[Estimación]"
+INFERENCE = "[Inferencia]"
+
+# Argentina: CLI 0.45 (1949) → 0.87 (2025), analyze_cli_growth_rate
+TARGET_GROWTH_RATE = (0.87 - 0.45) / (2025 - 1949)
+YEARS = (1949, 2025)
+
+DEFAULT_PARAMS = {
+    'start_cli': 0.45,
+    'attempt_prob': 0.30,        # ~23 attempts over 1949-2025
+    'threshold': 0.35,           # CLI at which an attempt succeeds half the time
+    'steepness': 15.0,
+    'fail_increment': 0.02,      # analyze_utopian_cycle stage 5
+    'success_decrement': 0.03,
+    'drift': 0.0,
+    'noise': 0.0,
+    'ceiling': 1.0
+}
+
+# Final CLI at or above this with no successful reform counts as fossilized
+FOSSILIZED_CLI = 0.80
+
+# Result of calibrate() with the inputs below (~40 s), recorded so other
+# models need not re-run it. calibrated_fail_increment() checks the record
+# against the current defaults and re-calibrates if they have drifted
+CALIBRATED_FAIL_INCREMENT = 0.03767
+CALIBRATION_INPUTS = {
+    'parameter': 'fail_increment',
+    'bounds': (0.001, 0.10),
+    'n_countries': 1_000_000,
+    'seed': 0,
+    'xtol': 1e-6,
+    'target': (0.87 - 0.45) / (2025 - 1949),
+    'years': (1949, 2025),
+    'params': {
+        'start_cli': 0.45,
+        'attempt_prob': 0.30,
+        'threshold': 0.35,
+        'steepness': 15.0,
+        'success_decrement': 0.03,
+        'drift': 0.0,
+        'noise': 0.0,
+        'ceiling': 1.0
+    }
+}
+
+DEFAULT_CHUNK_SIZE = 1 << 18
+
+
+def simulate(n_countries, params=None, years=YEARS, seed=None, keep_paths=False):
+    """
+    Simulate n_countries trajectories in lockstep
+
+    Args:
+        n_countries: Number of synthetic countries
+        params: Overrides of DEFAULT_PARAMS
+        years: (first, last) calendar years; first is the starting state
+        seed: Seed for numpy's default_rng
+        keep_paths: Also return the (n_countries, T) CLI array (float32)
+
+    Returns:
+        Dict of per-country arrays: CLI_End, Growth_Rate (endpoint),
+        Slope (OLS on years), Attempts, Failures, Successes [, CLI]
+    """
+    p = {**DEFAULT_PARAMS, **(params or {})}
+    rng = np.random.default_rng(seed)
+    n_years = years[1] - years[0]
+    ceiling = p['ceiling']
+    headroom_scale = p['fail_increment'] / (ceiling - p['start_cli'])
+
+    cli = np.full(n_countries, p['start_cli'])
+    attempts = np.zeros(n_countries, dtype=np.int16)
+    successes = np.zeros(n_countries, dtype=np.int16)
+    sum_y = cli.copy()
+    sum_xy = np.zeros(n_countries)
+    paths = None
+    if keep_paths:
+        paths = np.empty((n_countries, n_years + 1), dtype=np.float32)
+        paths[:, 0] = cli
+
+    for t in range(1, n_years + 1):
+        attempt = rng.random(n_countries) < p['attempt_prob']
+        success = attempt & (rng.random(n_countries) < expit(-p['steepness'] * (cli - p['threshold'])))
+        failure = attempt & ~success
+
+        step = p['drift'] + failure * headroom_scale * (ceiling - cli) - success * p['success_decrement']
+        if p['noise']:
+            step = step + p['noise'] * rng.standard_normal(n_countries)
+        cli = np.clip(cli + step, 0.0, ceiling)
+
+        attempts += attempt
+        successes += success
+        sum_y += cli
+        sum_xy += t * cli
+        if keep_paths:
+            paths[:, t] = cli
+
+    # OLS slope on x = 0..n_years from the running sums
+    n = n_years + 1
+    sum_x = n_years * n / 2
+    sum_xx = n_years * n * (2 * n_years + 1) / 6
+    slope = (sum_xy - sum_x * sum_y / n) / (sum_xx - sum_x ** 2 / n)
+
+    result = {
+        'CLI_End': cli,
+        'Growth_Rate': (cli - p['start_cli']) / n_years,
+        'Slope': slope,
+        'Attempts': attempts,
+        'Failures': attempts - successes,
+        'Successes': successes
+    }
+    if keep_paths:
+        result['CLI'] = paths
+    return result
+
+
+def summarize(n_countries, params=None, years=YEARS, seed=None, chunk_size=DEFAULT_CHUNK_SIZE,
+              qs=(0.05, 0.50, 0.95)):
+    """
+    Population statistics over n_countries simulated in chunks
+
+    Chunk k uses seed (seed, k), so results are reproducible and do not
+    depend on how many chunks ran before.
+
+    Returns:
+        Dict with mean/quantiles of Growth_Rate and Slope, mean attempts
+        and failures, and the fossilized share (CLI_End ≥ FOSSILIZED_CLI with
+        zero successful reforms)
+    """
+    rates, slopes = [], []
+    attempts = failures = fossilized = 0
+    for k, start in enumerate(range(0, n_countries, chunk_size)):
+        n = min(chunk_size, n_countries - start)
+        chunk = simulate(n, params, years, seed=None if seed is None else (seed, k))
+        rates.append(chunk['Growth_Rate'].astype(np.float32))
+        slopes.append(chunk['Slope'].astype(np.float32))
+        attempts += int(chunk['Attempts'].sum())
+        failures += int(chunk['Failures'].sum())
+        fossilized += int(((chunk['CLI_End'] >= FOSSILIZED_CLI) & (chunk['Successes'] == 0)).sum())
+
+    rates, slopes = np.concatenate(rates), np.concatenate(slopes)
+    summary = {
+        'countries': n_countries,
+        'growth_rate_mean': float(rates.mean(dtype=np.float64)),
+        'slope_mean': float(slopes.mean(dtype=np.float64)),
+        'attempts_mean': attempts / n_countries,
+        'failures_mean': failures / n_countries,
+        'fossilized_share': fossilized / n_countries
+    }
+    for q, value in zip(qs, np.quantile(rates, qs)):
+        summary[f'growth_rate_q{q*100:g}'] = float(value)
+    return summary
+
+
+def calibrate(parameter='fail_increment', bounds=(0.001, 0.10), target=TARGET_GROWTH_RATE,
+              n_countries=1_000_000, params=None, years=YEARS, seed=0, xtol=1e-6):
+    """
+    Solve for one parameter so the mean endpoint growth rate hits target
+
+    Args:
+        parameter: Key of DEFAULT_PARAMS to calibrate
+        bounds: Bracket; the mean rate minus target must change sign on it
+
+    Returns:
+        (value, summary at the calibrated value)
+    """
+    base = {**DEFAULT_PARAMS, **(params or {})}
+
+    def excess(value):
+        return summarize(n_countries, {**base, parameter: value}, years, seed)['growth_rate_mean'] - target
+
+    value = brentq(excess, *bounds, xtol=xtol)
+    return value, summarize(n_countries, {**base, parameter: value}, years, seed)
+
+
+@functools.lru_cache(maxsize=None)
+def calibrated_fail_increment():
+    """
+    fail_increment calibrated to TARGET_GROWTH_RATE
+
+    Returns CALIBRATED_FAIL_INCREMENT while the recorded CALIBRATION_INPUTS
+    still match DEFAULT_PARAMS, TARGET_GROWTH_RATE and YEARS; otherwise
+    re-runs calibrate() with the recorded sample size and seed (once per
+    process). Changes to simulate() itself are not detected: re-run
+    `python fossilization_sim.py`, which reports a stale value.
+    """
+    record = CALIBRATION_INPUTS
+    parameter = record['parameter']
+    params = {key: value for key, value in DEFAULT_PARAMS.items() if key != parameter}
+    if params == record['params'] and TARGET_GROWTH_RATE == record['target'] and YEARS == record['years']:
+        return CALIBRATED_FAIL_INCREMENT
+    value, _ = calibrate(parameter, record['bounds'], n_countries=record['n_countries'],
+                         seed=record['seed'], xtol=record['xtol'])
+    return value
+
+
+def argentina_comparison(params=None, n_countries=100_000, seed=0):
+    """
+    Mean simulated CLI path next to load_argentina_reform_data
+
+    Returns:
+        DataFrame with Year, CLI_Estimated, CLI_Sim_Mean, CLI_Sim_q5, CLI_Sim_q95
+    """
+    from argentina_paradox_analysis import load_argentina_reform_data
+    observed = load_argentina_reform_data()
+    sim = simulate(n_countries, params, YEARS, seed, keep_paths=True)['CLI']
+    cols = observed['Year'].to_numpy() - YEARS[0]
+    q5, q95 = np.quantile(sim[:, cols], [0.05, 0.95], axis=0)
+    return pd.DataFrame({
+        'Year': observed['Year'],
+        'CLI_Estimated': observed['CLI_Estimated'],
+        'CLI_Sim_Mean': sim[:, cols].mean(axis=0),
+        'CLI_Sim_q5': q5,
+        'CLI_Sim_q95': q95
+    })
+
+
+if __name__ == "__main__":
+    import time
+
+    print("="*70)
+    print("UTOPIAN CYCLE SIMULATION: CALIBRATING THE FOSSILIZATION RATE")
+    print("="*70)
+
+    start = time.perf_counter()
+    summary = summarize(1_000_000, seed=0)
+    elapsed = time.perf_counter() - start
+    print(f"\nDefault parameters, 1,000,000 countries × {YEARS[1] - YEARS[0]} years "
+          f"in {elapsed:.2f} s:")
+    for key, value in summary.items():
+        print(f"  {key:20s} {value:.4f}" if isinstance(value, float) else f"  {key:20s} {value:,}")
+
+    print(f"\nCalibrating to +{TARGET_GROWTH_RATE:.4f}/year (Argentina 1949-2025):")
+    for parameter, bounds in (('fail_increment', (0.001, 0.10)), ('attempt_prob', (0.01, 1.0))):
+        start = time.perf_counter()
+        value, calibrated = calibrate(parameter, bounds)
+        if parameter == 'fail_increment' and abs(value - CALIBRATED_FAIL_INCREMENT) >= 5e-5:
+            print(f"  (CALIBRATED_FAIL_INCREMENT = {CALIBRATED_FAIL_INCREMENT} is stale: "
+                  f"record {value:.5f} and its inputs in CALIBRATION_INPUTS)")
+        print(f"  {parameter:15s} = {value:.4f}  → mean rate {calibrated['growth_rate_mean']:+.5f}, "
+              f"slope {calibrated['slope_mean']:+.5f}, {calibrated['failures_mean']:.1f} failed reforms, "
+              f"fossilized {calibrated['fossilized_share']*100:.1f}%  ({time.perf_counter() - start:.1f} s)")
+
+    value, _ = calibrate('fail_increment', n_countries=200_000)
+    comparison = argentina_comparison({'fail_increment': value})
+    print(f"\nSimulated vs estimated Argentina CLI (fail_increment = {value:.4f}):")
+    shown = comparison[comparison['Year'].isin([1949, 1976, 1994, 2010, 2025])]
+    print(shown.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+    print(f"\n{ESTIMATION} - Target rate from the estimated Argentina CLI trajectory")
+    print(f"{INFERENCE} - Cycle mechanics from analyze_utopian_cycle")
+    print("="*70)
@@ -0,0 +1,257 @@
+"""
+FSI ENGINE: Panel-scale Fiscal Sustainability Index
+Generalizes calculate_fsi_colombia (8 hard-coded points, constant 50% debt
+capacity) to a multi-country fiscal panel loaded from a local file
+
+FSI = (Revenue / Spending) × (Debt Capacity / Debt)
+
+Input panel (long, one row per country-period), columns as in
+colombia_fsi_trajectory.csv:
+    Country, Year, Revenue_GDP_%, Spending_GDP_%, Debt_GDP_%
+    [Debt_Capacity_%]   optional; otherwise supplied via debt_capacity
+
+Debt capacity may be:
+    - a scalar (50.0 = the Colombia analysis default)
+    - a dict country → scalar
+    - a DataFrame with Country, Year, Debt_Capacity_%: each value applies
+      from its Year until the next entry for that country (as-of join), so
+      capacity can change with rating downgrades, fiscal rules, etc.
+
+Deficit, FSI and the crisis flag (FSI < 0.50) are computed for every row
+in one vectorized pass. Year may be fractional (e.g. 2025.25) for
+quarterly panels.
+
+Author: Adrian Lerer
+Date: November 2025
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+ESTIMATION = "[Estimación]"
+
+# FSI below this value is a fiscal crisis (calculate_fsi_colombia)
+FSI_CRISIS_THRESHOLD = 0.50
+
+# Sustainable debt level, % GDP (calculate_fsi_colombia)
+DEFAULT_DEBT_CAPACITY = 50.0
+
+FISCAL_COLUMNS = ('Revenue_GDP_%', 'Spending_GDP_%', 'Debt_GDP_%')
+CAPACITY_COLUMN = 'Debt_Capacity_%'
+
+
+def fiscal_sustainability(revenue, spending, debt, debt_capacity=DEFAULT_DEBT_CAPACITY):
+    """
+    FSI element-wise (scalars or broadcastable arrays, all % GDP)
+
+    Returns:
+        FSI as float for scalar inputs, ndarray otherwise
+    """
+    fsi = np.divide(revenue, spending) * np.divide(debt_capacity, debt)
+    if np.ndim(fsi) == 0:
+        return float(fsi)
+    return fsi
+
+
+def load_fiscal_panel(path, columns=None):
+    """
+    Read a fiscal panel from CSV (optionally compressed) or Parquet
+
+    Args:
+        path: File path; format from the suffix (.parquet needs pyarrow)
+        columns: Optional rename mapping from file columns to panel columns,
+                 e.g. {'iso3': 'Country', 'rev': 'Revenue_GDP_%'}
+
+    Returns:
+        DataFrame sorted by Country, Year with float64 fiscal columns
+    """
+    import pandas as pd
+
+    path = Path(path)
+    if path.suffix == '.parquet':
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path)
+    if columns:
+        df = df.rename(columns=columns)
+
+    missing = [c for c in ('Country', 'Year') + FISCAL_COLUMNS if c not in df.columns]
+    if missing:
+        raise KeyError(f"Fiscal panel {path} lacks column(s): {missing}")
+    numeric = [c for c in FISCAL_COLUMNS + (CAPACITY_COLUMN,) if c in df.columns]
+    df[numeric] = df[numeric].astype(np.float64)
+    df['Country'] = df['Country'].astype('category')
+    return df.sort_values(['Country', 'Year'], kind='stable', ignore_index=True)
+
+
+def resolve_debt_capacity(panel, debt_capacity=None):
+    """
+    Debt capacity per panel row
+
+    Uses the panel's Debt_Capacity_% column when debt_capacity is None and
+    the column exists, else DEFAULT_DEBT_CAPACITY.
+
+    Returns:
+        float64 array aligned with panel rows (NaN where a time-varying
+        schedule has no entry at or before the row's year)
+    """
+    n = len(panel)
+    if debt_capacity is None:
+        if CAPACITY_COLUMN in panel.columns:
+            return panel[CAPACITY_COLUMN].to_numpy(dtype=np.float64)
+        debt_capacity = DEFAULT_DEBT_CAPACITY
+
+    if np.isscalar(debt_capacity):
+        return np.full(n, float(debt_capacity))
+
+    if isinstance(debt_capacity, dict):
+        countries = panel['Country'].astype(str)
+        return countries.map(debt_capacity).to_numpy(dtype=np.float64)
+
+    # Time-varying schedule: as-of join on Year within each country
+    import pandas as pd
+
+    schedule = debt_capacity[['Country', 'Year', CAPACITY_COLUMN]].copy()
+    schedule['Country'] = schedule['Country'].astype(str)
+    schedule['Year'] = schedule['Year'].astype(np.float64)
+    left = pd.DataFrame({
+        'Country': panel['Country'].astype(str).to_numpy(),
+        'Year': panel['Year'].to_numpy(dtype=np.float64),
+        '_row': np.arange(n)
+    })
+    merged = pd.merge_asof(left.sort_values('Year', kind='stable'), schedule.sort_values('Year'),
+                           on='Year', by='Country', direction='backward')
+    capacity = np.empty(n)
+    capacity[merged['_row'].to_numpy()] = merged[CAPACITY_COLUMN].to_numpy(dtype=np.float64)
+    return capacity
+
+
+def score_fiscal_panel(panel, debt_capacity=None, threshold=FSI_CRISIS_THRESHOLD):
+    """
+    Deficit, FSI and crisis flag for every country-period
+
+    Args:
+        panel: DataFrame from load_fiscal_panel (or any frame with the
+               Country, Year and FISCAL_COLUMNS columns)
+        debt_capacity: Scalar, dict or schedule (see module docstring)
+        threshold: Crisis threshold on FSI
+
+    Returns:
+        Copy of panel with Debt_Capacity_%, Deficit_GDP_%, FSI and Crisis
+    """
+    revenue, spending, debt = (panel[c].to_numpy(dtype=np.float64) for c in FISCAL_COLUMNS)
+    capacity = resolve_debt_capacity(panel, debt_capacity)
+    fsi = fiscal_sustainability(revenue, spending, debt, capacity)
+
+    out = panel.copy()
+    out[CAPACITY_COLUMN] = capacity
+    out['Deficit_GDP_%'] = spending - revenue
+    out['FSI'] = fsi
+    out['Crisis'] = fsi < threshold
+    return out
+
+
+def crisis_summary(scored):
+    """
+    Per-country monitoring summary of a scored panel
+
+    Returns:
+        DataFrame indexed by Country with Latest_Year, Latest_FSI,
+        Latest_Crisis, Crisis_Periods and First_Crisis_Year
+    """
+    import pandas as pd
+
+    grouped = scored.groupby('Country', observed=True, sort=True)
+    latest = grouped.tail(1).set_index('Country')
+    first_crisis = scored[scored['Crisis']].groupby('Country', observed=True)['Year'].min()
+    summary = pd.DataFrame({
+        'Latest_Year': latest['Year'],
+        'Latest_FSI': latest['FSI'],
+        'Latest_Crisis': latest['Crisis'],
+        'Crisis_Periods': grouped['Crisis'].sum(),
+        'First_Crisis_Year': first_crisis
+    })
+    summary.index = summary.index.astype(str)
+    return summary
+
+
+def colombia_fiscal_panel():
+    """The calculate_fsi_colombia inputs as a one-country panel"""
+    from colombia_h1_analysis import calculate_fsi_colombia
+    _, df = calculate_fsi_colombia()
+    panel = df[['Year'] + list(FISCAL_COLUMNS) + [CAPACITY_COLUMN]].copy()
+    panel.insert(0, 'Country', 'Colombia')
+    return panel
+
+
+def simulate_fiscal_panel(countries=20, years=(1960, 2025), step=1.0, seed=None):
+    """
+    Synthetic regional fiscal panel (random-walk revenue, spending and debt)
+
+    Returns:
+        DataFrame with Country, Year and FISCAL_COLUMNS
+    """
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    grid = np.arange(years[0], years[1] + step / 2, step)
+    shape = (countries, len(grid))
+    revenue = np.clip(15 + np.cumsum(rng.normal(0.05, 0.4, shape), axis=1), 5, None)
+    spending = np.clip(revenue + 1 + np.cumsum(rng.normal(0.0, 0.2, shape), axis=1), 5, None)
+    debt = np.clip(30 + np.cumsum(rng.normal(0.05, 1.0, shape), axis=1), 5, None)
+    return pd.DataFrame({
+        'Country': pd.Categorical(np.repeat([f'C{i:03d}' for i in range(countries)], len(grid))),
+        'Year': np.tile(grid, countries),
+        'Revenue_GDP_%': revenue.ravel(),
+        'Spending_GDP_%': spending.ravel(),
+        'Debt_GDP_%': debt.ravel()
+    })
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    import pandas as pd
+
+    print("="*70)
+    print("PANEL FISCAL SUSTAINABILITY INDEX ENGINE")
+    print("="*70)
+
+    # Consistency with the single-country analysis
+    colombia = score_fiscal_panel(colombia_fiscal_panel())
+    from colombia_h1_analysis import calculate_fsi_colombia
+    reference, _ = calculate_fsi_colombia()
+    print(f"\nColombia (8 points): max |ΔFSI| vs calculate_fsi_colombia = "
+          f"{np.max(np.abs(colombia['FSI'].to_numpy() - reference)):.1e}")
+
+    # Time-varying capacity: Colombia's sustainable level tightened after 2020
+    schedule = pd.DataFrame({'Country': ['Colombia', 'Colombia'], 'Year': [1991, 2020],
+                             CAPACITY_COLUMN: [50.0, 45.0]})
+    tightened = score_fiscal_panel(colombia, debt_capacity=schedule)
+    print(tightened[['Year', CAPACITY_COLUMN, 'Deficit_GDP_%', 'FSI', 'Crisis']]
+          .tail(3).to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+    # Regional quarterly panel from a file
+    panel = simulate_fiscal_panel(countries=500, years=(1960, 2025.75), step=0.25, seed=7)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'fiscal_panel.csv'
+        panel.to_csv(path, index=False)
+        start = time.perf_counter()
+        panel = load_fiscal_panel(path)
+        loaded = time.perf_counter() - start
+
+    capacity = {f'C{i:03d}': 40.0 + 20.0 * (i % 3) / 2 for i in range(500)}
+    start = time.perf_counter()
+    scored = score_fiscal_panel(panel, debt_capacity=capacity)
+    summary = crisis_summary(scored)
+    elapsed = time.perf_counter() - start
+    print(f"\nRegional panel: {len(scored):,} country-quarters loaded in {loaded:.2f} s, "
+          f"scored + summarized in {elapsed*1000:.0f} ms")
+    print(f"  Countries in crisis at {summary['Latest_Year'].max():.2f}: "
+          f"{int(summary['Latest_Crisis'].sum())} of {len(summary)}")
+    print(summary.head(5).to_string(float_format=lambda v: f"{v:.3f}"))
+
+    print(f"\n{ESTIMATION} - FSI < {FSI_CRISIS_THRESHOLD:.2f} → FISCAL CRISIS")
+    print("="*70)
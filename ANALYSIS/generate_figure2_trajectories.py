@@ -12,13 +12,21 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 
+from panel_store import current_store
+
 def load_colombia_trajectory():
-    """Load Colombia CF trajectory from CSV."""
+    """Load Colombia CF trajectory from the panel store (CSV if not built)."""
+    store = current_store()
+    if store is not None:
+        return store.series('Colombia', 'CF')
     df = pd.read_csv('../DATA/analysis_results/colombia_constitutional_fitness.csv')
     return df['Year'].values, df['CF'].values
 
 def load_argentina_trajectory():
-    """Load Argentina CF trajectory from CSV."""
+    """Load Argentina CF trajectory from the panel store (CSV if not built)."""
+    store = current_store()
+    if store is not None:
+        return store.series('Argentina', 'CF')
     df = pd.read_csv('../DATA/analysis_results/argentina_cf_trajectory.csv')
     return df['Year'].values, df['CF'].values
 
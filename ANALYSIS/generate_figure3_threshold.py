@@ -8,7 +8,6 @@ Date: November 2025
 License: CC-BY 4.0
 """
 
-import matplotlib.pyplot as plt
 import numpy as np
 from scipy.special import expit  # logistic function
 
@@ -38,6 +37,8 @@ def generate_support_threshold():
     - Chile: 38.14% approval [Verificado - SERVEL official results]
     """
     
+    import matplotlib.pyplot as plt
+
     # Generate support range
     support_range = np.linspace(0, 1, 1000)
     
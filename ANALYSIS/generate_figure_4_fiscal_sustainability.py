@@ -15,8 +15,20 @@ import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+from panel_store import current_store
+
 def load_data():
-    """Load data from CSV files"""
+    """Load data from the panel store, or from CSV files if it is not built"""
+    
+    store = current_store()
+    if store is not None:
+        colombia_df = store.frame('Colombia', ['CLI', 'Gap', 'PE', 'SP', 'CD', 'FSI', 'CF'])
+        colombia_df['Country'] = 'Colombia'
+        argentina_df = store.frame('Argentina', ['CLI', 'Gap', 'PE', 'CF'])
+        argentina_df['Country'] = 'Argentina'
+        chile_df = store.frame('Chile', ['SP', 'CLI', 'Gap', 'CD', 'PE', 'CF'])
+        chile_df.insert(0, 'Country', 'Chile')
+        return colombia_df, argentina_df, chile_df
     
     # Colombia data (1991-2025)
     colombia_df = pd.read_csv('../DATA/analysis_results/colombia_constitutional_fitness.csv')
@@ -0,0 +1,266 @@
+"""
+INVERSE CF SOLVER: Minimal component change to move CF into a target band
+Reads the interpretation scale of calculate_constitutional_fitness_chile
+backwards: what support, lock-in or gap would a case have needed?
+
+CF = [PE × (1-Gap) × (1-CD) × SP] / (CLI + ε) is monotone in every
+component (increasing in PE and SP, decreasing in Gap, CD and CLI), so:
+
+    - One component: closed form. Holding the others fixed, CF is
+      proportional to a single factor of that component, e.g.
+          PE*  = CF* (CLI+ε) / [(1-Gap)(1-CD) SP]
+          CLI* = PE (1-Gap)(1-CD) SP / CF* - ε
+    - Several components: every selected component moves by the same
+      absolute step δ in the direction that raises (or lowers) CF. CF is
+      monotone in δ, so the minimal δ is found by vectorized bisection over
+      all cases at once.
+
+Bands follow cf_engine.classify_cf: band k covers (edge[k-1], edge[k]], so
+entering a band from below means CF > lower edge and from above CF <= upper
+edge. Components are bounded to [0, 1]; a case whose target cannot be
+reached inside the bounds returns NaN.
+
+Author: Adrian Lerer
+Date: November 2025
+"""
+
+import numpy as np
+import pandas as pd
+
+from cf_engine import (CF_BAND_EDGES, CF_BAND_LABELS, COMPONENTS, EPSILON,
+                       classify_cf, score_panel)
+
+ESTIMATION = "[Estimación]"
+
+# +1: CF increases with the component, -1: CF decreases with it
+DIRECTION = {'PE': 1, 'Gap': -1, 'CD': -1, 'SP': 1, 'CLI': -1}
+
+# Relative overshoot past a band edge so rounding cannot land on the edge
+MARGIN = 1e-9
+
+# Bisection iterations for joint moves (step width 2^-60 of the unit box)
+BISECT_ITER = 60
+
+
+def _band_index(band):
+    if isinstance(band, str):
+        return CF_BAND_LABELS.index(band)
+    return int(band)
+
+
+def band_targets(cf, band):
+    """
+    Target CF value per case for entering `band`
+
+    Args:
+        cf: Current CF values
+        band: Band code (0-3) or label from CF_BAND_LABELS
+
+    Returns:
+        (target, sign): target CF (current CF where already in band) and
+        +1 / -1 / 0 for raise / lower / no change needed
+    """
+    k = _band_index(band)
+    cf = np.asarray(cf, dtype=np.float64)
+    edges = (0.0,) + CF_BAND_EDGES + (np.inf,)
+    lower, upper = edges[k], edges[k + 1]
+
+    below = classify_cf(cf) < k
+    above = classify_cf(cf) > k
+    target = cf.copy()
+    target[below] = lower * (1.0 + MARGIN)
+    target[above] = upper * (1.0 - MARGIN)
+    sign = below.astype(np.int8) - above.astype(np.int8)
+    return target, sign
+
+
+def solve_component(panel, component, target_cf, epsilon=EPSILON, bounds=(0.0, 1.0)):
+    """
+    Closed-form value of one component that yields target_cf
+
+    Args:
+        panel: Array (..., 5) of components ordered as COMPONENTS
+        component: Component name from COMPONENTS
+        target_cf: Target CF, broadcastable to panel.shape[:-1]
+        bounds: Admissible range of the component
+
+    Returns:
+        Required component values, NaN where the target is unreachable
+    """
+    panel = np.asarray(panel, dtype=np.float64)
+    target_cf = np.asarray(target_cf, dtype=np.float64)
+    pe, gap, cd, sp, cli = (panel[..., i] for i in range(len(COMPONENTS)))
+    numerator = pe * (1.0 - gap) * (1.0 - cd) * sp
+    denominator = cli + epsilon
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if component == 'CLI':
+            value = numerator / target_cf - epsilon
+        else:
+            # CF = factor(component) × rest, factor = x or (1 - x)
+            factor = {'PE': pe, 'Gap': 1.0 - gap, 'CD': 1.0 - cd, 'SP': sp}[component]
+            rest = numerator / factor / denominator
+            required = target_cf / rest
+            value = required if DIRECTION[component] > 0 else 1.0 - required
+
+    lo, hi = bounds
+    return np.where((value >= lo) & (value <= hi), value, np.nan)
+
+
+def solve_joint(panel, components, target_cf, sign, epsilon=EPSILON, bounds=(0.0, 1.0),
+                n_iter=BISECT_ITER):
+    """
+    Minimal common step δ on several components that reaches target_cf
+
+    Each component c moves by sign × DIRECTION[c] × δ (clipped to bounds).
+
+    Args:
+        panel: Array (..., 5) of components
+        components: Component names to move together
+        target_cf: Target CF per case
+        sign: +1 to raise CF, -1 to lower it, 0 for no change (per case)
+
+    Returns:
+        (delta, moved_panel): δ per case (NaN if unreachable even at the
+        bounds) and the panel with the components moved by δ
+    """
+    panel = np.asarray(panel, dtype=np.float64)
+    target_cf = np.broadcast_to(np.asarray(target_cf, dtype=np.float64), panel.shape[:-1])
+    sign = np.broadcast_to(np.asarray(sign, dtype=np.float64), panel.shape[:-1])
+    idx = [COMPONENTS.index(c) for c in components]
+    step = np.array([DIRECTION[c] for c in components], dtype=np.float64)
+    lo, hi = bounds
+
+    def moved(delta):
+        out = panel.copy()
+        shift = (sign * delta)[..., np.newaxis] * step
+        out[..., idx] = np.clip(panel[..., idx] + shift, lo, hi)
+        return out
+
+    def gap_to_target(delta):
+        # >= 0 once the target is reached, in either direction
+        return sign * (score_panel(moved(delta), epsilon) - target_cf)
+
+    reachable = (gap_to_target(np.full(sign.shape, hi - lo)) >= 0) | (sign == 0)
+    left = np.zeros(sign.shape)
+    right = np.where(sign == 0, 0.0, hi - lo)
+    for _ in range(n_iter):
+        mid = 0.5 * (left + right)
+        ok = gap_to_target(mid) >= 0
+        right = np.where(ok, mid, right)
+        left = np.where(ok, left, mid)
+
+    delta = np.where(reachable, right, np.nan)
+    return delta, moved(np.where(reachable, right, 0.0))
+
+
+def minimal_change(panel, band, components=COMPONENTS, joint=None, epsilon=EPSILON):
+    """
+    Minimal change needed to move every case into `band`
+
+    Args:
+        panel: Array (n, 5) of components
+        band: Target band code or label
+        components: Components solved one at a time (closed form)
+        joint: Optional list of components moved together (bisection)
+
+    Returns:
+        Dict with cf, target, sign, required/delta per component, the
+        cheapest single lever per case (None if already in band or
+        unreachable) and joint_delta if requested
+    """
+    panel = np.asarray(panel, dtype=np.float64)
+    cf = score_panel(panel, epsilon)
+    target, sign = band_targets(cf, band)
+
+    result = {'cf': cf, 'target': target, 'sign': sign, 'required': {}, 'delta': {}}
+    for name in components:
+        current = panel[..., COMPONENTS.index(name)]
+        required = solve_component(panel, name, target, epsilon)
+        required = np.where(sign == 0, current, required)
+        result['required'][name] = required
+        result['delta'][name] = required - current
+
+    deltas = np.stack([np.abs(result['delta'][c]) for c in components], axis=-1)
+    deltas = np.where(np.isnan(deltas), np.inf, deltas)
+    best = np.argmin(deltas, axis=-1)
+    feasible = np.isfinite(np.min(deltas, axis=-1)) & (sign != 0)
+    result['cheapest'] = np.where(feasible, np.asarray(components, dtype=object)[best], None)
+
+    if joint:
+        result['joint_delta'], _ = solve_joint(panel, joint, target, sign, epsilon)
+    return result
+
+
+def inverse_frame(panel, band, countries, years, components=COMPONENTS, joint=None):
+    """One row per case: current CF, target, required value and Δ per component"""
+    result = minimal_change(panel, band, components, joint)
+    data = {
+        'Country': np.asarray(countries),
+        'Year': np.asarray(years),
+        'CF': result['cf'],
+        'Target_CF': result['target'],
+        'Target_Band': CF_BAND_LABELS[_band_index(band)]
+    }
+    for name in components:
+        data[f'{name}_Required'] = result['required'][name]
+        data[f'{name}_Delta'] = result['delta'][name]
+    data['Cheapest_Lever'] = result['cheapest']
+    if joint:
+        data[f"Joint_Delta_{'+'.join(joint)}"] = result['joint_delta']
+    return pd.DataFrame(data)
+
+
+def required_popular_support(sp_required, elite_support, institutional_fit):
+    """
+    Popular support implied by a required SP
+
+    SP = (Popular_Support + Elite_Support + Institutional_Fit) / 3, as in
+    calculate_selection_pressure_chile_2022 and _colombia. NaN above 100%.
+    """
+    support = 3.0 * np.asarray(sp_required, dtype=np.float64) - elite_support - institutional_fit
+    return np.where((support >= 0.0) & (support <= 1.0), support, np.nan)
+
+
+if __name__ == "__main__":
+    import time
+
+    print("="*70)
+    print("INVERSE CF SOLVER: WHAT WOULD IT HAVE TAKEN?")
+    print("="*70)
+
+    chile = pd.read_csv('../DATA/analysis_results/chile_constitutional_fitness.csv')
+    colombia = pd.read_csv('../DATA/analysis_results/colombia_constitutional_fitness.csv')
+    cases = pd.concat([
+        chile.assign(Country='Chile'),
+        colombia.assign(Country='Colombia')
+    ], ignore_index=True)
+    panel = cases[list(COMPONENTS)].to_numpy()
+
+    for band in (1, 3):
+        print(f"\nTarget band: {CF_BAND_LABELS[band]}")
+        df = inverse_frame(panel, band, cases['Country'], cases['Year'], joint=['SP', 'CLI'])
+        df = df[df['Target_CF'] != df['CF']]
+        cols = ['Country', 'Year', 'CF'] + [f'{c}_Required' for c in COMPONENTS]
+        cols += ['Cheapest_Lever', 'Joint_Delta_SP+CLI']
+        print(df[cols].to_string(index=False, float_format=lambda v: f"{v:.3f}", na_rep='—'))
+
+    # Chile 2022: popular support for an aspirational (CF > 0.20) outcome
+    row = cases.index[cases['Country'] == 'Chile'][0]
+    result = minimal_change(panel[[row]], 1, joint=['SP', 'PE', 'Gap'])
+    sp_needed = result['required']['SP'][0]
+    print(f"\nChile 2022 → {CF_BAND_LABELS[1]}:")
+    print(f"  SP alone: {sp_needed if np.isfinite(sp_needed) else 'unreachable (SP would exceed 1)'}")
+    print(f"  Popular support alone: "
+          f"{required_popular_support(sp_needed, 0.33, 0.20)[()] if np.isfinite(sp_needed) else 'unreachable'}")
+    print(f"  SP + PE + Gap together: δ = {result['joint_delta'][0]:.3f} each")
+
+    rng = np.random.default_rng(0)
+    synthetic = rng.uniform([0.05, 0.05, 0.1, 0.2, 0.2], [0.95, 0.8, 0.7, 0.9, 0.9], (100_000, 5))
+    start = time.perf_counter()
+    minimal_change(synthetic, 2, joint=['SP', 'CLI'])
+    elapsed = time.perf_counter() - start
+    print(f"\n100,000 cases, 5 closed-form levers + joint bisection: {elapsed*1000:.0f} ms")
+
+    print(f"\n{ESTIMATION} - Counterfactual requirements, components held at estimated values")
+    print("="*70)
@@ -0,0 +1,317 @@
+"""
+METRIC RECORDS: Compact struct-of-arrays container for country-year metrics
+Replaces per-case dicts of Python floats and small DataFrames in scenario
+runs with one typed column per field
+
+Layout per row (37 bytes with the default float32 metrics):
+    country     uint16   dictionary code into .countries
+    year        int16
+    scenario    uint32
+    provenance  uint8    code into PROVENANCE_TAGS
+    SP, CLI, Gap, CD, PE, FSI, CF   float32 (NaN = not computed)
+
+A dict of seven Python floats costs several hundred bytes per case; a
+DataFrame row in a small per-case frame costs more. Here 10 million
+country-year-scenario rows take ~370 MB.
+
+Rows are addressed through MetricRecord, a __slots__ view holding only
+(table, index): attribute access reads the columns in place, so iterating
+never materializes per-row dicts.
+
+Author: Adrian Lerer
+Date: November 2025
+"""
+
+import numpy as np
+import pandas as pd
+
+from cf_engine import constitutional_fitness
+
+VERIFIED = "[Verificado]"
+ESTIMATION = "[Estimación]"
+INFERENCE = "[Inferencia]"
+PROJECTION = "[Proyección]"
+
+# Provenance codes (index into this tuple)
+PROVENANCE_TAGS = (VERIFIED, ESTIMATION, INFERENCE, PROJECTION)
+
+METRIC_FIELDS = ('SP', 'CLI', 'Gap', 'CD', 'PE', 'FSI', 'CF')
+KEY_DTYPES = {
+    'country': np.uint16,
+    'year': np.int16,
+    'scenario': np.uint32,
+    'provenance': np.uint8
+}
+
+INITIAL_CAPACITY = 1024
+
+
+class MetricRecord:
+    """Read/write view of one row of a MetricTable"""
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    @property
+    def country(self):
+        return self._table.countries[self._table.column('country')[self._index]]
+
+    @property
+    def year(self):
+        return int(self._table.column('year')[self._index])
+
+    @property
+    def scenario(self):
+        return int(self._table.column('scenario')[self._index])
+
+    @property
+    def provenance(self):
+        return PROVENANCE_TAGS[self._table.column('provenance')[self._index]]
+
+    def __getattr__(self, name):
+        if name in METRIC_FIELDS:
+            return float(self._table.column(name)[self._index])
+        raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        if name in METRIC_FIELDS:
+            self._table.column(name)[self._index] = value
+        else:
+            object.__setattr__(self, name, value)
+
+    def as_dict(self):
+        row = {'Country': self.country, 'Year': self.year, 'Scenario': self.scenario}
+        row.update({name: getattr(self, name) for name in METRIC_FIELDS})
+        row['Provenance'] = self.provenance
+        return row
+
+    def __repr__(self):
+        values = ', '.join(f"{name}={getattr(self, name):.4g}" for name in METRIC_FIELDS)
+        return f"MetricRecord({self.country} {self.year} #{self.scenario}: {values})"
+
+
+class MetricTable:
+    """
+    Growable struct-of-arrays table of country-year-scenario metrics
+
+    Args:
+        capacity: Initial row capacity (doubles when exceeded)
+        dtype: Float dtype of the metric columns (float32 or float64)
+    """
+
+    def __init__(self, capacity=INITIAL_CAPACITY, dtype=np.float32):
+        self.dtype = np.dtype(dtype)
+        self.countries = []
+        self._country_codes = {}
+        self._n = 0
+        self._columns = {name: np.empty(capacity, dtype) for name, dtype in KEY_DTYPES.items()}
+        self._columns.update({name: np.empty(capacity, self.dtype) for name in METRIC_FIELDS})
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def capacity(self):
+        return len(self._columns['year'])
+
+    @property
+    def nbytes(self):
+        """Bytes used by the filled rows"""
+        return sum(col[:self._n].nbytes for col in self._columns.values())
+
+    def column(self, name):
+        """Writable view of a column over the filled rows"""
+        return self._columns[name][:self._n]
+
+    def country_code(self, country):
+        if country not in self._country_codes:
+            self._country_codes[country] = len(self.countries)
+            self.countries.append(country)
+        return self._country_codes[country]
+
+    def _reserve(self, extra):
+        needed = self._n + extra
+        if needed <= self.capacity:
+            return
+        capacity = max(needed, 2 * self.capacity)
+        for name, col in self._columns.items():
+            grown = np.empty(capacity, col.dtype)
+            grown[:self._n] = col[:self._n]
+            self._columns[name] = grown
+
+    def extend(self, country, year, scenario=0, provenance=ESTIMATION, **metrics):
+        """
+        Append rows; every argument is a scalar or an array of one length
+
+        Metrics not given are stored as NaN. country may be a label or an
+        array of labels.
+        """
+        sizes = [np.size(v) for v in (country, year, scenario, *metrics.values())]
+        n = max(sizes)
+        unknown = set(metrics) - set(METRIC_FIELDS)
+        if unknown:
+            raise KeyError(f"Unknown metric(s): {sorted(unknown)}")
+
+        if isinstance(country, str):
+            codes = self.country_code(country)
+        else:
+            labels, inverse = np.unique(np.asarray(country), return_inverse=True)
+            codes = np.array([self.country_code(str(c)) for c in labels])[inverse]
+        prov = provenance if isinstance(provenance, (int, np.integer)) else PROVENANCE_TAGS.index(provenance)
+
+        self._reserve(n)
+        rows = slice(self._n, self._n + n)
+        self._columns['country'][rows] = codes
+        self._columns['year'][rows] = year
+        self._columns['scenario'][rows] = scenario
+        self._columns['provenance'][rows] = prov
+        for name in METRIC_FIELDS:
+            self._columns[name][rows] = metrics.get(name, np.nan)
+        self._n += n
+        return self
+
+    def append(self, country, year, scenario=0, provenance=ESTIMATION, **metrics):
+        """Append one row; returns its MetricRecord view"""
+        self.extend(country, year, scenario, provenance, **metrics)
+        return MetricRecord(self, self._n - 1)
+
+    def score(self, chunk_size=1 << 20):
+        """Fill CF from PE, Gap, CD, SP, CLI (float64 math, chunked)"""
+        cf = self.column('CF')
+        for start in range(0, self._n, chunk_size):
+            rows = slice(start, start + chunk_size)
+            cf[rows] = constitutional_fitness(
+                *(self.column(name)[rows].astype(np.float64) for name in ('PE', 'Gap', 'CD', 'SP', 'CLI')))
+        return self
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            if index < 0:
+                index += self._n
+            if not 0 <= index < self._n:
+                raise IndexError(index)
+            return MetricRecord(self, int(index))
+        return self.take(np.arange(self._n)[index])
+
+    def __iter__(self):
+        for i in range(self._n):
+            yield MetricRecord(self, i)
+
+    def take(self, rows):
+        """New table with the selected rows (mask or index array)"""
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        out = MetricTable(capacity=max(len(rows), 1), dtype=self.dtype)
+        out.countries = list(self.countries)
+        out._country_codes = dict(self._country_codes)
+        for name in self._columns:
+            out._columns[name][:len(rows)] = self.column(name)[rows]
+        out._n = len(rows)
+        return out
+
+    def where(self, country=None, year=None, scenario=None):
+        """Rows matching the given keys (scalars or lists)"""
+        mask = np.ones(self._n, dtype=bool)
+        if country is not None:
+            labels = [country] if isinstance(country, str) else list(country)
+            codes = [self._country_codes[c] for c in labels if c in self._country_codes]
+            mask &= np.isin(self.column('country'), codes)
+        if year is not None:
+            mask &= np.isin(self.column('year'), np.atleast_1d(year))
+        if scenario is not None:
+            mask &= np.isin(self.column('scenario'), np.atleast_1d(scenario))
+        return self.take(mask)
+
+    @classmethod
+    def from_frame(cls, df, provenance=ESTIMATION, dtype=np.float32):
+        """From a wide DataFrame with Country, Year, [Scenario], metric columns"""
+        table = cls(capacity=max(len(df), 1), dtype=dtype)
+        metrics = {name: df[name].to_numpy() for name in METRIC_FIELDS if name in df.columns}
+        scenario = df['Scenario'].to_numpy() if 'Scenario' in df.columns else 0
+        return table.extend(df['Country'].to_numpy(), df['Year'].to_numpy(), scenario,
+                            provenance, **metrics)
+
+    @classmethod
+    def from_results(cls, results, dtype=np.float32):
+        """From ept_results.CaseResult objects (run_h1_colombia etc.)"""
+        table = cls(dtype=dtype)
+        for result in results:
+            metrics = {name: result.metric(name) for name in METRIC_FIELDS
+                       if name != 'FSI' or result.fsi is not None}
+            table.extend(result.country, result.years, 0, result.provenance, **metrics)
+        return table
+
+    def to_frame(self):
+        """Wide DataFrame (decoded country and provenance labels)"""
+        data = {
+            'Country': np.asarray(self.countries, dtype=object)[self.column('country')],
+            'Year': self.column('year').copy(),
+            'Scenario': self.column('scenario').copy()
+        }
+        for name in METRIC_FIELDS:
+            data[name] = self.column(name).copy()
+        data['Provenance'] = np.asarray(PROVENANCE_TAGS, dtype=object)[self.column('provenance')]
+        return pd.DataFrame(data)
+
+    def save(self, path):
+        """Write the filled rows to an .npz archive"""
+        np.savez(path, countries=np.asarray(self.countries, dtype=str),
+                 **{name: self.column(name) for name in self._columns})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as archive:
+            n = len(archive['year'])
+            table = cls(capacity=max(n, 1), dtype=archive['CF'].dtype)
+            for label in archive['countries']:
+                table.country_code(str(label))
+            for name in table._columns:
+                table._columns[name][:n] = archive[name]
+            table._n = n
+        return table
+
+    def __repr__(self):
+        return (f"MetricTable({self._n:,} rows, {len(self.countries)} countries, "
+                f"{self.dtype.name}, {self.nbytes / 2**20:.1f} MB)")
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from colombia_h1_analysis import run_h1_colombia
+    from chile_h2_analysis import run_h2_chile
+    from argentina_paradox_analysis import run_argentina_paradox
+
+    print("="*70)
+    print("METRIC RECORDS: STRUCT-OF-ARRAYS COUNTRY-YEAR TABLE")
+    print("="*70)
+
+    table = MetricTable.from_results([run_h1_colombia(), run_h2_chile(), run_argentina_paradox()])
+    print(f"\n{table}")
+    print(table.where(country='Chile')[0])
+    print(table.where(country='Colombia', year=2025)[0])
+
+    # Scenario-scale fill: 10M rows of perturbed components
+    n = 10_000_000
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    big = MetricTable(capacity=n)
+    big.extend(np.repeat(np.array(['Chile', 'Colombia', 'Argentina']), [n // 2, n // 4, n - n // 2 - n // 4]),
+               np.full(n, 2022), np.arange(n), PROJECTION,
+               SP=rng.uniform(0.2, 0.9, n), CLI=rng.uniform(0.2, 0.9, n),
+               Gap=rng.uniform(0.05, 0.8, n), CD=rng.uniform(0.1, 0.7, n),
+               PE=rng.uniform(0.05, 0.95, n))
+    big.score()
+    elapsed = time.perf_counter() - start
+    per_row = big.nbytes / len(big)
+    dict_row = sys.getsizeof({name: 0.5 for name in METRIC_FIELDS}) + len(METRIC_FIELDS) * sys.getsizeof(0.5)
+    print(f"\n{big} filled + scored in {elapsed:.2f} s")
+    print(f"  {per_row:.0f} bytes/row vs ≥{dict_row} bytes for a dict of Python floats")
+
+    print(f"\n{ESTIMATION} - Case metrics from run_h1_colombia, run_h2_chile, run_argentina_paradox")
+    print("="*70)
@@ -0,0 +1,347 @@
+"""
+PANEL STORE: Columnar, memory-mapped storage for country-year metrics
+Single store keyed by (country, year, metric, provenance) replacing the
+per-case CSV files as the read path for figures and reports. Each
+(country, year, metric) cell holds one value with one provenance; sources
+that disagree on a cell are rejected rather than silently collapsed.
+
+Layout (one directory):
+    manifest.json     Schema, dictionaries and row-group statistics
+    <column>.npy      One NumPy array per column, opened with mmap_mode='r'
+
+Rows are sorted by (metric, country, year). String keys are dictionary-
+encoded to small integer codes. Each (metric, country) run is a row group
+whose year range is recorded in the manifest, so filters on metric, country
+and year are resolved from the manifest alone (predicate pushdown) and only
+matching row ranges are sliced out of the memory maps. Column access returns
+read-only memmap views: no parsing, no type inference, no copies.
+
+A store built from the per-case CSVs records their SHA-256 in the
+manifest. current_store() compares them with the files on disk and
+rebuilds the store when an analysis has rewritten its CSV, so readers
+never see results older than the CSVs.
+
+Author: Adrian Lerer
+Date: November 2025
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Reality Filter Protocol
+VERIFIED = "[Verificado]"
+ESTIMATION = "[Estimación]"
+INFERENCE = "[Inferencia]"
+PROJECTION = "[Proyección]"
+
+RESULTS_DIR = Path(__file__).resolve().parent.parent / 'DATA' / 'analysis_results'
+STORE_DIR = Path(__file__).resolve().parent.parent / 'DATA' / 'panel_store'
+
+KEY_COLUMNS = ('Country', 'Year', 'Metric', 'Provenance')
+DICTIONARY_COLUMNS = ('Country', 'Metric', 'Provenance')
+COLUMN_DTYPES = {
+    'Country': np.int16,
+    'Year': np.int16,
+    'Metric': np.int16,
+    'Provenance': np.int8,
+    'Value': np.float64
+}
+FORMAT_VERSION = 1
+
+# Per-case trajectory CSVs migrated into the store
+# (file, country, provenance); country None means the file has a Country column
+CSV_SOURCES = (
+    ('colombia_constitutional_fitness.csv', 'Colombia', ESTIMATION),
+    ('colombia_cli_trajectory.csv', 'Colombia', ESTIMATION),
+    ('colombia_fsi_trajectory.csv', 'Colombia', ESTIMATION),
+    ('colombia_sp_trajectory.csv', 'Colombia', ESTIMATION),
+    ('chile_constitutional_fitness.csv', None, PROJECTION),
+    ('argentina_cf_trajectory.csv', 'Argentina', ESTIMATION),
+    ('argentina_reform_history.csv', 'Argentina', ESTIMATION)
+)
+
+
+def write_store(long_df, path=STORE_DIR, sources=None):
+    """
+    Write a long-format panel to a columnar store
+
+    Args:
+        long_df: DataFrame with Country, Year, Metric, Provenance, Value
+        path: Store directory (created if missing, files overwritten)
+        sources: Optional {file name: sha256} of the inputs, recorded in
+                 the manifest (see source_hashes)
+
+    Returns:
+        Path to the store directory
+
+    Raises:
+        ValueError: if rows for the same (country, year, metric) differ in
+                    value or provenance (exact repeats are dropped)
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    df = long_df[list(KEY_COLUMNS) + ['Value']].drop_duplicates()
+    conflicts = df[df.duplicated(subset=['Country', 'Year', 'Metric'], keep=False)]
+    if len(conflicts):
+        raise ValueError(
+            f"{len(conflicts)} conflicting rows for the same country, year and metric:\n"
+            f"{conflicts.sort_values(['Metric', 'Country', 'Year']).head(6).to_string(index=False)}"
+        )
+
+    dictionaries = {}
+    codes = {}
+    for name in DICTIONARY_COLUMNS:
+        categorical = pd.Categorical(df[name].astype(str))
+        dictionaries[name] = list(categorical.categories)
+        codes[name] = categorical.codes.astype(COLUMN_DTYPES[name])
+
+    columns = {
+        'Country': codes['Country'],
+        'Year': df['Year'].to_numpy().astype(COLUMN_DTYPES['Year']),
+        'Metric': codes['Metric'],
+        'Provenance': codes['Provenance'],
+        'Value': df['Value'].to_numpy(dtype=COLUMN_DTYPES['Value'])
+    }
+
+    order = np.lexsort((columns['Year'], columns['Country'], columns['Metric']))
+    columns = {name: values[order] for name, values in columns.items()}
+
+    # Row groups: contiguous (metric, country) runs
+    group_key = columns['Metric'].astype(np.int64) << 16 | columns['Country'].astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, group_key[1:] != group_key[:-1]])
+    stops = np.r_[starts[1:], len(group_key)]
+    row_groups = [
+        {
+            'metric': int(columns['Metric'][s]),
+            'country': int(columns['Country'][s]),
+            'start': int(s),
+            'stop': int(e),
+            'year_min': int(columns['Year'][s:e].min()),
+            'year_max': int(columns['Year'][s:e].max())
+        }
+        for s, e in zip(starts, stops)
+    ]
+
+    for name, values in columns.items():
+        np.save(path / f'{name}.npy', np.ascontiguousarray(values))
+
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'n_rows': int(len(order)),
+        'columns': {name: np.dtype(dtype).str for name, dtype in COLUMN_DTYPES.items()},
+        'dictionaries': dictionaries,
+        'row_groups': row_groups,
+        'sources': sources
+    }
+    with open(path / 'manifest.json', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+
+    return path
+
+
+class PanelStore:
+    """
+    Read-only view of a columnar panel store
+
+    Columns are memory-mapped lazily on first access. scan() prunes row
+    groups using manifest statistics before touching any column data.
+    """
+
+    def __init__(self, path=STORE_DIR):
+        self.path = Path(path)
+        with open(self.path / 'manifest.json', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest['format_version'] != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported panel store format {self.manifest['format_version']} "
+                f"(expected {FORMAT_VERSION})"
+            )
+        self.dictionaries = self.manifest['dictionaries']
+        self._codes = {
+            name: {label: i for i, label in enumerate(labels)}
+            for name, labels in self.dictionaries.items()
+        }
+        self._columns = {}
+
+    def __len__(self):
+        return self.manifest['n_rows']
+
+    @property
+    def countries(self):
+        return list(self.dictionaries['Country'])
+
+    @property
+    def metrics(self):
+        return list(self.dictionaries['Metric'])
+
+    def column(self, name):
+        """Zero-copy, read-only memmap of a full column (codes for key columns)"""
+        if name not in self._columns:
+            self._columns[name] = np.load(self.path / f'{name}.npy', mmap_mode='r')
+        return self._columns[name]
+
+    def _encode(self, name, labels):
+        if labels is None:
+            return None
+        if isinstance(labels, str):
+            labels = [labels]
+        return {self._codes[name][label] for label in labels if label in self._codes[name]}
+
+    def row_groups(self, metric=None, country=None, years=None):
+        """Row groups that may contain matches, using manifest statistics only"""
+        metric_codes = self._encode('Metric', metric)
+        country_codes = self._encode('Country', country)
+        selected = []
+        for group in self.manifest['row_groups']:
+            if metric_codes is not None and group['metric'] not in metric_codes:
+                continue
+            if country_codes is not None and group['country'] not in country_codes:
+                continue
+            if years is not None and (group['year_max'] < years[0] or group['year_min'] > years[1]):
+                continue
+            selected.append(group)
+        return selected
+
+    def scan(self, metric=None, country=None, years=None, provenance=None, decode=True):
+        """
+        Filtered read with predicate pushdown
+
+        Args:
+            metric, country, provenance: Label or list of labels (None = all)
+            years: Inclusive (first, last) year range (None = all)
+            decode: Return string labels instead of dictionary codes
+
+        Returns:
+            Long DataFrame with Country, Year, Metric, Provenance, Value
+        """
+        groups = self.row_groups(metric=metric, country=country, years=years)
+        if not groups:
+            return pd.DataFrame(columns=list(KEY_COLUMNS) + ['Value'])
+
+        index = np.concatenate([np.arange(g['start'], g['stop']) for g in groups])
+        data = {name: self.column(name)[index] for name in COLUMN_DTYPES}
+
+        mask = np.ones(len(index), dtype=bool)
+        if years is not None:
+            mask &= (data['Year'] >= years[0]) & (data['Year'] <= years[1])
+        provenance_codes = self._encode('Provenance', provenance)
+        if provenance_codes is not None:
+            mask &= np.isin(data['Provenance'], list(provenance_codes))
+        data = {name: values[mask] for name, values in data.items()}
+
+        if decode:
+            for name in DICTIONARY_COLUMNS:
+                data[name] = np.asarray(self.dictionaries[name], dtype=object)[data[name]]
+        return pd.DataFrame(data, columns=list(KEY_COLUMNS) + ['Value'])
+
+    def series(self, country, metric):
+        """
+        (years, values) for one country and metric as zero-copy memmap slices
+
+        Row groups are sorted by year, so a single group is one contiguous run.
+        """
+        groups = self.row_groups(metric=metric, country=country)
+        if not groups:
+            raise KeyError(f"No data for country={country!r}, metric={metric!r}")
+        start, stop = groups[0]['start'], groups[0]['stop']
+        return self.column('Year')[start:stop], self.column('Value')[start:stop]
+
+    def frame(self, country, metrics=None):
+        """Wide DataFrame (Year + one column per metric) for one country"""
+        long_df = self.scan(metric=metrics, country=country)
+        wide = long_df.pivot(index='Year', columns='Metric', values='Value')
+        if metrics is not None:
+            wide = wide[[m for m in metrics if m in wide.columns]]
+        wide.columns.name = None
+        return wide.reset_index()
+
+
+def open_store(path=STORE_DIR):
+    """Open an existing panel store"""
+    return PanelStore(path)
+
+
+def csv_to_long(csv_path, country=None, provenance=ESTIMATION):
+    """
+    Convert one per-case results CSV to long format
+
+    Every numeric column other than Year becomes a metric.
+    """
+    df = pd.read_csv(csv_path)
+    if country is not None:
+        df['Country'] = country
+    metrics = [c for c in df.select_dtypes('number').columns if c != 'Year']
+    long_df = df.melt(id_vars=['Country', 'Year'], value_vars=metrics,
+                      var_name='Metric', value_name='Value')
+    long_df['Provenance'] = provenance
+    return long_df
+
+
+def source_hashes(results_dir=RESULTS_DIR, sources=CSV_SOURCES):
+    """{file name: sha256} of the per-case CSVs present in results_dir"""
+    results_dir = Path(results_dir)
+    return {
+        name: hashlib.sha256((results_dir / name).read_bytes()).hexdigest()
+        for name, _, _ in sources
+        if (results_dir / name).exists()
+    }
+
+
+def build_store_from_csv(results_dir=RESULTS_DIR, path=STORE_DIR, sources=CSV_SOURCES):
+    """Parse the per-case CSVs once and write them into a single store"""
+    results_dir = Path(results_dir)
+    hashes = source_hashes(results_dir, sources)
+    frames = [
+        csv_to_long(results_dir / name, country, provenance)
+        for name, country, provenance in sources
+        if name in hashes
+    ]
+    return write_store(pd.concat(frames, ignore_index=True), path, sources=hashes)
+
+
+def current_store(path=STORE_DIR, results_dir=RESULTS_DIR, sources=CSV_SOURCES, build=False):
+    """
+    Open the store built from the per-case CSVs, rebuilding it first if
+    the CSVs changed since it was written
+
+    Args:
+        build: Also build the store if it does not exist yet
+
+    Returns:
+        PanelStore, or None if the store is not built and build is False
+    """
+    path = Path(path)
+    if not (path / 'manifest.json').exists():
+        if not build:
+            return None
+        build_store_from_csv(results_dir, path, sources)
+        return open_store(path)
+    store = open_store(path)
+    if store.manifest.get('sources') != source_hashes(results_dir, sources):
+        build_store_from_csv(results_dir, path, sources)
+        store = open_store(path)
+    return store
+
+
+if __name__ == "__main__":
+    print("="*70)
+    print("PANEL STORE: BUILD FROM DATA/analysis_results")
+    print("="*70)
+
+    store_path = build_store_from_csv()
+    store = open_store(store_path)
+
+    print(f"\nStore: {store_path}")
+    print(f"Rows: {len(store):,}")
+    print(f"Countries: {', '.join(store.countries)}")
+    print(f"Metrics: {', '.join(store.metrics)}")
+    print(f"Row groups: {len(store.manifest['row_groups'])}")
+
+    print("\nExample scan: CF for all countries, 2000-2025")
+    print(store.scan(metric='CF', years=(2000, 2025)).to_string(index=False))
+    print("="*70)
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Poll Ingest: Streaming survey-weighted Selection Pressure components
+Derives the popular_support and elite_support inputs of
+calculate_selection_pressure_chile_2022 / _colombia from respondent-level
+poll files (CEP, CADEM, approval surveys) instead of hand-typed aggregates
+
+Files are read in chunks (only the needed columns, compact dtypes). Each
+chunk is reduced per (country, month, group) to weighted moment summaries
+    Σw, Σw², weighted mean, weighted M2, n
+which are merged into the running totals with the weighted Chan et al.
+update. Memory is bounded by the chunk size plus one row per key, so
+archives of tens of millions of respondents never sit in one DataFrame.
+
+Outputs per country-month:
+    Popular_Support / Elite_Support   weighted share supporting
+    *_SE                              standard error with Kish effective n
+    *_N, *_Neff                       respondents and effective sample size
+    SP                                (Popular + Elite + Institutional_Fit) / 3
+                                      when an institutional fit is supplied
+
+Usage:
+    python poll_ingest.py survey1.csv [survey2.csv ...]
+    python poll_ingest.py               # synthetic 5M-respondent demo file
+
+Author: Ignacio Adrián Lerer
+Date: November 2025
+License: CC-BY 4.0
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+VERIFIED = "[Verificado]"
+ESTIMATION = "[Estimación]"
+
+CHUNK_SIZE = 1_000_000
+
+KEY = ['Country', 'Month', 'Group']
+STATS = ['W', 'W2', 'Mean', 'M2', 'N']
+
+# Default response coding: 1 = supports the constitutional project
+SUPPORT_CODES = {
+    'apruebo': 1.0, 'rechazo': 0.0,
+    'approve': 1.0, 'disapprove': 0.0,
+    'yes': 1.0, 'no': 0.0, 'si': 1.0, 'sí': 1.0,
+    '1': 1.0, '0': 0.0
+}
+
+# Respondent groups (elite = political/business/judicial leaders panel)
+GROUPS = ('popular', 'elite')
+
+
+def chunk_moments(chunk):
+    """
+    Weighted moment summary per key for one chunk
+
+    Args:
+        chunk: DataFrame with Country, Month, Group, Weight, Value
+
+    Returns:
+        DataFrame indexed by KEY with W, W2, Mean, M2, N
+    """
+    w = chunk['Weight'].to_numpy(np.float64)
+    x = chunk['Value'].to_numpy(np.float64)
+    frame = chunk[KEY].assign(W=w, W2=w * w, WX=w * x, WXX=w * x * x, N=1)
+    sums = frame.groupby(KEY, observed=True, sort=False)[['W', 'W2', 'WX', 'WXX', 'N']].sum()
+    mean = sums['WX'] / sums['W']
+    # Within-chunk M2 = Σw x² - W mean² (chunk sums are small enough in
+    # magnitude that cancellation is not a concern for 0/1 or Likert data)
+    m2 = np.maximum(sums['WXX'] - sums['W'] * mean * mean, 0.0)
+    return pd.DataFrame({'W': sums['W'], 'W2': sums['W2'], 'Mean': mean, 'M2': m2, 'N': sums['N']})
+
+
+def merge_moments(a, b):
+    """Combine two moment tables (weighted Chan et al. parallel update)"""
+    if a is None:
+        return b
+    index = a.index.union(b.index)
+    a = a.reindex(index)
+    b = b.reindex(index)
+    wa, wb = a['W'].fillna(0.0), b['W'].fillna(0.0)
+    ma, mb = a['Mean'].fillna(0.0), b['Mean'].fillna(0.0)
+    w = wa + wb
+    delta = mb - ma
+    mean = ma + delta * wb / w
+    m2 = a['M2'].fillna(0.0) + b['M2'].fillna(0.0) + delta * delta * wa * wb / w
+    return pd.DataFrame({
+        'W': w,
+        'W2': a['W2'].fillna(0.0) + b['W2'].fillna(0.0),
+        'Mean': mean,
+        'M2': m2,
+        'N': (a['N'].fillna(0) + b['N'].fillna(0)).astype(np.int64)
+    })
+
+
+def _categorical_map(series, func):
+    """
+    Apply a transform to the distinct values of a column only
+
+    Poll answers, dates and groups repeat heavily, so the transform runs on
+    a few categories instead of millions of rows. Returns a Categorical
+    (missing inputs or outputs become NaN).
+    """
+    cat = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype('category')
+    mapped = func(pd.Series(cat.cat.categories))
+    new_codes, uniques = pd.factorize(mapped, use_na_sentinel=True)
+    codes = cat.cat.codes.to_numpy()
+    new_codes = np.append(new_codes, -1)    # code -1 (missing input) stays missing
+    return pd.Categorical.from_codes(new_codes[codes], categories=uniques)
+
+
+def _normalize(chunk, columns, support_codes, elite_values):
+    """Map raw columns to Country, Month, Group, Weight, Value; drop non-answers"""
+    raw = chunk[columns['support']]
+    if pd.api.types.is_numeric_dtype(raw.dtype):
+        value = raw.to_numpy(dtype=np.float64)
+    else:
+        value = np.asarray(_categorical_map(
+            raw, lambda u: u.astype(str).str.strip().str.lower().map(support_codes)), dtype=np.float64)
+
+    if columns.get('date') is not None:
+        month = _categorical_map(chunk[columns['date']], lambda u: pd.to_datetime(
+            u, errors='coerce').dt.strftime('%Y-%m'))
+    else:
+        month = pd.Categorical(chunk[columns['year']].astype(int).astype(str) + '-' +
+                               chunk[columns['month']].astype(int).astype(str).str.zfill(2))
+
+    if columns.get('group') is not None:
+        group = _categorical_map(chunk[columns['group']], lambda u: u.astype(str).str.strip()
+                                 .str.lower().isin(elite_values).map({True: 'elite', False: 'popular'}))
+        # Respondents without a group label belong to the general public
+        group = pd.Categorical(group, categories=list(GROUPS)).fillna('popular')
+    else:
+        group = pd.Categorical(np.full(len(chunk), 'popular'))
+
+    weight = chunk[columns['weight']].to_numpy(dtype=np.float64) if columns.get('weight') else 1.0
+    out = pd.DataFrame({
+        'Country': _categorical_map(chunk[columns['country']], lambda u: u.astype(str)),
+        'Month': month,
+        'Group': group,
+        'Weight': weight,
+        'Value': value
+    })
+    keep = out['Value'].notna() & out['Month'].notna() & (out['Weight'] > 0)
+    return out[keep]
+
+
+def ingest(paths, country='country', date='date', year=None, month=None, weight='weight',
+           support='support', group='group', elite_values=('elite',), support_codes=SUPPORT_CODES,
+           numeric_support=False, chunk_size=CHUNK_SIZE):
+    """
+    Stream respondent-level poll files into weighted moments per key
+
+    Args:
+        paths: CSV file path(s); may be compressed (.gz, .zip, ...)
+        country, date, weight, support, group: Column names (date may be
+            replaced by year + month; weight and group may be None;
+            respondents with a missing group count as popular)
+        elite_values: Values of the group column marking elite respondents
+        support_codes: Mapping of text answers to 0/1 (unmapped answers,
+            e.g. "don't know", are excluded)
+        numeric_support: Support is already numeric (0/1 or a scale); used as is
+        chunk_size: Rows per chunk
+
+    Returns:
+        DataFrame indexed by (Country, Month, Group) with W, W2, Mean, M2, N
+    """
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+    columns = {'country': country, 'date': date, 'year': year, 'month': month,
+               'weight': weight, 'support': support, 'group': group}
+    usecols = [c for c in columns.values() if c is not None]
+    elite_values = {str(v).lower() for v in elite_values}
+    codes = {str(k).lower(): v for k, v in support_codes.items()}
+
+    totals = None
+    for path in paths:
+        # Label columns are parsed straight into categoricals
+        labels = {c: 'category' for c in (country, date, group) if c is not None}
+        if not numeric_support:
+            labels[support] = 'category'
+        reader = pd.read_csv(path, usecols=usecols, chunksize=chunk_size, dtype=labels)
+        for chunk in reader:
+            chunk = _normalize(chunk, columns, codes, elite_values)
+            if len(chunk):
+                totals = merge_moments(totals, chunk_moments(chunk))
+    if totals is None:
+        return pd.DataFrame(columns=STATS, index=pd.MultiIndex.from_tuples([], names=KEY))
+    # Plain string keys (chunks used categoricals with differing categories)
+    totals = totals.reset_index().astype({name: str for name in KEY})
+    return totals.set_index(KEY).sort_index()
+
+
+def selection_pressure_components(moments, institutional_fit=None):
+    """
+    Country-month SP components from ingested moments
+
+    Args:
+        moments: Output of ingest()
+        institutional_fit: Optional scalar or dict country → value; when
+            given, SP = (Popular + Elite + Institutional_Fit) / 3
+
+    Returns:
+        DataFrame with Country, Month, {Popular,Elite}_{Support,SE,N,Neff},
+        Institutional_Fit and SP
+    """
+    m = moments.copy()
+    neff = m['W'] ** 2 / m['W2']
+    variance = m['M2'] / m['W']
+    m['Support'] = m['Mean']
+    m['SE'] = np.sqrt(variance / neff)
+    m['Neff'] = neff
+    m['N'] = m['N'].astype(int)
+
+    wide = m[['Support', 'SE', 'N', 'Neff']].unstack('Group')
+    wide.columns = [f"{g.capitalize()}_{stat}" for stat, g in wide.columns]
+    wide = wide.reset_index()
+    for g in GROUPS:
+        for stat in ('Support', 'SE', 'N', 'Neff'):
+            if f'{g.capitalize()}_{stat}' not in wide:
+                wide[f'{g.capitalize()}_{stat}'] = np.nan
+
+    if isinstance(institutional_fit, dict):
+        wide['Institutional_Fit'] = wide['Country'].map(institutional_fit)
+    else:
+        wide['Institutional_Fit'] = institutional_fit if institutional_fit is not None else np.nan
+    wide['SP'] = (wide['Popular_Support'] + wide['Elite_Support'] + wide['Institutional_Fit']) / 3
+    ordered = ['Country', 'Month'] + [f'{g.capitalize()}_{s}' for g in GROUPS
+                                      for s in ('Support', 'SE', 'N', 'Neff')]
+    return wide[ordered + ['Institutional_Fit', 'SP']]
+
+
+def simulate_poll_file(path, n_rows, seed=None, chunk_size=CHUNK_SIZE):
+    """
+    Write a synthetic respondent-level file (Chile 2022 / Colombia 2025)
+
+    Popular support for Chile 2022-09 is centred on the official 38.14%
+    Apruebo, elite support on 33%; answers include "No sabe" non-responses.
+    """
+    rng = np.random.default_rng(seed)
+    setups = [
+        ('Chile', '2022-09-04', 0.3814, 0.33),
+        ('Chile', '2022-08-15', 0.40, 0.34),
+        ('Colombia', '2025-06-15', 0.52, 0.50)
+    ]
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('country,date,weight,group,support\n')
+        written = 0
+        while written < n_rows:
+            n = min(chunk_size, n_rows - written)
+            which = rng.integers(len(setups), size=n)
+            elite = rng.random(n) < 0.05
+            p = np.choose(which, [np.where(elite, s[3], s[2]) for s in setups])
+            # Lognormal design weights (Kish n_eff ≈ 85% of n)
+            weight = rng.lognormal(0.0, 0.4, n)
+            answer = np.where(rng.random(n) < p, 'Apruebo', 'Rechazo')
+            answer = np.where(rng.random(n) < 0.04, 'No sabe', answer)
+            pd.DataFrame({
+                'country': np.array([s[0] for s in setups])[which],
+                'date': np.array([s[1] for s in setups])[which],
+                'weight': np.round(weight, 4),
+                'group': np.where(elite, 'elite', 'public'),
+                'support': answer
+            }).to_csv(f, header=False, index=False)
+            written += n
+    return path
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    print("="*70)
+    print("POLL MICRODATA INGESTION: SELECTION PRESSURE COMPONENTS")
+    print("="*70)
+
+    if len(sys.argv) > 1:
+        paths = sys.argv[1:]
+        tag = VERIFIED
+    else:
+        paths = [Path(tempfile.gettempdir()) / 'ept_synthetic_polls.csv']
+        if not paths[0].exists():
+            print("\nWriting synthetic 5,000,000-respondent file...")
+            simulate_poll_file(paths[0], 5_000_000, seed=2022)
+        tag = ESTIMATION
+
+    start = time.perf_counter()
+    moments = ingest(paths)
+    elapsed = time.perf_counter() - start
+    n = int(moments['N'].sum())
+    print(f"\nIngested {n:,} valid responses from {len(paths)} file(s) in {elapsed:.1f} s "
+          f"({n / elapsed / 1e6:.1f} M rows/s)")
+
+    components = selection_pressure_components(moments, institutional_fit={'Chile': 0.20, 'Colombia': 0.50})
+    print("\nSelection Pressure components per country-month:")
+    print(components.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+
+    print(f"\n{tag} - Survey-weighted; SE uses Kish effective sample size")
+    print("="*70)
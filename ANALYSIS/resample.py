@@ -0,0 +1,269 @@
+"""
+RESAMPLE: Lazy annual (or finer) resampling of sparse metric trajectories
+Puts Colombia's 5-year grid and Argentina's irregular years on a common
+time base for cross-country joins and animations
+
+Series are resampled on first access only and cached:
+    - the fitted interpolator per (country, metric) is kept, so evaluating
+      arbitrary years later needs no refit
+    - materialized grids are held in a bounded LRU cache, so walking many
+      countries × metrics never keeps every grid in memory at once
+
+Methods:
+    linear  np.interp between observations
+    pchip   shape-preserving cubic (no overshoot; keeps monotone CLI monotone)
+    spline  cubic spline (not-a-knot); falls back to linear below 4 points
+
+Values outside a series' observed years are NaN unless extrapolate=True.
+
+Author: Adrian Lerer
+Date: November 2025
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from scipy.interpolate import CubicSpline, PchipInterpolator
+
+from panel_store import CSV_SOURCES, RESULTS_DIR, csv_to_long, current_store
+
+ESTIMATION = "[Estimación]"
+
+METHODS = ('linear', 'pchip', 'spline')
+
+# Materialized grids kept in memory (interpolators are always kept)
+MAX_CACHED_GRIDS = 256
+
+
+class _Linear:
+    """np.interp with the same call signature as the scipy interpolators"""
+
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+    def __call__(self, t, extrapolate=False):
+        t = np.asarray(t, dtype=np.float64)
+        if not extrapolate or len(self.x) < 2:
+            return np.interp(t, self.x, self.y)
+        slope_lo = (self.y[1] - self.y[0]) / (self.x[1] - self.x[0])
+        slope_hi = (self.y[-1] - self.y[-2]) / (self.x[-1] - self.x[-2])
+        out = np.interp(t, self.x, self.y)
+        out = np.where(t < self.x[0], self.y[0] + slope_lo * (t - self.x[0]), out)
+        return np.where(t > self.x[-1], self.y[-1] + slope_hi * (t - self.x[-1]), out)
+
+
+def fit_interpolator(years, values, method='linear'):
+    """
+    Interpolator for one observed series (NaNs dropped, duplicate years averaged)
+
+    Returns:
+        Callable f(t, extrapolate) plus the observed (first, last) year
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}, got {method!r}")
+    s = pd.Series(np.asarray(values, dtype=np.float64), index=np.asarray(years, dtype=np.float64))
+    s = s.dropna().groupby(level=0).mean()
+    x, y = s.index.to_numpy(), s.to_numpy()
+    if len(x) == 0:
+        raise ValueError("series has no observations")
+
+    if method == 'pchip' and len(x) >= 2:
+        interp = PchipInterpolator(x, y, extrapolate=True)
+        func = lambda t, extrapolate=False: interp(t)
+    elif method == 'spline' and len(x) >= 4:
+        interp = CubicSpline(x, y, extrapolate=True)
+        func = lambda t, extrapolate=False: interp(t)
+    else:
+        func = _Linear(x, y)
+    return func, (x[0], x[-1])
+
+
+class Resampler:
+    """
+    Lazy, cached resampling over a source of (years, values) series
+
+    Args:
+        loader: Callable (country, metric) → (years, values)
+        keys: Iterable of available (country, metric) pairs
+        method: 'linear', 'pchip' or 'spline'
+        step: Grid spacing in years (1.0 = annual, 0.25 = quarterly)
+        extrapolate: Evaluate outside the observed range instead of NaN
+        max_cached: LRU bound on materialized grids
+    """
+
+    def __init__(self, loader, keys, method='linear', step=1.0, extrapolate=False,
+                 max_cached=MAX_CACHED_GRIDS):
+        if method not in METHODS:
+            raise ValueError(f"method must be one of {METHODS}, got {method!r}")
+        self._loader = loader
+        self._key_set = frozenset(keys)      # membership tests
+        self.keys = sorted(self._key_set)
+        self.method = method
+        self.step = float(step)
+        self.extrapolate = extrapolate
+        self.max_cached = max_cached
+        self._interpolators = {}
+        self._grids = OrderedDict()
+        self.stats = {'fits': 0, 'grid_hits': 0, 'grid_misses': 0}
+
+    @classmethod
+    def from_long(cls, df, **kwargs):
+        """From a long DataFrame with Country, Year, Metric, Value"""
+        groups = {key: group for key, group in df.groupby(['Country', 'Metric'], sort=False)}
+
+        def loader(country, metric):
+            group = groups[(country, metric)]
+            return group['Year'].to_numpy(), group['Value'].to_numpy()
+        return cls(loader, groups, **kwargs)
+
+    @classmethod
+    def from_store(cls, store, **kwargs):
+        """From a PanelStore (series are read as memmap slices on demand)"""
+        countries, metrics = store.dictionaries['Country'], store.dictionaries['Metric']
+        keys = [(countries[g['country']], metrics[g['metric']]) for g in store.row_groups()]
+        return cls(store.series, keys, **kwargs)
+
+    @property
+    def countries(self):
+        return sorted({country for country, _ in self.keys})
+
+    @property
+    def metrics(self):
+        return sorted({metric for _, metric in self.keys})
+
+    def interpolator(self, country, metric):
+        """Fitted interpolator and observed year range (fitted once)"""
+        key = (country, metric)
+        if key not in self._interpolators:
+            if key not in self._key_set:
+                raise KeyError(f"No data for country={country!r}, metric={metric!r}")
+            years, values = self._loader(country, metric)
+            self._interpolators[key] = fit_interpolator(years, values, self.method)
+            self.stats['fits'] += 1
+        return self._interpolators[key]
+
+    def at(self, country, metric, years):
+        """Evaluate a series at arbitrary years (no grid is cached)"""
+        func, (first, last) = self.interpolator(country, metric)
+        years = np.asarray(years, dtype=np.float64)
+        values = np.asarray(func(years, self.extrapolate), dtype=np.float64)
+        if not self.extrapolate:
+            values = np.where((years >= first) & (years <= last), values, np.nan)
+        return values
+
+    def grid(self, first, last):
+        """Regular grid from first to last inclusive at self.step"""
+        n = int(np.floor((last - first) / self.step + 1e-9)) + 1
+        return first + self.step * np.arange(n)
+
+    def series(self, country, metric):
+        """
+        (grid, values) over the series' own observed range, cached (LRU)
+
+        Returned arrays are read-only views of the cached grid.
+        """
+        key = (country, metric)
+        if key in self._grids:
+            self._grids.move_to_end(key)
+            self.stats['grid_hits'] += 1
+            return self._grids[key]
+
+        self.stats['grid_misses'] += 1
+        _, (first, last) = self.interpolator(country, metric)
+        years = self.grid(np.ceil(first / self.step) * self.step, last)
+        values = self.at(country, metric, years)
+        years.flags.writeable = False
+        values.flags.writeable = False
+        self._grids[key] = (years, values)
+        if len(self._grids) > self.max_cached:
+            self._grids.popitem(last=False)
+        return years, values
+
+    def _on_grid(self, country, metric, grid):
+        """
+        Series values on a grid of multiples of self.step, copied from the
+        cached series() grid (evaluated directly when extrapolating, since
+        the cached grid covers only the observed range)
+        """
+        if self.extrapolate:
+            return self.at(country, metric, grid)
+        years, values = self.series(country, metric)
+        out = np.full(len(grid), np.nan)
+        if len(years) and len(grid):
+            offset = int(round((years[0] - grid[0]) / self.step))
+            lo, hi = max(offset, 0), min(offset + len(years), len(grid))
+            if lo < hi:
+                out[lo:hi] = values[lo - offset:hi - offset]
+        return out
+
+    def frame(self, countries=None, metrics=None, years=None):
+        """
+        Long DataFrame on a common time base, assembled from the cached
+        series grids
+
+        Args:
+            countries, metrics: Subsets (default: all available pairs)
+            years: (first, last) range of the common grid (default: the
+                   union of the selected series' ranges)
+
+        Returns:
+            DataFrame with Country, Year and one column per metric
+        """
+        countries = self.countries if countries is None else list(countries)
+        metrics = self.metrics if metrics is None else list(metrics)
+        keys = [(c, m) for c in countries for m in metrics if (c, m) in self._key_set]
+        if years is None:
+            ranges = [self.interpolator(c, m)[1] for c, m in keys]
+            years = (min(r[0] for r in ranges), max(r[1] for r in ranges))
+        grid = self.grid(np.ceil(years[0] / self.step) * self.step, years[1])
+
+        frames = []
+        for country in countries:
+            data = {'Country': country, 'Year': grid.astype(int) if self.step.is_integer() else grid}
+            for metric in metrics:
+                if (country, metric) in self._key_set:
+                    data[metric] = self._on_grid(country, metric, grid)
+            if len(data) > 2:
+                frames.append(pd.DataFrame(data))
+        return pd.concat(frames, ignore_index=True)
+
+    def clear_cache(self):
+        self._interpolators.clear()
+        self._grids.clear()
+
+
+def default_resampler(**kwargs):
+    """Resampler over the panel store (rebuilt if its CSVs changed), or over the per-case CSVs if not built"""
+    store = current_store()
+    if store is not None:
+        return Resampler.from_store(store, **kwargs)
+    frames = [
+        csv_to_long(RESULTS_DIR / name, country, provenance)
+        for name, country, provenance in CSV_SOURCES
+        if (RESULTS_DIR / name).exists()
+    ]
+    return Resampler.from_long(pd.concat(frames, ignore_index=True), **kwargs)
+
+
+if __name__ == "__main__":
+    print("="*70)
+    print("LAZY ANNUAL RESAMPLING: COMMON TIME BASE")
+    print("="*70)
+
+    for method in METHODS:
+        resampler = default_resampler(method=method)
+        df = resampler.frame(['Colombia', 'Argentina'], ['CF', 'CLI'], years=(1991, 2025))
+        sample = df[df['Year'].isin([1991, 1993, 2007, 2023])]
+        print(f"\n{method.upper()} (annual, 1991-2025):")
+        print(sample.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+        print(f"  Interpolators fitted: {resampler.stats['fits']}")
+
+    resampler = default_resampler(method='pchip', step=0.25)
+    years, values = resampler.series('Argentina', 'CF')
+    resampler.series('Argentina', 'CF')
+    print(f"\nQuarterly Argentina CF: {len(years)} points "
+          f"({years[0]:.2f}-{years[-1]:.2f}), cache {resampler.stats}")
+
+    print(f"\n{ESTIMATION} - Interpolated between estimated observations")
+    print("="*70)
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Scenario Grid: Streaming counterfactual surface for the Chile 2022 projection
+Replaces the single guesses in calculate_phenotypic_expression_projected and
+calculate_fiscal_gap_projected (institutions 0.15, budget 0.20, fiscal space
+2.5% GDP, ...) with the full Cartesian product of component ranges
+
+The product (10^8+ scenarios) is never materialized. Flat scenario indices
+are processed in cache-sized chunks: each chunk is unravelled into per-axis
+level indices, pushed through monte_carlo_cf.chile_2022_model and scored,
+then reduced into
+    - streaming histograms + moments of SP, CLI, Gap, CD, PE and CF
+    - scenario counts per CF interpretation band
+    - per-axis marginals: for every level of every axis, the number of
+      scenarios whose CF exceeds each threshold (band edges by default)
+and discarded. Reductions are checkpointed to disk every few hundred chunks
+so an interrupted run resumes where it stopped.
+
+Usage:
+    python scenario_grid.py                 # 21 levels × 6 axes ≈ 8.6e7 scenarios
+    python scenario_grid.py --levels 11     # coarser grid
+    python scenario_grid.py --no-resume     # ignore an existing checkpoint
+
+Author: Ignacio Adrián Lerer
+Date: November 2025
+License: CC-BY 4.0
+"""
+
+import argparse
+import hashlib
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cf_engine import CF_BAND_EDGES, CF_BAND_LABELS, COMPONENTS, classify_cf, constitutional_fitness
+from monte_carlo_cf import CHILE_2022_INPUTS, StreamingSummary, chile_2022_model
+
+PROJECTION = "[Proyección]"
+
+OUTPUT_DIR = Path(__file__).resolve().parent.parent / 'OUTPUTS' / 'scenario_grid'
+
+# Scenarios per chunk: ~20 float64 columns × 32k rows stays within L2/L3
+CHUNK_SIZE = 1 << 15
+
+# Chunks between checkpoints
+CHECKPOINT_EVERY = 256
+
+METRICS = COMPONENTS + ('CF',)
+
+
+def nominal_inputs(inputs=CHILE_2022_INPUTS):
+    """Point estimates of the Monte Carlo input specs"""
+    return {name: spec[1] if spec[0] == 'fixed' else spec[2] for name, spec in inputs.items()}
+
+
+def chile_2022_axes(levels=21):
+    """
+    Default counterfactual axes (levels points each)
+
+    The four projected PE components, fiscal space and promised ESR cost,
+    i.e. every single guess behind the projected PE and fiscal gap.
+    """
+    return {
+        'institutions': np.linspace(0.0, 0.60, levels),
+        'budget': np.linspace(0.0, 0.60, levels),
+        'enforcement': np.linspace(0.0, 0.50, levels),
+        'behavior': np.linspace(0.0, 0.40, levels),
+        'fiscal_space': np.linspace(0.0, 8.0, levels),
+        'promised_esr_cost': np.linspace(8.0, 18.0, levels)
+    }
+
+
+def _new_summaries():
+    # Fixed ranges so every chunk (and every resumed run) shares the bins
+    summaries = {name: StreamingSummary(0.0, 1.0) for name in COMPONENTS}
+    summaries['CF'] = StreamingSummary(1e-6, 10.0, log=True)
+    return summaries
+
+
+def _summary_state(prefix, summary):
+    return {f'{prefix}.{key}': np.asarray(value) for key, value in vars(summary).items()}
+
+
+def _restore_summary(prefix, archive):
+    summary = StreamingSummary.__new__(StreamingSummary)
+    for key in archive.files:
+        if key.startswith(prefix + '.'):
+            value = archive[key]
+            setattr(summary, key[len(prefix) + 1:], value if value.ndim else value.item())
+    return summary
+
+
+class ScenarioGrid:
+    """
+    Cartesian product of input axes with the remaining inputs held fixed
+
+    Args:
+        axes: Dict of input name → 1-D array of levels
+        fixed: Dict of input name → scalar for every non-axis input
+        model: Maps a dict of input arrays to SP, CLI, Gap, CD, PE
+    """
+
+    def __init__(self, axes, fixed=None, model=chile_2022_model):
+        self.axes = {name: np.asarray(levels, dtype=np.float64) for name, levels in axes.items()}
+        fixed = dict(fixed if fixed is not None else nominal_inputs())
+        self.fixed = {name: value for name, value in fixed.items() if name not in self.axes}
+        self.model = model
+        self.shape = tuple(len(levels) for levels in self.axes.values())
+        self.size = int(np.prod(self.shape, dtype=np.int64))
+
+    def signature(self, chunk_size):
+        """Hash identifying the grid (a checkpoint only resumes a matching run)"""
+        digest = hashlib.sha256()
+        for name, levels in self.axes.items():
+            digest.update(name.encode('utf-8'))
+            digest.update(levels.tobytes())
+        digest.update(json.dumps(sorted(self.fixed.items())).encode('utf-8'))
+        digest.update(f'{getattr(self.model, "__qualname__", self.model)}|{chunk_size}'.encode('utf-8'))
+        return digest.hexdigest()
+
+    def chunk(self, start, stop):
+        """Level indices and metric arrays for flat scenarios [start, stop)"""
+        flat = np.arange(start, stop, dtype=np.int64)
+        index = np.unravel_index(flat, self.shape)
+        x = dict(self.fixed)
+        for (name, levels), idx in zip(self.axes.items(), index):
+            x[name] = levels[idx]
+        result = self.model(x)
+        n = stop - start
+        metrics = {name: np.broadcast_to(np.asarray(result[name], dtype=np.float64), (n,))
+                   for name in COMPONENTS}
+        metrics['CF'] = constitutional_fitness(
+            metrics['PE'], metrics['Gap'], metrics['CD'], metrics['SP'], metrics['CLI'])
+        return index, metrics
+
+
+def run_grid(grid, out_dir=OUTPUT_DIR, thresholds=CF_BAND_EDGES, chunk_size=CHUNK_SIZE,
+             checkpoint_every=CHECKPOINT_EVERY, resume=True, progress=None):
+    """
+    Evaluate every scenario of the grid, streaming reductions to disk
+
+    Args:
+        grid: ScenarioGrid
+        out_dir: Directory for checkpoint.npz and the final CSV/JSON outputs
+        thresholds: Ascending CF thresholds counted in the marginals
+        chunk_size: Scenarios per chunk
+        checkpoint_every: Chunks between checkpoint writes
+        resume: Continue from a matching checkpoint if present
+        progress: Optional callable(done, total)
+
+    Returns:
+        Dict with summaries, band_counts, thresholds and marginals
+        (axis → array of shape (levels, len(thresholds) + 1) counting
+        scenarios between consecutive thresholds)
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    checkpoint = out_dir / 'checkpoint.npz'
+    thresholds = np.sort(np.asarray(thresholds, dtype=np.float64))
+    signature = grid.signature(chunk_size) + hashlib.sha256(thresholds.tobytes()).hexdigest()
+    n_bands = len(CF_BAND_LABELS)
+    n_classes = len(thresholds) + 1
+
+    done = 0
+    summaries = _new_summaries()
+    band_counts = np.zeros(n_bands, dtype=np.int64)
+    marginals = {name: np.zeros((len(levels), n_classes), dtype=np.int64)
+                 for name, levels in grid.axes.items()}
+
+    if resume and checkpoint.exists():
+        with np.load(checkpoint) as archive:
+            if str(archive['signature']) == signature:
+                done = int(archive['done'])
+                summaries = {name: _restore_summary(name, archive) for name in METRICS}
+                band_counts = archive['band_counts'].copy()
+                marginals = {name: archive[f'marginal.{name}'].copy() for name in grid.axes}
+
+    def save():
+        state = {'signature': np.asarray(signature), 'done': np.asarray(done),
+                 'band_counts': band_counts}
+        for name, summary in summaries.items():
+            state.update(_summary_state(name, summary))
+        state.update({f'marginal.{name}': counts for name, counts in marginals.items()})
+        tmp = out_dir / 'checkpoint.tmp.npz'
+        np.savez(tmp, **state)
+        tmp.replace(checkpoint)
+
+    n_chunks = 0
+    while done < grid.size:
+        stop = min(done + chunk_size, grid.size)
+        index, metrics = grid.chunk(done, stop)
+        for name, summary in summaries.items():
+            summary.update(metrics[name])
+        band = classify_cf(metrics['CF'])
+        band_counts += np.bincount(band, minlength=n_bands)
+        klass = np.searchsorted(thresholds, metrics['CF'], side='left')
+        for (name, counts), idx in zip(marginals.items(), index):
+            counts += np.bincount(idx * n_classes + klass,
+                                  minlength=counts.size).reshape(counts.shape)
+        done = stop
+        n_chunks += 1
+        if n_chunks % checkpoint_every == 0:
+            save()
+            if progress is not None:
+                progress(done, grid.size)
+    save()
+
+    result = {'summaries': summaries, 'band_counts': band_counts,
+              'thresholds': thresholds, 'marginals': marginals}
+    write_outputs(grid, result, out_dir)
+    return result
+
+
+def marginal_frame(grid, result):
+    """Long DataFrame: P(CF > threshold) over the other axes, per axis level"""
+    rows = []
+    for name, counts in result['marginals'].items():
+        totals = counts.sum(axis=1)
+        # Scenarios above threshold k = counts in classes k+1 and higher
+        above = np.cumsum(counts[:, ::-1], axis=1)[:, ::-1][:, 1:]
+        for level, value in enumerate(grid.axes[name]):
+            row = {'Axis': name, 'Value': value, 'N': int(totals[level])}
+            for t, n_above in zip(result['thresholds'], above[level]):
+                row[f'P(CF > {t:g})'] = n_above / totals[level] if totals[level] else np.nan
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def summary_frame(summaries, qs=(0.05, 0.50, 0.95)):
+    """One row per metric: mean, std, min, max and quantiles"""
+    rows = []
+    for name, summary in summaries.items():
+        row = {'Metric': name, 'Mean': summary.mean, 'Std': summary.std,
+               'Min': summary.min, 'Max': summary.max}
+        for q, value in zip(qs, summary.quantiles(qs)):
+            row[f'q{q*100:g}'] = value
+        rows.append(row)
+    return pd.DataFrame(rows).set_index('Metric')
+
+
+def write_outputs(grid, result, out_dir):
+    """Final reductions: marginals.csv, summary.csv, bands.json"""
+    marginal_frame(grid, result).to_csv(out_dir / 'marginals.csv', index=False)
+    summary_frame(result['summaries']).to_csv(out_dir / 'summary.csv')
+    bands = {label: int(count) for label, count in zip(CF_BAND_LABELS, result['band_counts'])}
+    with open(out_dir / 'bands.json', 'w', encoding='utf-8') as f:
+        json.dump({
+            'n_scenarios': grid.size,
+            'axes': {name: [float(levels[0]), float(levels[-1]), len(levels)]
+                     for name, levels in grid.axes.items()},
+            'thresholds': result['thresholds'].tolist(),
+            'band_counts': bands
+        }, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream the Chile 2022 counterfactual scenario grid')
+    parser.add_argument('--levels', type=int, default=21, help='Levels per axis (default: 21)')
+    parser.add_argument('--thresholds', type=float, nargs='+', default=[0.01, 0.02, 0.05, 0.20],
+                        help='CF thresholds for the marginals (default: 0.01 0.02 0.05 0.20)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--out', type=Path, default=OUTPUT_DIR, help='Output directory')
+    parser.add_argument('--no-resume', action='store_true', help='Ignore an existing checkpoint')
+    args = parser.parse_args()
+
+    print("="*70)
+    print("CHILE 2022 COUNTERFACTUAL SCENARIO GRID")
+    print("="*70)
+
+    grid = ScenarioGrid(chile_2022_axes(args.levels))
+    print(f"\nAxes: {', '.join(f'{n} [{v[0]:g}-{v[-1]:g}]' for n, v in grid.axes.items())}")
+    print(f"Scenarios: {grid.size:,} (never materialized; {args.chunk_size:,} per chunk)")
+
+    start = time.perf_counter()
+    report = lambda done, total: print(f"  {done / total:6.1%}  {done:,}/{total:,}", end='\r')
+    result = run_grid(grid, args.out, args.thresholds, args.chunk_size,
+                      resume=not args.no_resume, progress=report)
+    elapsed = time.perf_counter() - start
+    print(f"\nEvaluated in {elapsed:.1f} s ({grid.size / max(elapsed, 1e-9) / 1e6:.1f} M scenarios/s)")
+
+    print("\nCF bands across the grid:")
+    for label, count in zip(CF_BAND_LABELS, result['band_counts']):
+        print(f"  {label:<26} {count:>14,}  ({count / grid.size:.2%})")
+
+    print("\nMetric distribution over scenarios:")
+    print(summary_frame(result['summaries']).to_string(float_format=lambda v: f"{v:.4f}"))
+
+    marginals = marginal_frame(grid, result)
+    columns = [c for c in marginals.columns if c.startswith('P(')]
+    print("\nThreshold crossings at the lowest → highest level of each axis:")
+    print(f"  {'':<18} " + '  '.join(f'{c:>17}' for c in columns))
+    for name, group in marginals.groupby('Axis', sort=False):
+        cells = [f"{group[c].iloc[0]:6.1%} → {group[c].iloc[-1]:6.1%}" for c in columns]
+        print(f"  {name:<18} " + '  '.join(f'{c:>17}' for c in cells))
+
+    print(f"\nOutputs: {args.out}")
+    print(f"{PROJECTION} - Counterfactual grid; non-axis inputs at chile_h2_analysis estimates")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+SCORE CACHE: Memoized metric scoring for interactive what-if queries
+Bounded LRU cache in front of the SP/CLI/Gap/FSI → CF formulas of the
+Chile, Colombia and Argentina analyses
+
+Keys are quantized: every input is snapped to a grid of `quantum` (default
+1e-6) and the snapped values form the key together with the scorer name.
+Inputs that differ by less than the quantum share an entry, and the value
+is always computed from the snapped inputs, so a hit returns exactly what a
+miss would have computed.
+
+Scorers (SCORERS; arguments default to the case analyses' point estimates):
+    cf            constitutional_fitness(PE, Gap, CD, SP, CLI)
+    sp            (Popular + Elite + Institutional_Fit) / 3
+    cli_chile     cf_engine.CLI_CHILE_WEIGHTS (calculate_cli_chile_trajectory)
+    cli_colombia  cf_engine.CLI_COLOMBIA_WEIGHTS (calculate_cli_colombia_trajectory)
+    gap_chile     monte_carlo_cf.chile_2022_gap (calculate_fiscal_gap_projected)
+    fsi           (Revenue / Spending) × (Debt Capacity / Debt)
+    cf_chile      calculate_constitutional_fitness_chile from the 17 structural
+                  inputs (monte_carlo_cf.chile_2022_model)
+    cf_argentina  calculate_argentina_cf_trajectory (cf_engine.ARGENTINA_SP/_CD)
+    success       Figure 3 logistic success probability
+                  (generate_figure3_threshold.logistic_success_probability:
+                  threshold 0.58, steepness 15), computed without scipy
+
+A hit costs one key build and one OrderedDict lookup (a few microseconds);
+memory is bounded by maxsize entries for the life of the session.
+
+Author: Adrian Lerer
+Date: November 2025
+"""
+
+from collections import OrderedDict
+from functools import partialmethod
+
+import numpy as np
+
+from cf_engine import (ARGENTINA_CD, ARGENTINA_SP, CLI_CHILE_WEIGHTS, CLI_COLOMBIA_WEIGHTS,
+                       constitutional_fitness, weighted_sum)
+from fsi_engine import DEFAULT_DEBT_CAPACITY, fiscal_sustainability
+from monte_carlo_cf import CHILE_2022_INPUTS, chile_2022_gap, chile_2022_model
+
+ESTIMATION = "[Estimación]"
+
+DEFAULT_QUANTUM = 1e-6
+DEFAULT_MAXSIZE = 1 << 16
+
+# Point estimates behind CHILE_2022_INPUTS (mode of each distribution)
+CHILE_2022_POINT = {name: spec[1] if spec[0] == 'fixed' else spec[2]
+                    for name, spec in CHILE_2022_INPUTS.items()}
+
+
+def _selection_pressure(popular_support, elite_support, institutional_fit):
+    return (popular_support + elite_support + institutional_fit) / 3
+
+
+def _cli_chile(**components):
+    return weighted_sum(CLI_CHILE_WEIGHTS, components)
+
+
+def _cli_colombia(**components):
+    return weighted_sum(CLI_COLOMBIA_WEIGHTS, components)
+
+
+def _cf_chile(**inputs):
+    c = chile_2022_model(inputs)
+    return constitutional_fitness(c['PE'], c['Gap'], c['CD'], c['SP'], c['CLI'])
+
+
+def _cf_argentina(cli, gap, pe, sp, cd):
+    return constitutional_fitness(pe, gap, cd, sp, cli)
+
+
+def _success(support, threshold, steepness):
+    # expit(z) = (1 + tanh(z/2)) / 2, without overflow for large |z|
+    return 0.5 * (1.0 + np.tanh(0.5 * steepness * (support - threshold)))
+
+
+# name → (function, ordered argument defaults; None = required)
+SCORERS = {
+    'cf': (constitutional_fitness, {'pe': None, 'gap': None, 'cd': None, 'sp': None, 'cli': None}),
+    'sp': (_selection_pressure, {'popular_support': 0.3814, 'elite_support': 0.33,
+                                 'institutional_fit': 0.20}),
+    'cli_chile': (_cli_chile, {'text_vagueness': 0.85, 'judicial_activism': 0.78,
+                               'treaty_hierarchy': 0.82, 'precedent_weight': 0.68,
+                               'amendment_difficulty': 0.92}),
+    'cli_colombia': (_cli_colombia, {'judicial_lock': 0.42, 'legislative_lock': 0.45,
+                                     'reversal_rate': 0.22, 'path_dependence': 0.75}),
+    'gap_chile': (chile_2022_gap, {name: CHILE_2022_POINT[name] for name in (
+        'promised_esr_cost', 'fiscal_space', 'institutional_gap', 'plurinational_gap',
+        'environmental_gap')}),
+    'fsi': (fiscal_sustainability, {'revenue': 19.7, 'spending': 31.7, 'debt': 72.0,
+                                    'debt_capacity': DEFAULT_DEBT_CAPACITY}),
+    'cf_chile': (_cf_chile, dict(CHILE_2022_POINT)),
+    'cf_argentina': (_cf_argentina, {'cli': 0.87, 'gap': 0.77, 'pe': 0.10, 'sp': ARGENTINA_SP,
+                                      'cd': ARGENTINA_CD}),
+    'success': (_success, {'support': None, 'threshold': 0.58, 'steepness': 15.0})
+}
+
+
+class ScoreCache:
+    """
+    Bounded LRU memoization of SCORERS with quantized-input keys
+
+    Args:
+        maxsize: Maximum cached entries (least recently used evicted first)
+        quantum: Input grid spacing used for keys and computation
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, quantum=DEFAULT_QUANTUM):
+        self.maxsize = maxsize
+        self.quantum = quantum
+        self._inverse = 1.0 / quantum
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def key(self, name, kwargs):
+        """Quantized key for scorer `name`: (name, code per argument)"""
+        inverse = self._inverse
+        defaults = SCORERS[name][1]
+        if len(kwargs) == len(defaults):
+            try:
+                return (name, *[round(kwargs[arg] * inverse) for arg in defaults])
+            except KeyError:
+                pass
+        codes = [name]
+        used = 0
+        for arg, default in defaults.items():
+            if arg in kwargs:
+                value = kwargs[arg]
+                used += 1
+            elif default is None:
+                raise TypeError(f"{name}() missing required argument: {arg!r}")
+            else:
+                value = default
+            codes.append(round(value * inverse))
+        if used != len(kwargs):
+            unknown = sorted(set(kwargs) - set(defaults))
+            raise TypeError(f"{name}() got unexpected argument(s): {unknown}")
+        return tuple(codes)
+
+    def score(self, name, **kwargs):
+        """Cached value of scorer `name` for the given (quantized) inputs"""
+        key = self.key(name, kwargs)
+        entries = self._entries
+        value = entries.get(key)
+        if value is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        func, defaults = SCORERS[name]
+        snapped = {arg: code / self._inverse for arg, code in zip(defaults, key[1:])}
+        value = float(func(**snapped))
+        entries[key] = value
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+# cache.cf(...), cache.cf_chile(...), ... as shorthands for cache.score(name, ...)
+for _name in SCORERS:
+    setattr(ScoreCache, _name, partialmethod(ScoreCache.score, _name))
+
+
+if __name__ == "__main__":
+    import time
+    import timeit
+
+    print("="*70)
+    print("SCORE CACHE: MEMOIZED WHAT-IF SCORING")
+    print("="*70)
+
+    cache = ScoreCache(maxsize=10_000)
+    print(f"\nChile 2022 CF (structural inputs): {cache.cf_chile():.6f}")
+    print(f"Chile 2022 CF, popular support 0.58: {cache.cf_chile(popular_support=0.58):.6f}")
+    print(f"Colombia 2025 CLI: {cache.cli_colombia():.4f}, FSI: {cache.fsi():.4f}")
+    print(f"Argentina 2025 CF: {cache.cf_argentina():.4f}")
+
+    args = dict(pe=0.62, gap=0.12, cd=0.35, sp=0.47, cli=0.45)
+    n = 200_000
+    hit = timeit.timeit(lambda: cache.cf(**args), number=n) / n
+    direct = timeit.timeit(lambda: constitutional_fitness(**args), number=n) / n
+    structural = timeit.timeit(lambda: cache.cf_chile(popular_support=0.40), number=n) / n
+    print(f"\nHit latency: cf {hit*1e6:.2f} µs (uncached {direct*1e6:.2f} µs), "
+          f"cf_chile {structural*1e6:.2f} µs")
+
+    # Analyst session: a random walk around a handful of cases with small tweaks
+    rng = np.random.default_rng(0)
+    cache.clear()
+    start = time.perf_counter()
+    for _ in range(200_000):
+        base = rng.integers(5)
+        tweak = rng.integers(-30, 31) * 0.01
+        cache.cf(pe=0.2 + 0.1 * base, gap=0.3, cd=0.3, sp=min(max(0.5 + tweak, 0.0), 1.0), cli=0.6)
+        cache.cf(pe=0.2 + 0.1 * base, gap=0.3, cd=0.3, sp=0.5, cli=0.6 + rng.normal(0, 1e-8))
+    elapsed = time.perf_counter() - start
+    print(f"\nSession of 400,000 queries in {elapsed:.2f} s: {cache.stats}")
+
+    print(f"\n{ESTIMATION} - Default arguments are the case analyses' point estimates")
+    print("="*70)
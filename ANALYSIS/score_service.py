@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Score Service: Local asyncio HTTP scoring with request micro-batching
+Serves CF, CLI, FSI and the Figure 3 logistic success probability to
+internal tools, fully offline (standard library asyncio + numpy)
+
+Endpoints (JSON over HTTP/1.1, keep-alive):
+    POST /score/<metric>   body: {"arg": value, ...} or a list of such objects
+                           → {"metric": ..., "value": ...} (or a list)
+    GET  /metrics          available metrics and their argument defaults
+    GET  /stats            request count, batch sizes, p50/p99 latency
+    GET  /health
+
+Metrics: every score_cache.SCORERS entry (cf, sp, cli_chile, cli_colombia,
+gap_chile, fsi, cf_chile, cf_argentina, success). Omitted arguments take
+the SCORERS defaults.
+
+Micro-batching: each metric has a queue drained by one batcher task. When
+a request arrives the batcher takes everything already queued, waits up to
+max_delay for more (unless max_batch is reached), then scores the whole
+batch with ONE vectorized call and resolves every request's future.
+Under load, batches fill without waiting; when idle, a lone request waits
+at most max_delay. A batch that raises is re-scored request by request, so
+only the offending request gets a 500; non-finite results (e.g. FSI at zero
+debt) are returned as null.
+
+Batching pays off when scoring dominates: with list payloads on the
+structural cf_chile scorer (--demo 'bulk' profile) it roughly doubles item
+throughput over item-by-item scoring. For single-item requests on the cheap
+scorers, HTTP parsing and JSON encoding dominate and batching brings no
+throughput gain (--demo 'single' profile); send list payloads instead.
+
+Latency is measured per scored item from a parsed request to its
+computed value (queueing + batch wait + scoring).
+
+Usage:
+    python score_service.py                      # serve on 127.0.0.1:8765
+    python score_service.py --port 9000 --max-batch 512 --max-delay-ms 1
+    python score_service.py --demo               # offline load test
+
+    curl -s localhost:8765/score/cf -d '{"pe":0.62,"gap":0.12,"cd":0.35,"sp":0.47,"cli":0.45}'
+
+Author: Ignacio Adrián Lerer
+Date: November 2025
+License: CC-BY 4.0
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from score_cache import SCORERS
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BATCH = 1024
+DEFAULT_MAX_DELAY = 0.002       # seconds
+
+# Latency samples kept for percentiles
+LATENCY_WINDOW = 100_000
+
+# name → (vectorized function, ordered argument defaults; None = required)
+METRICS = SCORERS
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           500: 'Internal Server Error'}
+
+
+def validate(metric, inputs):
+    """
+    Check one item's arguments and fill defaults
+
+    Returns:
+        (row of float arguments in METRICS order, None) or (None, error message)
+    """
+    if not isinstance(inputs, dict):
+        return None, "request body must be a JSON object (or a list of objects)"
+    defaults = METRICS[metric][1]
+    unknown = set(inputs) - set(defaults)
+    if unknown:
+        return None, f"unknown argument(s) for {metric}: {sorted(unknown)}"
+    missing = [arg for arg, default in defaults.items() if default is None and arg not in inputs]
+    if missing:
+        return None, f"missing argument(s) for {metric}: {missing}"
+    row = []
+    for arg, default in defaults.items():
+        value = inputs.get(arg, default)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None, f"argument {arg!r} must be a number"
+        try:
+            value = float(value)
+        except OverflowError:
+            return None, f"argument {arg!r} is out of range"
+        if not np.isfinite(value):
+            return None, f"argument {arg!r} must be finite"
+        row.append(value)
+    return row, None
+
+
+def finite_or_none(value):
+    """JSON-safe number: non-finite values (Inf, NaN) become null"""
+    return value if np.isfinite(value) else None
+
+
+def dump_json(payload):
+    return json.dumps(payload, allow_nan=False).encode()
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent requests for one metric into vectorized calls
+
+    Queue entries are whole requests (one or more validated rows) with one
+    future each, so a list request costs one queue operation, not one per
+    item.
+
+    Args:
+        metric: Key of METRICS
+        max_batch: Maximum items per vectorized call (1 = item-by-item scoring)
+        max_delay: Seconds to wait for more items once a batch has started
+    """
+
+    def __init__(self, metric, max_batch=DEFAULT_MAX_BATCH, max_delay=DEFAULT_MAX_DELAY):
+        self.metric = metric
+        self.func, self.defaults = METRICS[metric]
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, rows):
+        """Queue one request's validated rows (see validate); resolves to their values"""
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((rows, future))
+        return await future
+
+    def _drain(self, batch, size):
+        while size < self.max_batch:
+            try:
+                entry = self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            batch.append(entry)
+            size += len(entry[0])
+        return size
+
+    async def run(self):
+        while True:
+            batch = [await self.queue.get()]
+            size = self._drain(batch, len(batch[0][0]))
+            if size < self.max_batch and self.max_delay > 0:
+                await asyncio.sleep(self.max_delay)
+                self._drain(batch, size)
+            self.score(batch)
+
+    def _values(self, rows):
+        """Score rows in vectorized calls of at most max_batch items"""
+        table = np.array(rows, dtype=np.float64).reshape(len(rows), len(self.defaults))
+        values = []
+        for start in range(0, len(rows), self.max_batch):
+            block = table[start:start + self.max_batch]
+            with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+                result = self.func(**{arg: block[:, j] for j, arg in enumerate(self.defaults)})
+            values += np.broadcast_to(result, (len(block),)).tolist()
+            self.batches += 1
+        self.items += len(rows)
+        return values
+
+    def score(self, batch):
+        """
+        Score a batch and resolve its futures
+
+        If the batch fails as a whole, each request is scored on its own so
+        only the requests that fail by themselves receive the exception.
+        """
+        try:
+            values = self._values([row for rows, _ in batch for row in rows])
+        except Exception:
+            for rows, future in batch:
+                try:
+                    result = self._values(rows)
+                except Exception as exc:
+                    if not future.done():
+                        future.set_exception(exc)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+            return
+        start = 0
+        for rows, future in batch:
+            if not future.done():
+                future.set_result(values[start:start + len(rows)])
+            start += len(rows)
+
+
+class ScoreService:
+    """
+    HTTP front end over one MicroBatcher per metric
+
+    Args:
+        max_batch, max_delay: Passed to every MicroBatcher
+    """
+
+    def __init__(self, max_batch=DEFAULT_MAX_BATCH, max_delay=DEFAULT_MAX_DELAY):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batchers = {}
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.requests = 0
+        self._tasks = []
+        self.server = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.batchers = {name: MicroBatcher(name, self.max_batch, self.max_delay) for name in METRICS}
+        self._tasks = [asyncio.create_task(b.run()) for b in self.batchers.values()]
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self):
+        latencies = np.asarray(self.latencies)
+        batches = sum(b.batches for b in self.batchers.values())
+        items = sum(b.items for b in self.batchers.values())
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1e3 if len(latencies) else (None, None)
+        return {
+            'requests': self.requests,
+            'items': items,
+            'batches': batches,
+            'mean_batch': items / batches if batches else 0.0,
+            'latency_p50_ms': None if p50 is None else float(p50),
+            'latency_p99_ms': None if p99 is None else float(p99),
+            'max_batch': self.max_batch,
+            'max_delay_ms': self.max_delay * 1e3
+        }
+
+    async def _score(self, metric, payload):
+        items = payload if isinstance(payload, list) else [payload]
+        rows = []
+        for inputs in items:
+            row, error = validate(metric, inputs)
+            if error:
+                return 400, {'error': error}
+            rows.append(row)
+        if not rows:
+            return 200, []
+        start = time.perf_counter()
+        values = await self.batchers[metric].submit(rows)
+        self.latencies.extend([time.perf_counter() - start] * len(rows))
+        results = [{'metric': metric, 'value': finite_or_none(value)} for value in values]
+        return 200, results if isinstance(payload, list) else results[0]
+
+    async def dispatch(self, method, path, body):
+        if path.startswith('/score/'):
+            metric = path[len('/score/'):]
+            if metric not in METRICS:
+                return 404, {'error': f"unknown metric {metric!r}", 'metrics': list(METRICS)}
+            if method != 'POST':
+                return 405, {'error': 'use POST'}
+            try:
+                payload = json.loads(body or b'{}')
+            except json.JSONDecodeError as exc:
+                return 400, {'error': f"invalid JSON: {exc}"}
+            self.requests += 1
+            return await self._score(metric, payload)
+        if method != 'GET':
+            return 405, {'error': 'use GET'}
+        if path == '/stats':
+            return 200, self.stats()
+        if path == '/metrics':
+            return 200, {name: defaults for name, (_, defaults) in METRICS.items()}
+        if path == '/health':
+            return 200, {'status': 'ok'}
+        return 404, {'error': f"no route for {path}"}
+
+    async def handle(self, reader, writer):
+        """One HTTP/1.1 connection (keep-alive until the client closes)"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                try:
+                    status, payload = await self.dispatch(method, path.split('?')[0], body)
+                    data = dump_json(payload)
+                except Exception as exc:
+                    status, data = 500, dump_json({'error': f"{type(exc).__name__}: {exc}"})
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+def _random_item(metric, rng):
+    if metric == 'cf':
+        return dict(zip(('pe', 'gap', 'cd', 'sp', 'cli'), rng.uniform(0.05, 0.95, 5).tolist()))
+    if metric == 'cli_colombia':
+        return {'judicial_lock': float(rng.uniform(0.1, 0.6))}
+    if metric == 'fsi':
+        return {'debt': float(rng.uniform(30, 120))}
+    if metric == 'cf_chile':
+        return {'popular_support': float(rng.uniform(0.2, 0.8))}
+    return {'support': float(rng.uniform(0, 1))}
+
+
+async def _client(host, port, n_requests, rng, latencies, metrics, items_per_request):
+    """
+    Keep-alive client sending random requests; items_per_request > 1 sends
+    list payloads of that many items
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    for _ in range(n_requests):
+        metric = metrics[rng.integers(len(metrics))]
+        if items_per_request == 1:
+            body = _random_item(metric, rng)
+        else:
+            body = [_random_item(metric, rng) for _ in range(items_per_request)]
+        data = json.dumps(body).encode()
+        start = time.perf_counter()
+        writer.write(f"POST /score/{metric} HTTP/1.1\r\nHost: {host}\r\n"
+                     f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+        await writer.drain()
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            if line.lower().startswith(b'content-length'):
+                length = int(line.split(b':')[1])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+# Load profiles: single-item requests, and bulk list requests on the costly
+# structural Chile scorer
+LOAD_PROFILES = {
+    'single': {'metrics': ('cf', 'cli_colombia', 'fsi', 'success'), 'items_per_request': 1,
+               'clients': 200, 'requests_per_client': 100},
+    'bulk': {'metrics': ('cf_chile',), 'items_per_request': 50,
+             'clients': 50, 'requests_per_client': 20}
+}
+
+
+async def load_test(max_batch, max_delay, profile='single', seed=0):
+    """
+    Run a service and hammer it from concurrent keep-alive clients
+
+    Args:
+        profile: Key of LOAD_PROFILES
+
+    Returns:
+        Dict with item throughput, client-side request p50/p99 and the
+        service stats
+    """
+    spec = LOAD_PROFILES[profile]
+    service = ScoreService(max_batch=max_batch, max_delay=max_delay)
+    host, port = await service.start('127.0.0.1', 0)
+    latencies = []
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, spec['requests_per_client'], np.random.default_rng(rng.integers(2**32)),
+                latencies, spec['metrics'], spec['items_per_request'])
+        for _ in range(spec['clients'])))
+    elapsed = time.perf_counter() - start
+    stats = service.stats()
+    await service.stop()
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1e3
+    return {'throughput': len(latencies) * spec['items_per_request'] / elapsed,
+            'client_p50_ms': p50, 'client_p99_ms': p99, **stats}
+
+
+async def serve(host, port, max_batch, max_delay):
+    service = ScoreService(max_batch=max_batch, max_delay=max_delay)
+    host, port = await service.start(host, port)
+    print(f"Scoring service on http://{host}:{port} "
+          f"(max batch {max_batch}, max delay {max_delay*1e3:g} ms); Ctrl-C to stop")
+    async with service.server:
+        await service.server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-batching EPT scoring service')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument('--max-delay-ms', type=float, default=DEFAULT_MAX_DELAY * 1e3)
+    parser.add_argument('--demo', action='store_true', help='Run an offline load test and exit')
+    args = parser.parse_args()
+    max_delay = args.max_delay_ms / 1e3
+
+    if not args.demo:
+        try:
+            asyncio.run(serve(args.host, args.port, args.max_batch, max_delay))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    print("="*70)
+    print("SCORING SERVICE LOAD TEST")
+    print("="*70)
+    for profile, spec in LOAD_PROFILES.items():
+        print(f"\nProfile '{profile}': {spec['clients']} clients × {spec['requests_per_client']} requests "
+              f"× {spec['items_per_request']} item(s), metrics {', '.join(spec['metrics'])}")
+        for label, batch, delay in (('Item-by-item', 1, 0.0),
+                                    ('Micro-batched', args.max_batch, max_delay)):
+            result = asyncio.run(load_test(batch, delay, profile))
+            print(f"  {label} (max batch {batch}, max delay {delay*1e3:g} ms): "
+                  f"{result['throughput']:,.0f} items/s, mean batch {result['mean_batch']:.1f}, "
+                  f"client p50/p99 {result['client_p50_ms']:.2f} / {result['client_p99_ms']:.2f} ms")
+    print("="*70)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+"""
+GLOBAL SENSITIVITY ANALYSIS: Sobol indices for CF inputs and weights
+Which assumptions drive each verdict?
+
+Computes first-order (S1) and total (ST) Sobol indices for every component
+input AND every hard-coded weight (CLI weights, Gap weights). Uses Saltelli
+sampling on a scrambled Sobol sequence; the N × (D + 2) model evaluations
+are split into chunks and fanned out over a process pool. Bootstrap
+confidence intervals resample in batches of bounded size, so memory does
+not grow with the number of resamples.
+
+Estimators (Saltelli et al. 2010):
+    S1_i = E[f(B) × (f(AB_i) - f(A))] / Var(f)
+    ST_i = E[(f(A) - f(AB_i))²] / (2 × Var(f))
+
+Author: Adrian Lerer
+Date: November 2025
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc
+
+from cf_engine import CLI_CHILE_WEIGHTS, CLI_COLOMBIA_WEIGHTS, GAP_CHILE_WEIGHTS, constitutional_fitness
+
+ESTIMATION = "[Estimación]"
+
+# Resampled f_ab values per bootstrap batch (float64: 2**21 = 16 MB)
+BOOTSTRAP_BATCH_ELEMENTS = 2**21
+
+
+def around(nominal, rel=0.20, lower=0.0, upper=1.0):
+    """Uniform bounds of ±rel around a nominal value, clipped to [lower, upper]"""
+    low = nominal - abs(nominal) * rel
+    high = nominal + abs(nominal) * rel
+    if lower is not None:
+        low = max(low, lower)
+    if upper is not None:
+        high = min(high, upper)
+    return (low, high)
+
+
+def make_problem(nominal, rel=0.20, unbounded=()):
+    """
+    Build a problem definition from nominal values
+
+    Args:
+        nominal: Dict of input name → nominal value (order defines columns)
+        rel: Relative half-width of the uniform sampling range
+        unbounded: Input names not clipped to [0, 1] (weights, % GDP)
+
+    Returns:
+        Dict with 'names', 'nominal' and 'bounds' (D × 2 array)
+    """
+    names = list(nominal)
+    bounds = np.array([
+        around(nominal[n], rel, upper=None) if n in unbounded else around(nominal[n], rel)
+        for n in names
+    ])
+    return {'names': names, 'nominal': dict(nominal), 'bounds': bounds}
+
+
+def _normalized(*weights):
+    total = sum(weights)
+    return [w / total for w in weights]
+
+
+# ---------------------------------------------------------------------------
+# Models: each maps an (n × D) sample matrix to n CF values. Weights are
+# renormalized to sum to 1, so their indices measure RELATIVE importance.
+# Models must be module-level functions so the process pool can pickle them.
+# ---------------------------------------------------------------------------
+
+CHILE_2022_NOMINAL = {
+    # Selection Pressure (calculate_selection_pressure_chile_2022)
+    'popular_support': 0.3814,
+    'elite_support': 0.33,
+    'institutional_fit': 0.20,
+    # CLI components and weights (calculate_cli_chile_trajectory)
+    'text_vagueness': 0.85,
+    'judicial_activism': 0.78,
+    'treaty_hierarchy': 0.82,
+    'precedent_weight': 0.68,
+    'amendment_difficulty': 0.92,
+    **{f'w_{name}': weight for name, weight in CLI_CHILE_WEIGHTS.items()},
+    # Gap components and weights (calculate_fiscal_gap_projected)
+    'promised_esr_cost': 13.5,
+    'fiscal_space': 2.5,
+    'institutional_gap': 0.70,
+    'plurinational_gap': 0.85,
+    'environmental_gap': 0.65,
+    **{f'w_{name}': weight for name, weight in GAP_CHILE_WEIGHTS.items()},
+    # Cultural Distance (calculate_cultural_distance_chile)
+    'cd': 0.653,
+    # Phenotypic Expression (calculate_phenotypic_expression_projected)
+    'institutions': 0.15,
+    'budget': 0.20,
+    'enforcement': 0.10,
+    'behavior': 0.05
+}
+
+CHILE_2022_UNBOUNDED = tuple(n for n in CHILE_2022_NOMINAL if n.startswith('w_')) + (
+    'promised_esr_cost', 'fiscal_space'
+)
+
+
+def chile_2022_cf(X):
+    """CF for Chile 2022 with CLI and Gap rebuilt from weighted components"""
+    x = dict(zip(CHILE_2022_NOMINAL, X.T))
+    sp = (x['popular_support'] + x['elite_support'] + x['institutional_fit']) / 3
+    cw = _normalized(x['w_text_vagueness'], x['w_judicial_activism'],
+                     x['w_treaty_hierarchy'], x['w_precedent_weight'],
+                     x['w_amendment_difficulty'])
+    cli = (cw[0] * x['text_vagueness'] + cw[1] * x['judicial_activism'] +
+           cw[2] * x['treaty_hierarchy'] + cw[3] * x['precedent_weight'] +
+           cw[4] * x['amendment_difficulty'])
+    fiscal_gap = (x['promised_esr_cost'] - x['fiscal_space']) / x['promised_esr_cost']
+    gw = _normalized(x['w_fiscal_gap'], x['w_institutional_gap'],
+                     x['w_plurinational_gap'], x['w_environmental_gap'])
+    gap = (gw[0] * fiscal_gap + gw[1] * x['institutional_gap'] +
+           gw[2] * x['plurinational_gap'] + gw[3] * x['environmental_gap'])
+    pe = (x['institutions'] + x['budget'] + x['enforcement'] + x['behavior']) / 4
+    return constitutional_fitness(pe, gap, x['cd'], sp, cli)
+
+
+def colombia_nominal(year_index=-1):
+    """
+    Nominal inputs for one Colombia year (index into the 1991-2025 grid)
+
+    CLI components and weights from calculate_cli_colombia_trajectory;
+    aggregate SP, Gap, PE, CD from the CF trajectory (run_h1_colombia).
+    """
+    from colombia_h1_analysis import run_h1_colombia
+
+    result = run_h1_colombia()
+    components = {name.lower(): values for name, values in result.components['CLI'].items()
+                  if name != 'CLI'}
+    i = year_index
+    return {
+        **{name: float(components[name][i]) for name in CLI_COLOMBIA_WEIGHTS},
+        **{f'w_{name}': weight for name, weight in CLI_COLOMBIA_WEIGHTS.items()},
+        'sp': float(result.sp[i]),
+        'gap': float(result.gap[i]),
+        'pe': float(result.pe[i]),
+        'cd': float(result.cd[i])
+    }
+
+
+COLOMBIA_NAMES = (tuple(CLI_COLOMBIA_WEIGHTS) + tuple(f'w_{name}' for name in CLI_COLOMBIA_WEIGHTS) +
+                  ('sp', 'gap', 'pe', 'cd'))
+COLOMBIA_UNBOUNDED = tuple(n for n in COLOMBIA_NAMES if n.startswith('w_'))
+
+
+def colombia_cf(X):
+    """CF for one Colombia year with CLI rebuilt from weighted components"""
+    x = dict(zip(COLOMBIA_NAMES, X.T))
+    w = _normalized(x['w_judicial_lock'], x['w_legislative_lock'],
+                    x['w_reversal_rate'], x['w_path_dependence'])
+    cli = (w[0] * x['judicial_lock'] + w[1] * x['legislative_lock'] +
+           w[2] * x['reversal_rate'] + w[3] * x['path_dependence'])
+    return constitutional_fitness(x['pe'], x['gap'], x['cd'], x['sp'], cli)
+
+
+# ---------------------------------------------------------------------------
+# Sampling, parallel evaluation and estimation
+# ---------------------------------------------------------------------------
+
+def saltelli_sample(problem, n, seed=None):
+    """
+    Saltelli design matrices
+
+    Returns (A, B, AB) with A, B of shape (n, D) and AB of shape (D, n, D),
+    where AB[i] is A with column i taken from B. n is rounded up to a power
+    of two for the Sobol sequence.
+    """
+    d = len(problem['names'])
+    m = int(np.ceil(np.log2(max(n, 2))))
+    base = qmc.Sobol(d=2 * d, scramble=True, seed=seed).random_base2(m)
+    lo, hi = problem['bounds'][:, 0], problem['bounds'][:, 1]
+    A = lo + base[:, :d] * (hi - lo)
+    B = lo + base[:, d:] * (hi - lo)
+    AB = np.repeat(A[np.newaxis], d, axis=0)
+    idx = np.arange(d)
+    AB[idx, :, idx] = B[:, idx].T
+    return A, B, AB
+
+
+def evaluate(model, X, workers=None, chunks_per_worker=4):
+    """
+    Evaluate a model over the rows of X on a process pool
+
+    Args:
+        model: Picklable callable mapping an (n × D) array to n outputs
+        X: Sample matrix
+        workers: Process count (default: all cores); 1 evaluates inline
+
+    Returns:
+        Output array of length len(X)
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return np.asarray(model(X), dtype=np.float64)
+    chunks = np.array_split(X, workers * chunks_per_worker)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(model, chunks))
+    return np.concatenate(results).astype(np.float64)
+
+
+def sobol_indices(f_a, f_b, f_ab, n_bootstrap=200, seed=None, batch_elements=BOOTSTRAP_BATCH_ELEMENTS):
+    """
+    First-order and total Sobol indices from model outputs
+
+    Args:
+        f_a, f_b: Outputs on A and B (length n)
+        f_ab: Outputs on AB (shape D × n)
+        n_bootstrap: Resamples for 95% confidence half-widths (0 to skip)
+        batch_elements: Resampled f_ab values held at once; resamples are
+                        processed in batches of batch_elements // (D × n)
+
+    Returns:
+        Dict with S1, ST and (if bootstrapped) S1_conf, ST_conf arrays
+    """
+    def estimate(fa, fb, fab):
+        var = np.var(np.concatenate([fa, fb], axis=-1), axis=-1, keepdims=True)
+        s1 = np.mean(fb[..., np.newaxis, :] * (fab - fa[..., np.newaxis, :]), axis=-1)
+        st = 0.5 * np.mean((fa[..., np.newaxis, :] - fab) ** 2, axis=-1)
+        return s1 / var, st / var
+
+    s1, st = estimate(f_a, f_b, f_ab)
+    result = {'S1': s1, 'ST': st}
+    if n_bootstrap:
+        d, n = f_ab.shape
+        rng = np.random.default_rng(seed)
+        batch = max(1, batch_elements // (d * n))
+        s1_b = np.empty((n_bootstrap, d))
+        st_b = np.empty((n_bootstrap, d))
+        for start in range(0, n_bootstrap, batch):
+            stop = min(start + batch, n_bootstrap)
+            idx = rng.integers(0, n, size=(stop - start, n))
+            # (b, n) and (b, D, n) resamples
+            s1_b[start:stop], st_b[start:stop] = estimate(f_a[idx], f_b[idx], np.moveaxis(f_ab[:, idx], 0, 1))
+        result['S1_conf'] = 1.96 * s1_b.std(axis=0)
+        result['ST_conf'] = 1.96 * st_b.std(axis=0)
+    return result
+
+
+def sensitivity_report(problem, model, n=2**13, workers=None, seed=None, n_bootstrap=200):
+    """
+    Sobol sensitivity of a model over a problem definition
+
+    Args:
+        problem: Dict from make_problem
+        model: Picklable model (n × D → n)
+        n: Base sample size (total evaluations n × (D + 2))
+        workers: Process pool size (default: all cores)
+
+    Returns:
+        DataFrame with Input, S1, S1_conf, ST, ST_conf sorted by ST
+    """
+    A, B, AB = saltelli_sample(problem, n, seed=seed)
+    d = len(problem['names'])
+    X = np.concatenate([A, B, AB.reshape(-1, d)])
+    y = evaluate(model, X, workers=workers)
+
+    n = len(A)
+    f_a, f_b, f_ab = y[:n], y[n:2 * n], y[2 * n:].reshape(d, n)
+    indices = sobol_indices(f_a, f_b, f_ab, n_bootstrap=n_bootstrap, seed=seed)
+
+    df = pd.DataFrame({'Input': problem['names'], **indices})
+    return df.sort_values('ST', ascending=False).reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    print("="*70)
+    print("SOBOL SENSITIVITY: CHILE 2022 CONSTITUTIONAL FITNESS")
+    print("="*70)
+
+    chile_problem = make_problem(CHILE_2022_NOMINAL, unbounded=CHILE_2022_UNBOUNDED)
+    chile = sensitivity_report(chile_problem, chile_2022_cf, n=2**13, seed=2022)
+    print(f"\nInputs: {len(chile_problem['names'])} (±20% uniform around nominal)")
+    print(f"Workers: {os.cpu_count()}")
+    print("\n" + chile.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+    print("\n" + "="*70)
+    print("SOBOL SENSITIVITY: COLOMBIA 2025 CONSTITUTIONAL FITNESS")
+    print("="*70)
+
+    colombia_problem = make_problem(colombia_nominal(-1), unbounded=COLOMBIA_UNBOUNDED)
+    colombia = sensitivity_report(colombia_problem, colombia_cf, n=2**13, seed=2025)
+    print("\n" + colombia.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    print(f"\n{ESTIMATION} - Indices depend on the assumed ±20% input ranges")
+    print("="*70)
@@ -0,0 +1,243 @@
+"""
+SUPPORT THRESHOLD ESTIMATOR: Logistic fit with vectorized bootstrap
+Estimates the threshold and steepness used by
+generate_figure3_threshold.logistic_success_probability from data
+
+Model:
+    P(success | support) = 1 / (1 + exp(-steepness × (support - threshold)))
+                         = expit(b0 + b1 × support)
+    steepness = b1, threshold = -b0 / b1
+
+Fitting uses IRLS (Newton-Raphson). Bootstrap replicates are expressed as
+multinomial case weights on the SAME design matrix, so all replicates in a
+batch are fitted together with batched 2×2 solves: one IRLS loop for the
+whole batch instead of one statsmodels fit per replicate.
+
+Replicates that separate perfectly (no finite MLE) or fail to converge are
+dropped, so the bootstrap SEs and CIs are conditional on a finite fit; a
+warning is logged whenever that happens. On small or near-separated
+samples, check n_valid against n_bootstrap before using the intervals.
+
+Author: Adrian Lerer
+Date: November 2025
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+from scipy.special import expit
+
+ESTIMATION = "[Estimación]"
+
+logger = logging.getLogger(__name__)
+
+# Values currently hard-coded in generate_figure3_threshold
+FIGURE3_THRESHOLD = 0.58
+FIGURE3_STEEPNESS = 15
+
+# Fits whose |slope| exceeds this are treated as separated (no finite MLE)
+MAX_STEEPNESS = 500.0
+
+
+def load_reform_attempts(path, support_col='Support', success_col='Success', region_col=None):
+    """
+    Load a reform-attempts table
+
+    Support may be a proportion (0-1) or a percentage (0-100); Success must
+    be 0/1. Returns a DataFrame with Support, Success and (optionally) Region.
+    """
+    df = pd.read_csv(path)
+    out = pd.DataFrame({
+        'Support': df[support_col].astype(float),
+        'Success': df[success_col].astype(int)
+    })
+    if out['Support'].max() > 1.0:
+        out['Support'] /= 100.0
+    if region_col is not None:
+        out['Region'] = df[region_col].values
+    return out
+
+
+def simulate_reform_attempts(n, threshold=FIGURE3_THRESHOLD, steepness=FIGURE3_STEEPNESS, seed=None):
+    """Synthetic reform-attempts table drawn from the logistic model"""
+    rng = np.random.default_rng(seed)
+    support = rng.uniform(0.20, 0.95, n)
+    success = rng.random(n) < expit(steepness * (support - threshold))
+    return pd.DataFrame({'Support': support, 'Success': success.astype(int)})
+
+
+def fit_logistic_batch(x, y, weights, max_iter=50, tol=1e-8, ridge=1e-8):
+    """
+    Batched IRLS for weighted one-predictor logistic regressions
+
+    Args:
+        x: Predictor, shape (n,)
+        y: 0/1 outcome, shape (n,)
+        weights: Case weights, shape (R, n), one row per fit
+        ridge: Small diagonal penalty keeping separated fits finite
+
+    Returns:
+        (beta, converged): beta of shape (R, 2) as (intercept, slope) and a
+        boolean mask of fits that converged to a finite slope. Fits whose
+        successes and failures do not overlap in x (complete or
+        quasi-complete separation) have no finite MLE: they are not
+        iterated, and converged is False (the ridge alone would otherwise
+        stop them at a large but finite slope)
+    """
+    weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x2 = x * x
+    X = np.column_stack([np.ones_like(x), x])
+    r = weights.shape[0]
+
+    # With one predictor, a finite MLE exists iff the classes overlap both ways
+    present = weights > 0
+    successes = present & (y == 1)
+    failures = present & (y == 0)
+    overlap = ((np.where(failures, x, -np.inf).max(axis=1) > np.where(successes, x, np.inf).min(axis=1))
+               & (np.where(successes, x, -np.inf).max(axis=1) > np.where(failures, x, np.inf).min(axis=1)))
+
+    beta = np.zeros((r, 2))
+    active = overlap.copy()
+    penalty = ridge * np.eye(2)
+
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        b = beta[active]
+        w = weights[active]
+        mu = expit(b @ X.T)
+        grad = (w * (y - mu)) @ X - ridge * b
+        # Fisher information X'WX from the three distinct moments of W
+        v = w * mu * (1.0 - mu)
+        s0, s1, s2 = v.sum(axis=1), v @ x, v @ x2
+        info = np.stack([np.stack([s0, s1], -1), np.stack([s1, s2], -1)], -2) + penalty
+        step = np.linalg.solve(info, grad[..., np.newaxis])[..., 0]
+        beta[active] = b + step
+
+        done = np.abs(step).max(axis=1) < tol * (1.0 + np.abs(b).max(axis=1))
+        diverged = np.abs(beta[active, 1]) > MAX_STEEPNESS
+        idx = np.flatnonzero(active)
+        active[idx[done | diverged]] = False
+
+    converged = overlap & ~active & (np.abs(beta[:, 1]) <= MAX_STEEPNESS) & (beta[:, 1] != 0)
+    return beta, converged
+
+
+def _to_threshold(beta):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return -beta[:, 0] / beta[:, 1], beta[:, 1]
+
+
+def estimate_threshold(df, n_bootstrap=2000, ci=0.95, batch_size=None, seed=None,
+                       max_cells=50_000_000):
+    """
+    Fit threshold and steepness with bootstrap confidence intervals
+
+    Args:
+        df: Reform-attempts table with Support (0-1) and Success (0/1)
+        n_bootstrap: Number of bootstrap replicates
+        ci: Confidence level for percentile intervals
+        batch_size: Replicates fitted per batch (default: sized so that
+                    batch_size × n_cases <= max_cells)
+
+    Returns:
+        Dict with point estimates, bootstrap SEs, CIs and replicate counts.
+        SEs and CIs use only the n_valid replicates with a finite fit, i.e.
+        they are conditional on the replicate not being separated.
+    """
+    x = df['Support'].to_numpy(dtype=np.float64)
+    y = df['Success'].to_numpy(dtype=np.float64)
+    n = len(x)
+
+    beta, converged = fit_logistic_batch(x, y, np.ones((1, n)))
+    threshold, steepness = _to_threshold(beta)
+
+    rng = np.random.default_rng(seed)
+    batch_size = batch_size or max(1, min(n_bootstrap, max_cells // max(n, 1)))
+    pvals = np.full(n, 1.0 / n)
+    thresholds, slopes = [], []
+    done = 0
+    while done < n_bootstrap:
+        r = min(batch_size, n_bootstrap - done)
+        counts = rng.multinomial(n, pvals, size=r).astype(np.float64)
+        b, ok = fit_logistic_batch(x, y, counts)
+        t, k = _to_threshold(b[ok])
+        thresholds.append(t)
+        slopes.append(k)
+        done += r
+
+    thresholds = np.concatenate(thresholds)
+    slopes = np.concatenate(slopes)
+    if len(thresholds) < n_bootstrap:
+        logger.warning(f"{n_bootstrap - len(thresholds):,} of {n_bootstrap:,} bootstrap replicates "
+                       f"separated or did not converge and were dropped; the CIs are conditional "
+                       f"on a finite fit")
+    alpha = (1.0 - ci) / 2.0
+    qs = [alpha, 1.0 - alpha]
+
+    return {
+        'threshold': float(threshold[0]),
+        'steepness': float(steepness[0]),
+        'converged': bool(converged[0]),
+        'threshold_se': float(thresholds.std(ddof=1)) if len(thresholds) > 1 else np.nan,
+        'steepness_se': float(slopes.std(ddof=1)) if len(slopes) > 1 else np.nan,
+        'threshold_ci': tuple(np.quantile(thresholds, qs)) if len(thresholds) else (np.nan, np.nan),
+        'steepness_ci': tuple(np.quantile(slopes, qs)) if len(slopes) else (np.nan, np.nan),
+        'n_cases': n,
+        'n_bootstrap': n_bootstrap,
+        'n_valid': int(len(thresholds))
+    }
+
+
+def estimate_by_region(df, **kwargs):
+    """Run estimate_threshold per Region; returns one row per region"""
+    rows = []
+    for region, group in df.groupby('Region', sort=True):
+        result = estimate_threshold(group, **kwargs)
+        rows.append({
+            'Region': region,
+            'N': result['n_cases'],
+            'Threshold': result['threshold'],
+            'Threshold_CI_Low': result['threshold_ci'][0],
+            'Threshold_CI_High': result['threshold_ci'][1],
+            'Steepness': result['steepness'],
+            'Steepness_CI_Low': result['steepness_ci'][0],
+            'Steepness_CI_High': result['steepness_ci'][1],
+            'Valid_Replicates': result['n_valid']
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    print("="*70)
+    print("POPULAR SUPPORT THRESHOLD ESTIMATION")
+    print("="*70)
+
+    if len(sys.argv) > 1:
+        cases = load_reform_attempts(sys.argv[1])
+        source = sys.argv[1]
+    else:
+        cases = simulate_reform_attempts(5000, seed=45)
+        source = (f"synthetic (threshold={FIGURE3_THRESHOLD}, "
+                  f"steepness={FIGURE3_STEEPNESS})")
+
+    start = time.perf_counter()
+    result = estimate_threshold(cases, n_bootstrap=2000, seed=58)
+    elapsed = time.perf_counter() - start
+
+    print(f"\nData: {source}, N = {result['n_cases']:,}")
+    print(f"\nThreshold: {result['threshold']*100:.1f}% "
+          f"(95% CI [{result['threshold_ci'][0]*100:.1f}%, {result['threshold_ci'][1]*100:.1f}%], "
+          f"SE ±{result['threshold_se']*100:.1f}pp)")
+    print(f"Steepness: {result['steepness']:.2f} "
+          f"(95% CI [{result['steepness_ci'][0]:.2f}, {result['steepness_ci'][1]:.2f}])")
+    print(f"\nBootstrap: {result['n_valid']:,}/{result['n_bootstrap']:,} valid replicates "
+          f"in {elapsed:.2f} s")
+    print(f"\n{ESTIMATION} - Percentile bootstrap, batched IRLS")
+    print("="*70)
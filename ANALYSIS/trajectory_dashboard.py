@@ -0,0 +1,585 @@
+#!/usr/bin/env python3
+"""
+Trajectory Dashboard: Interactive CF, CLI, FSI and SP trajectories for all countries
+Local plotly dashboard served from pre-aggregated, level-of-detail tiles;
+the browser never receives the raw panel
+
+Tiles (one directory, NumPy arrays + manifest.json as in panel_store):
+    <metric>_L<k>.npy           (countries, bins, 3) float32: q5, q50, q95 of
+                                each country over bins of 2^k consecutive
+                                years. Level 0 is the panel itself; coarser
+                                levels keep the band envelope (min q5, max q95)
+                                and the mean q50, so extremes survive
+                                downsampling.
+    <metric>_overview_L<k>.npy  (bins, 5) float32: p5, p25, p50, p75, p95 of
+                                the countries' q50 per bin (the all-country fan)
+    manifest.json               countries, metrics, bin centers per level,
+                                and the source the tiles were built from
+
+Level of detail: for each view the server picks the finest level at which
+the selected countries × visible bins fit a point budget (about two points
+per screen pixel), so a 190-country view ships a few thousand points and
+zooming into a decade of one country ships full resolution. Tiles are
+memory-mapped; a request touches only the selected rows of one level.
+
+Input panels are long frames with Country, Year, Metric and either q5, q50,
+q95 (scenario quantiles) or a single Value (point estimates, zero-width band):
+    cases       CF, CLI, FSI, SP of Colombia, Chile, Argentina (panel_store)
+    synthetic   N countries × years with scenario bands (load testing)
+
+The manifest records the source (a hash of the panel store's files, or the
+synthetic country count and seed); tiles are rebuilt whenever the
+requested source no longer matches, e.g. after the panel store changes.
+
+Usage:
+    python trajectory_dashboard.py                        # case tiles, http://127.0.0.1:8050
+    python trajectory_dashboard.py --synthetic 190 --seed 1
+    python trajectory_dashboard.py --demo                 # offline LOD/payload report
+
+Author: Ignacio Adrián Lerer
+Date: November 2025
+License: CC-BY 4.0
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import time
+import warnings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from cf_engine import CF_BAND_EDGES, constitutional_fitness
+from fsi_engine import FSI_CRISIS_THRESHOLD
+
+ESTIMATION = "[Estimación]"
+
+TILE_DIR = Path(__file__).resolve().parent.parent / 'DATA' / 'dashboard_tiles'
+
+DASHBOARD_METRICS = ('CF', 'CLI', 'FSI', 'SP')
+BAND_COLUMNS = ('q5', 'q50', 'q95')
+OVERVIEW_QUANTILES = (0.05, 0.25, 0.50, 0.75, 0.95)
+FORMAT_VERSION = 1
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8050
+DEFAULT_POINT_BUDGET = 4000
+
+# Above this many selected countries, draw medians only, as one WebGL trace
+MAX_BAND_COUNTRIES = 12
+
+REFERENCE_LINES = {
+    'CF': [(edge, f'CF band edge {edge:.2f}') for edge in CF_BAND_EDGES],
+    'FSI': [(FSI_CRISIS_THRESHOLD, f'Fiscal crisis (FSI < {FSI_CRISIS_THRESHOLD:.2f})')]
+}
+
+
+def _downsample(cube, centers, width):
+    """Bin consecutive columns of a (countries, years, 3) cube by `width`"""
+    n_countries, n_years, _ = cube.shape
+    n_bins = -(-n_years // width)
+    pad = n_bins * width - n_years
+    padded = np.pad(cube, ((0, 0), (0, pad), (0, 0)), constant_values=np.nan)
+    blocks = padded.reshape(n_countries, n_bins, width, 3)
+    x = np.pad(centers, (0, pad), constant_values=np.nan).reshape(n_bins, width)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)   # all-NaN bins
+        level = np.stack([np.nanmin(blocks[..., 0], axis=2),
+                          np.nanmean(blocks[..., 1], axis=2),
+                          np.nanmax(blocks[..., 2], axis=2)], axis=-1)
+        return level.astype(np.float32), np.nanmean(x, axis=1)
+
+
+def _overview(level):
+    """All-country fan (bins, 5) from the countries' q50"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        fan = np.nanquantile(level[..., 1], OVERVIEW_QUANTILES, axis=0).T
+    return fan.astype(np.float32)
+
+
+def build_tiles(long_df, path=TILE_DIR, source=None):
+    """
+    Pre-aggregate a long panel into level-of-detail tiles
+
+    Args:
+        long_df: DataFrame with Country, Year, Metric and q5, q50, q95 or Value
+        path: Tile directory (created if missing, files overwritten)
+        source: JSON-serializable description of the panel, stored in the
+                manifest (see tile_source)
+
+    Returns:
+        Path to the tile directory
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    df = long_df[long_df['Metric'].isin(DASHBOARD_METRICS)].copy()
+    if 'q50' not in df.columns:
+        for column in BAND_COLUMNS:
+            df[column] = df['Value']
+    countries = pd.Categorical(df['Country'].astype(str))
+    years = np.unique(df['Year'].to_numpy(dtype=np.float64))
+    country_codes = countries.codes
+    year_codes = np.searchsorted(years, df['Year'].to_numpy(dtype=np.float64))
+    metrics = [m for m in DASHBOARD_METRICS if (df['Metric'] == m).any()]
+
+    levels = []
+    width = 1
+    while True:
+        levels.append(width)
+        if width >= len(years):
+            break
+        width *= 2
+
+    centers = {}
+    for metric in metrics:
+        rows = (df['Metric'] == metric).to_numpy()
+        cube = np.full((len(countries.categories), len(years), 3), np.nan, dtype=np.float32)
+        cube[country_codes[rows], year_codes[rows]] = df.loc[rows, list(BAND_COLUMNS)].to_numpy(np.float32)
+        for k, width in enumerate(levels):
+            level, x = _downsample(cube, years, width)
+            np.save(path / f'{metric}_L{k}.npy', level)
+            np.save(path / f'{metric}_overview_L{k}.npy', _overview(level))
+            centers[k] = [round(float(v), 4) for v in x]
+
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'countries': list(countries.categories),
+        'metrics': metrics,
+        'years': [float(years[0]), float(years[-1])],
+        'levels': [{'bin_years': width, 'centers': centers[k]} for k, width in enumerate(levels)],
+        'source': source
+    }
+    with open(path / 'manifest.json', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    return path
+
+
+class TileStore:
+    """
+    Read-only view of dashboard tiles
+
+    Arrays are memory-mapped lazily; series() slices the selected countries
+    and visible bins of one level.
+    """
+
+    def __init__(self, path=TILE_DIR):
+        self.path = Path(path)
+        with open(self.path / 'manifest.json', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest['format_version'] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported tile format {self.manifest['format_version']} "
+                             f"(expected {FORMAT_VERSION})")
+        self.countries = self.manifest['countries']
+        self.metrics = self.manifest['metrics']
+        self._country_index = {name: i for i, name in enumerate(self.countries)}
+        self._centers = [np.asarray(level['centers']) for level in self.manifest['levels']]
+        self._arrays = {}
+
+    def _array(self, name):
+        if name not in self._arrays:
+            self._arrays[name] = np.load(self.path / f'{name}.npy', mmap_mode='r')
+        return self._arrays[name]
+
+    def _visible(self, k, x0, x1):
+        """Slice of level-k bins overlapping [x0, x1], plus one bin either side"""
+        centers = self._centers[k]
+        start = max(int(np.searchsorted(centers, x0, side='left')) - 1, 0)
+        stop = min(int(np.searchsorted(centers, x1, side='right')) + 1, len(centers))
+        return slice(start, stop)
+
+    def choose_level(self, n_countries, x0=None, x1=None, budget=DEFAULT_POINT_BUDGET):
+        """Finest level whose n_countries × visible bins fit the point budget"""
+        x0 = self.manifest['years'][0] if x0 is None else x0
+        x1 = self.manifest['years'][1] if x1 is None else x1
+        for k in range(len(self._centers)):
+            visible = self._visible(k, x0, x1)
+            if max(n_countries, 1) * (visible.stop - visible.start) <= budget:
+                return k
+        return len(self._centers) - 1
+
+    def series(self, metric, countries=(), x0=None, x1=None, budget=DEFAULT_POINT_BUDGET):
+        """
+        Downsampled view for the selected countries and year range
+
+        Returns:
+            Dict with level, bin_years, x (bin centers), overview (bins, 5)
+            and bands {country: (bins, 3) array of q5, q50, q95}
+        """
+        if metric not in self.metrics:
+            raise KeyError(f"Unknown metric {metric!r}; tiles have {self.metrics}")
+        unknown = [c for c in countries if c not in self._country_index]
+        if unknown:
+            raise KeyError(f"Unknown countries: {unknown}")
+        k = self.choose_level(len(countries) + 1, x0, x1, budget)
+        visible = self._visible(k, self.manifest['years'][0] if x0 is None else x0,
+                                self.manifest['years'][1] if x1 is None else x1)
+        level = self._array(f'{metric}_L{k}')
+        rows = [self._country_index[c] for c in countries]
+        block = np.asarray(level[rows, visible]) if rows else np.empty((0, 0, 3), np.float32)
+        return {
+            'level': k,
+            'bin_years': self.manifest['levels'][k]['bin_years'],
+            'x': self._centers[k][visible],
+            'overview': np.asarray(self._array(f'{metric}_overview_L{k}')[visible]),
+            'bands': dict(zip(countries, block))
+        }
+
+
+def trajectory_figure(store, metric, countries=(), x0=None, x1=None, budget=DEFAULT_POINT_BUDGET):
+    """
+    plotly figure dict (data + layout) of one metric: all-country fan plus
+    the selected countries
+
+    Up to MAX_BAND_COUNTRIES countries are drawn with their scenario bands;
+    larger selections are drawn as medians in a single WebGL trace. The dict
+    skips graph_objects validation (~100 ms per view); wrap it in
+    plotly.graph_objects.Figure to save or show it.
+    """
+    from plotly.colors import qualitative
+
+    view = store.series(metric, countries, x0, x1, budget)
+    x, fan = view['x'], view['overview']
+    data = []
+
+    def band(lower, upper, fillcolor, name, group, showlegend=True):
+        data.append({'type': 'scatter', 'x': x, 'y': lower, 'mode': 'lines', 'line': {'width': 0},
+                     'connectgaps': True, 'hoverinfo': 'skip', 'showlegend': False, 'legendgroup': group})
+        data.append({'type': 'scatter', 'x': x, 'y': upper, 'mode': 'lines', 'line': {'width': 0},
+                     'connectgaps': True, 'fill': 'tonexty', 'fillcolor': fillcolor, 'hoverinfo': 'skip',
+                     'name': name, 'showlegend': showlegend, 'legendgroup': group})
+
+    # All-country fan: p5-p95 and p25-p75 envelopes around the median
+    band(fan[:, 0], fan[:, 4], 'rgba(120,120,120,0.12)', 'All countries p5–p95', 'p5-p95')
+    band(fan[:, 1], fan[:, 3], 'rgba(120,120,120,0.22)', 'All countries p25–p75', 'p25-p75')
+    data.append({'type': 'scatter', 'x': x, 'y': fan[:, 2], 'mode': 'lines', 'name': 'All countries median',
+                 'line': {'color': 'rgb(90,90,90)', 'dash': 'dot'}})
+
+    bands = view['bands']
+    if len(bands) > MAX_BAND_COUNTRIES:
+        xs, ys, names = [], [], []
+        for country, values in bands.items():
+            keep = ~np.isnan(values[:, 1])
+            xs += [*x[keep].tolist(), None]
+            ys += [*values[keep, 1].tolist(), None]
+            names += [country] * (int(keep.sum()) + 1)
+        data.append({'type': 'scattergl', 'x': xs, 'y': ys, 'mode': 'lines', 'customdata': names,
+                     'name': f'{len(bands)} countries (median)',
+                     'line': {'width': 1, 'color': 'rgba(31,119,180,0.35)'},
+                     'hovertemplate': '%{customdata} %{x:.0f}: %{y:.3f}<extra></extra>'})
+    else:
+        palette = qualitative.Plotly
+        for i, (country, values) in enumerate(bands.items()):
+            color = palette[i % len(palette)]
+            band(values[:, 0], values[:, 2], _rgba(color, 0.25), country, country, showlegend=False)
+            data.append({'type': 'scatter', 'x': x, 'y': values[:, 1], 'mode': 'lines+markers',
+                         'name': country, 'connectgaps': True, 'legendgroup': country,
+                         'line': {'color': color, 'width': 2}, 'marker': {'size': 4}})
+
+    references = REFERENCE_LINES.get(metric, ())
+    xaxis = {'title': {'text': 'Year'}}
+    if x0 is not None and x1 is not None:
+        xaxis['range'] = [x0, x1]
+    layout = {
+        'title': {'text': f"{metric} trajectories ({view['bin_years']}-year bins, level {view['level']})"},
+        'xaxis': xaxis,
+        'yaxis': {'title': {'text': metric}},
+        'template': 'plotly_white',
+        'uirevision': metric,
+        'hovermode': 'closest',
+        'margin': {'t': 60, 'r': 20},
+        'shapes': [{'type': 'line', 'xref': 'paper', 'x0': 0, 'x1': 1, 'yref': 'y', 'y0': value, 'y1': value,
+                    'line': {'color': 'firebrick', 'width': 1, 'dash': 'dash'}} for value, _ in references],
+        'annotations': [{'xref': 'paper', 'x': 0, 'xanchor': 'left', 'yref': 'y', 'y': value,
+                         'yanchor': 'bottom', 'text': label, 'showarrow': False} for value, label in references]
+    }
+    return {'data': data, 'layout': layout}
+
+
+def _rgba(hex_color, alpha):
+    red, green, blue = (int(hex_color[i:i + 2], 16) for i in (1, 3, 5))
+    return f'rgba({red},{green},{blue},{alpha})'
+
+
+def figure_json(figure):
+    """JSON of a figure dict (numpy arrays as lists, NaN as null)"""
+    import plotly.io as pio
+    return pio.to_json(figure, validate=False)
+
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>EPT trajectories</title>
+<script src="/plotly.js"></script>
+<style>body{font-family:sans-serif;margin:12px} #controls{margin-bottom:8px} #countries{width:50%}</style>
+</head><body>
+<div id="controls">
+  <select id="metric">__METRICS__</select>
+  <input id="countries" list="names" placeholder="Countries, comma-separated, or * for all">
+  <datalist id="names">__COUNTRIES__</datalist>
+  <button id="show">Show</button>
+</div>
+<div id="chart" style="height:80vh"></div>
+<script>
+const chart = document.getElementById('chart');
+let range = null, timer = null, bound = false;
+async function draw() {
+  const q = new URLSearchParams({metric: document.getElementById('metric').value,
+                                 countries: document.getElementById('countries').value,
+                                 budget: Math.max(500, 2 * chart.clientWidth)});
+  if (range) { q.set('x0', range[0]); q.set('x1', range[1]); }
+  const fig = await (await fetch('/figure?' + q)).json();
+  await Plotly.react(chart, fig.data, fig.layout, {responsive: true});
+  if (!bound) {
+    bound = true;
+    chart.on('plotly_relayout', e => {
+      if ('xaxis.range[0]' in e) range = [e['xaxis.range[0]'], e['xaxis.range[1]']];
+      else if (e['xaxis.autorange']) range = null;
+      else return;
+      clearTimeout(timer);
+      timer = setTimeout(draw, 150);
+    });
+  }
+}
+document.getElementById('metric').onchange = draw;
+document.getElementById('show').onclick = draw;
+draw();
+</script></body></html>
+"""
+
+
+class DashboardHandler(BaseHTTPRequestHandler):
+    """GET /, /plotly.js, /figure?metric=&countries=&x0=&x1=&budget=, /manifest"""
+
+    store = None
+    plotly_js = None
+
+    def _send(self, status, body, content_type='application/json', cache=False):
+        body = body.encode('utf-8') if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if cache:
+            self.send_header('Cache-Control', 'max-age=86400')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        store = self.store
+        if url.path == '/':
+            metrics = ''.join(f'<option>{html.escape(m)}</option>' for m in store.metrics)
+            countries = ''.join(f'<option value="{html.escape(c)}">' for c in store.countries)
+            page = PAGE.replace('__METRICS__', metrics).replace('__COUNTRIES__', countries)
+            self._send(200, page, 'text/html; charset=utf-8')
+        elif url.path == '/plotly.js':
+            if self.plotly_js is None:
+                from plotly.offline import get_plotlyjs
+                type(self).plotly_js = get_plotlyjs().encode('utf-8')
+            self._send(200, self.plotly_js, 'application/javascript', cache=True)
+        elif url.path == '/manifest':
+            self._send(200, json.dumps({key: store.manifest[key] for key in ('countries', 'metrics', 'years')}))
+        elif url.path == '/figure':
+            try:
+                raw = query.get('countries', '').strip()
+                countries = store.countries if raw == '*' else [c.strip() for c in raw.split(',') if c.strip()]
+                x0, x1 = (float(query[key]) if key in query else None for key in ('x0', 'x1'))
+                budget = int(float(query.get('budget', DEFAULT_POINT_BUDGET)))
+                fig = trajectory_figure(store, query.get('metric', store.metrics[0]), countries, x0, x1, budget)
+            except (KeyError, ValueError) as exc:
+                self._send(400, json.dumps({'error': str(exc.args[0]) if exc.args else str(exc)}))
+                return
+            self._send(200, figure_json(fig))
+        else:
+            self._send(404, json.dumps({'error': f'no route {url.path}'}))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(store, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    handler = type('Handler', (DashboardHandler,), {'store': store})
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"Trajectory dashboard on http://{host}:{port} "
+          f"({len(store.countries)} countries, {', '.join(store.metrics)}); Ctrl-C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def _case_store():
+    """Panel store directory, (re)built from the analysis CSVs if missing or stale"""
+    from panel_store import STORE_DIR, current_store
+    current_store(build=True)
+    return STORE_DIR
+
+
+def case_panel():
+    """CF, CLI, FSI and SP of the three cases from the panel store (point estimates)"""
+    from panel_store import open_store
+    return open_store(_case_store()).scan(metric=list(DASHBOARD_METRICS))
+
+
+def tile_source(synthetic=None, seed=0):
+    """
+    Manifest description of a tile source: the case panel store (by a hash
+    of its manifest and column files) or a synthetic panel (by country
+    count and seed)
+    """
+    if synthetic is not None:
+        return {'kind': 'synthetic', 'countries': synthetic, 'seed': seed}
+    digest = hashlib.sha256()
+    for file in sorted(_case_store().iterdir()):
+        digest.update(file.name.encode())
+        digest.update(file.read_bytes())
+    return {'kind': 'cases', 'store_sha256': digest.hexdigest()}
+
+
+def simulate_panel(countries=190, years=(1950, 2025), seed=None):
+    """
+    Synthetic long panel with scenario bands for every country-year-metric
+
+    Components follow bounded random walks, CF is constitutional_fitness of
+    the components, FSI comes from fsi_engine.simulate_fiscal_panel. Bands
+    widen with each country's scenario uncertainty.
+    """
+    from fsi_engine import fiscal_sustainability, simulate_fiscal_panel
+
+    rng = np.random.default_rng(seed)
+    grid = np.arange(years[0], years[1] + 1)
+    shape = (countries, len(grid))
+
+    def walk(start, drift, sd):
+        steps = rng.normal(drift, sd, shape)
+        return np.clip(rng.uniform(*start, (countries, 1)) + np.cumsum(steps, axis=1), 0.01, 0.99)
+
+    cli = walk((0.10, 0.50), 0.004, 0.015)
+    sp = walk((0.30, 0.70), 0.0, 0.025)
+    pe = walk((0.20, 0.60), 0.0, 0.02)
+    gap = walk((0.20, 0.60), 0.0, 0.02)
+    cd = walk((0.20, 0.50), 0.0, 0.01)
+    fiscal = simulate_fiscal_panel(countries, years, seed=rng.integers(2**32))
+    fsi = fiscal_sustainability(*(fiscal[c].to_numpy() for c in ('Revenue_GDP_%', 'Spending_GDP_%', 'Debt_GDP_%')))
+    values = {
+        'CF': constitutional_fitness(pe, gap, cd, sp, cli),
+        'CLI': cli,
+        'FSI': fsi.reshape(shape),
+        'SP': sp
+    }
+
+    spread = rng.uniform(0.05, 0.20, (countries, 1)) * 1.645
+    names = np.repeat([f'C{i:03d}' for i in range(countries)], len(grid))
+    frames = []
+    for metric, q50 in values.items():
+        frames.append(pd.DataFrame({
+            'Country': names,
+            'Year': np.tile(grid, countries),
+            'Metric': metric,
+            'q5': (q50 * np.exp(-spread)).ravel(),
+            'q50': q50.ravel(),
+            'q95': (q50 * np.exp(spread)).ravel()
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_or_build(path=TILE_DIR, synthetic=None, rebuild=False, seed=0):
+    """
+    TileStore at path, (re)building it from the case panel (or synthetic)
+    if missing, of another format, or built from a different source
+    """
+    path = Path(path)
+    source = tile_source(synthetic, seed)
+    if not rebuild and (path / 'manifest.json').exists():
+        with open(path / 'manifest.json', encoding='utf-8') as f:
+            manifest = json.load(f)
+        rebuild = manifest.get('format_version') != FORMAT_VERSION or manifest.get('source') != source
+    else:
+        rebuild = True
+    if rebuild:
+        panel = case_panel() if synthetic is None else simulate_panel(synthetic, seed=seed)
+        build_tiles(panel, path, source)
+    return TileStore(path)
+
+
+def demo():
+    import tempfile
+
+    print("="*70)
+    print("TRAJECTORY DASHBOARD: LEVEL-OF-DETAIL PAYLOADS (190 COUNTRIES)")
+    print("="*70)
+
+    panel = simulate_panel(190, (1950, 2025), seed=0)
+    raw_bytes = len(panel.to_csv(index=False).encode('utf-8'))
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        store = TileStore(build_tiles(panel, tmp))
+        built = time.perf_counter() - start
+        tile_bytes = sum(p.stat().st_size for p in Path(tmp).iterdir())
+        print(f"\nPanel: {len(panel):,} rows ({raw_bytes/1e6:.1f} MB as CSV); "
+              f"tiles built in {built:.2f} s ({tile_bytes/1e6:.1f} MB, "
+              f"{len(store.manifest['levels'])} levels)")
+
+        views = [
+            ('All countries, full range', store.countries, None, None),
+            ('All countries, 1990-2000', store.countries, 1990, 2000),
+            ('12 countries, full range', store.countries[:12], None, None),
+            ('One country, full range', store.countries[:1], None, None)
+        ]
+        print(f"\n{'View':30s} {'Level':>5s} {'Years':>5s} {'Points':>7s} {'Payload':>9s} {'Time':>8s}")
+        for label, countries, x0, x1 in views:
+            start = time.perf_counter()
+            view = store.series('CF', countries, x0, x1)
+            if _has_plotly():
+                payload = len(figure_json(trajectory_figure(store, 'CF', countries, x0, x1)))
+            else:
+                payload = sum(v.nbytes for v in view['bands'].values()) + view['overview'].nbytes
+            elapsed = time.perf_counter() - start
+            points = len(view['x']) * (len(countries) + 1)
+            print(f"{label:30s} {view['level']:5d} {view['bin_years']:5d} {points:7,d} "
+                  f"{payload/1e3:7.0f} kB {elapsed*1e3:6.1f} ms")
+
+    print(f"\nPoint budget {DEFAULT_POINT_BUDGET:,} per view (the page requests ~2 points per pixel)")
+    print(f"{ESTIMATION} - Synthetic panel for load testing; case tiles use panel_store point estimates")
+    print("="*70)
+
+
+def _has_plotly():
+    try:
+        import plotly  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Interactive CF/CLI/FSI/SP trajectory dashboard')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--tiles', default=TILE_DIR, help='Tile directory')
+    parser.add_argument('--synthetic', type=int, default=None, metavar='N',
+                        help='Build tiles from N synthetic countries instead of the case panel')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic panel')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Rebuild tiles before serving (otherwise only when the source changed)')
+    parser.add_argument('--demo', action='store_true', help='Print an offline LOD/payload report and exit')
+    args = parser.parse_args()
+
+    if args.demo:
+        demo()
+        return
+    if not _has_plotly():
+        parser.error("the dashboard needs plotly (pip install -r requirements.txt)")
+    serve(load_or_build(args.tiles, args.synthetic, args.rebuild, args.seed), args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
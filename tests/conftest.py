@@ -0,0 +1,11 @@
+"""
+Shared pytest setup: the analysis scripts import their siblings directly,
+so ANALYSIS/ is put on sys.path (as when running them from that directory)
+"""
+
+import sys
+from pathlib import Path
+
+ANALYSIS_DIR = Path(__file__).resolve().parent.parent / 'ANALYSIS'
+if str(ANALYSIS_DIR) not in sys.path:
+    sys.path.insert(0, str(ANALYSIS_DIR))
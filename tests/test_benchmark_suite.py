@@ -0,0 +1,41 @@
+"""Benchmark suite: baseline merge and regression flags (no timing assertions)"""
+
+from benchmark_suite import MEMORY_SLACK, TIME_SLACK, compare, load_baseline, run_case, save_baseline
+
+
+def result(case, n, seconds, peak_bytes):
+    return {'case': case, 'n': n, 'seconds': seconds, 'peak_bytes': peak_bytes, 'loops': 1}
+
+
+def test_compare_flags_only_regressions():
+    baseline = {'results': {
+        'cf_engine@100': result('cf_engine', 100, 1.0, 10 * MEMORY_SLACK),
+        'score_panel@100': result('score_panel', 100, 1.0, 10 * MEMORY_SLACK)
+    }}
+    results = {
+        'cf_engine@100': result('cf_engine', 100, 1.4, 12 * MEMORY_SLACK),      # within tolerance
+        'score_panel@100': result('score_panel', 100, 1.6 + TIME_SLACK, 10 * MEMORY_SLACK),
+        'fsi_engine@100': result('fsi_engine', 100, 9.0, 10 * MEMORY_SLACK)    # no baseline yet
+    }
+    table = compare(results, baseline).set_index('Case')
+    assert table['Regressed'].to_dict() == {'cf_engine': False, 'score_panel': True, 'fsi_engine': False}
+    assert table.loc['cf_engine', 'Time_Ratio'] == 1.4
+
+    heavy = {'cf_engine@100': result('cf_engine', 100, 1.0, 20 * MEMORY_SLACK)}
+    assert compare(heavy, baseline)['Regressed'].all()
+
+
+def test_baseline_merges_runs(tmp_path):
+    path = tmp_path / 'baseline.json'
+    assert load_baseline(path) is None
+    save_baseline({'a@1': result('a', 1, 1.0, 1)}, path)
+    save_baseline({'b@1': result('b', 1, 2.0, 2)}, path)
+    saved = load_baseline(path)
+    assert set(saved['results']) == {'a@1', 'b@1'}
+    assert 'python' in saved['machine']
+
+
+def test_run_case_measures_each_scale():
+    results = run_case('cf_engine', scales=(1, 100), repeat=1)
+    assert set(results) == {'cf_engine@1', 'cf_engine@100'}
+    assert all(r['seconds'] > 0 and r['peak_bytes'] >= 0 for r in results.values())
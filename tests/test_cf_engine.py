@@ -0,0 +1,31 @@
+"""cf_engine against the CF computed by the three case analyses"""
+
+import numpy as np
+import pytest
+
+from argentina_paradox_analysis import run_argentina_paradox
+from cf_engine import EPSILON, constitutional_fitness, score_panel, stack_components
+from chile_h2_analysis import run_h2_chile
+from colombia_h1_analysis import run_h1_colombia
+
+
+@pytest.fixture(scope='module', params=[run_h1_colombia, run_h2_chile, run_argentina_paradox],
+                ids=['colombia', 'chile', 'argentina'])
+def case(request):
+    return request.param()
+
+
+def test_case_cf_matches_formula(case):
+    expected = (case.pe * (1 - case.gap) * (1 - case.cd) * case.sp) / (case.cli + EPSILON)
+    np.testing.assert_allclose(case.cf, expected, rtol=1e-12)
+
+
+def test_score_panel_matches_case(case):
+    panel = stack_components(case.pe, case.gap, case.cd, case.sp, case.cli)
+    np.testing.assert_allclose(score_panel(panel), case.cf, rtol=1e-12)
+
+
+def test_scalar_input_returns_float():
+    cf = constitutional_fitness(0.62, 0.12, 0.35, 0.47, 0.45)
+    assert isinstance(cf, float)
+    assert cf == pytest.approx(0.62 * 0.88 * 0.65 * 0.47 / 0.46)
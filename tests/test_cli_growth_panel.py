@@ -0,0 +1,44 @@
+"""Batched growth regressions against scipy.stats.linregress"""
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from cli_growth_panel import BASE_YEAR, fit_growth, rolling_growth
+
+
+@pytest.fixture(scope='module')
+def panel():
+    rng = np.random.default_rng(0)
+    years = np.arange(1949, 2026)
+    values = 0.45 + 0.0055 * (years - BASE_YEAR) + rng.normal(0, 0.02, (12, len(years)))
+    values[rng.random(values.shape) < 0.2] = np.nan      # gaps
+    return years, values
+
+
+def _linregress(years, row):
+    mask = ~np.isnan(row)
+    return stats.linregress(years[mask] - BASE_YEAR, row[mask])
+
+
+def test_fit_growth_matches_linregress(panel):
+    years, values = panel
+    result = fit_growth(years, values)
+    for i, row in enumerate(values):
+        expected = _linregress(years, row)
+        assert result['slope'][i] == pytest.approx(expected.slope, rel=1e-9)
+        assert result['intercept'][i] == pytest.approx(expected.intercept, rel=1e-9)
+        assert result['r_squared'][i] == pytest.approx(expected.rvalue ** 2, rel=1e-9)
+        assert result['stderr'][i] == pytest.approx(expected.stderr, rel=1e-7)
+        assert result['p_value'][i] == pytest.approx(expected.pvalue, rel=1e-6, abs=1e-300)
+
+
+def test_rolling_growth_matches_linregress(panel):
+    years, values = panel
+    window = 15
+    starts, result = rolling_growth(years, values, window)
+    for j in (0, 20, len(starts) - 1):
+        columns = slice(j, j + window)
+        for i in (0, 5):
+            expected = _linregress(years[columns], values[i, columns])
+            assert result['slope'][i, j] == pytest.approx(expected.slope, rel=1e-9)
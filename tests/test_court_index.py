@@ -0,0 +1,126 @@
+"""CourtIndex incremental ingest, re-ingest and rewrite detection"""
+
+import json
+
+import pytest
+
+import court_index
+from court_index import FIELDS, CourtIndex
+
+
+def _decision(id_, doctrine, cites, outcome='unconstitutional'):
+    return {'id': id_, 'country': 'Colombia', 'court': 'Corte Constitucional',
+            'date': '2000-05-10', 'doctrines': [doctrine], 'outcome': outcome, 'cites': cites}
+
+
+def _write(path, decisions, mode='w'):
+    with open(path, mode, encoding='utf-8') as f:
+        for decision in decisions:
+            f.write(json.dumps(decision) + '\n')
+
+
+def _children(index):
+    doctrines = index.db.execute("SELECT decision_id, doctrine FROM doctrines ORDER BY 1, 2").fetchall()
+    citations = index.db.execute("SELECT citing, cited FROM citations ORDER BY 1, 2").fetchall()
+    return doctrines, citations
+
+
+@pytest.fixture
+def index():
+    with CourtIndex(':memory:') as index:
+        yield index
+
+
+def test_append_parses_only_new_lines(tmp_path, index):
+    corpus = tmp_path / 'decisions.jsonl'
+    _write(corpus, [_decision('C-1', 'd1', []), _decision('C-2', 'd2', ['C-1'])])
+    assert index.update(corpus) == {str(corpus): 2}
+    assert index.update(corpus) == {str(corpus): 0}
+    _write(corpus, [_decision('C-3', 'd1', ['C-2'])], mode='a')
+    assert index.update(corpus) == {str(corpus): 1}
+    assert len(index) == 3
+
+
+def test_partial_last_line_waits(tmp_path, index):
+    corpus = tmp_path / 'decisions.jsonl'
+    _write(corpus, [_decision('C-1', 'd1', [])])
+    with open(corpus, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(_decision('C-2', 'd2', []))[:20])
+    assert index.update(corpus) == {str(corpus): 1}
+
+
+def test_same_size_rewrite_is_reindexed(tmp_path, index):
+    corpus = tmp_path / 'decisions.jsonl'
+    _write(corpus, [_decision('C-1', 'd1', ['X-1']), _decision('C-2', 'd2', [])])
+    index.update(corpus)
+    # Same byte length, different content: only the prefix hash can tell
+    _write(corpus, [_decision('C-1', 'd9', ['X-9']), _decision('C-2', 'd2', [])])
+    assert index.update(corpus) == {str(corpus): 2}
+    assert _children(index) == ([('C-1', 'd9'), ('C-2', 'd2')], [('C-1', 'X-9')])
+
+
+def test_shrunk_file_is_reindexed(tmp_path, index):
+    corpus = tmp_path / 'decisions.jsonl'
+    _write(corpus, [_decision('C-1', 'd1', []), _decision('C-2', 'd2', [])])
+    index.update(corpus)
+    _write(corpus, [_decision('C-3', 'd3', [])])
+    assert index.update(corpus) == {str(corpus): 1}
+    assert len(index) == 1
+
+
+def test_reingested_id_replaces_children(tmp_path, index):
+    corpus = tmp_path / 'decisions.jsonl'
+    _write(corpus, [_decision('C-1', 'd1', ['X-1'])])
+    index.update(corpus)
+    _write(corpus, [_decision('C-1', 'd2', ['X-2'], outcome='constitutional')], mode='a')
+    index.update(corpus)
+    assert len(index) == 1
+    assert _children(index) == ([('C-1', 'd2')], [('C-1', 'X-2')])
+    assert index.counts(by=('outcome',))['Outcome'].tolist() == ['constitutional']
+
+
+def test_unchanged_file_is_not_read(tmp_path, index, monkeypatch):
+    corpus = tmp_path / 'decisions.jsonl'
+    _write(corpus, [_decision('C-1', 'd1', [])])
+    index.update(corpus)
+    # Not racy: the file's mtime is well before the recorded check
+    monkeypatch.setattr(court_index, 'RACY_NS', 0)
+
+    def unexpected(f, offset):
+        raise AssertionError("unchanged file was read")
+    monkeypatch.setattr(court_index, '_window_hash', unexpected)
+    assert index.update(corpus) == {str(corpus): 0}
+
+
+def test_only_verify_windows_are_checked(tmp_path, index, monkeypatch):
+    monkeypatch.setattr(court_index, 'VERIFY_WINDOW', 200)
+    corpus = tmp_path / 'decisions.jsonl'
+    decisions = [_decision(f'C-{i:03d}', 'd1', []) for i in range(30)]
+    _write(corpus, decisions)
+    index.update(corpus)
+
+    # A same-size edit in the middle, outside both windows, goes unnoticed...
+    decisions[15] = _decision('C-015', 'd2', [])
+    _write(corpus, decisions)
+    assert index.update(corpus) == {str(corpus): 0}
+    # ...until a rebuild
+    assert index.update(corpus, rebuild=True) == {str(corpus): 30}
+    assert ('C-015', 'd2') in _children(index)[0]
+
+    # An edit in the tail window is detected
+    decisions[-1] = _decision('C-029', 'd3', [])
+    _write(corpus, decisions)
+    assert index.update(corpus) == {str(corpus): 30}
+    assert ('C-029', 'd3') in _children(index)[0]
+
+
+def test_year_field_when_date_is_missing(tmp_path):
+    corpus = tmp_path / 'decisions.jsonl'
+    record = _decision('C-1', 'd1', [])
+    del record['date']
+    record['anio'] = 1997
+    _write(corpus, [record])
+    assert FIELDS['year'] == 'year'
+    with CourtIndex(':memory:', fields={'year': 'anio'}) as index:
+        index.update(corpus)
+        assert index.components('Colombia')['Year'].tolist() == [1997]
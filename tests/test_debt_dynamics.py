@@ -0,0 +1,57 @@
+"""Debt paths: support envelope, streaming quantiles and the zero-debt floor"""
+
+import numpy as np
+import pytest
+
+from cf_engine import GAP_CHILE_WEIGHTS
+from debt_dynamics import (COLOMBIA_2025, FISCAL_GAP_WEIGHT, MIN_DEBT, colombia_base_components,
+                           fsi_to_cf, project, simulate_debt_paths, support_envelope)
+
+SCENARIOS = {
+    'fiscal_rule': COLOMBIA_2025,
+    'no_consolidation': {**COLOMBIA_2025, 'adjustment': 0.0, 'reaction': 0.0}
+}
+
+
+@pytest.fixture(scope='module')
+def base():
+    return colombia_base_components()
+
+
+def test_fiscal_weight_is_shared():
+    assert FISCAL_GAP_WEIGHT == GAP_CHILE_WEIGHTS['fiscal_gap']
+
+
+@pytest.mark.parametrize('scenario', SCENARIOS.values(), ids=SCENARIOS.keys())
+def test_paths_stay_in_support_envelope(scenario):
+    paths = simulate_debt_paths(scenario, 10, 100_000, np.random.default_rng(0))
+    bounds = support_envelope(scenario, 10)
+    for name in ('Debt', 'FSI'):
+        low, high = bounds[name]
+        assert (paths[name] >= low * (1 - 1e-12)).all()
+        assert (paths[name] <= high * (1 + 1e-12)).all()
+
+
+@pytest.mark.parametrize('scenario', SCENARIOS.values(), ids=SCENARIOS.keys())
+def test_streaming_quantiles_match_draws(scenario, base):
+    projection = project(scenario, base, horizon=10, n_paths=60_000, chunk_size=20_000, seed=5)
+    rng = np.random.default_rng(5)
+    chunks = [simulate_debt_paths(scenario, 10, 20_000, rng) for _ in range(3)]
+    draws = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in ('Debt', 'FSI')}
+    draws['CF'], _ = fsi_to_cf(draws['FSI'], base, base['FSI'])
+    for name, values in draws.items():
+        rows = projection[projection['Metric'] == name]
+        np.testing.assert_allclose(rows['Mean'], values.mean(axis=0), rtol=1e-9)
+        expected = np.quantile(values, [0.05, 0.5, 0.95], axis=0).T
+        np.testing.assert_allclose(rows[['q5', 'q50', 'q95']], expected, rtol=1e-3)
+
+
+def test_debt_paid_off_keeps_fsi_finite(base):
+    scenario = {**COLOMBIA_2025, 'debt': 2.0, 'pb_target': 5.0, 'adjustment': 1.0}
+    paths = simulate_debt_paths(scenario, 5, 10_000, np.random.default_rng(1))
+    assert (paths['Debt'][:, -1] == MIN_DEBT).mean() > 0.5
+    assert np.isfinite(paths['FSI']).all()
+    cf, gap = fsi_to_cf(paths['FSI'], base, base['FSI'])
+    assert np.isfinite(cf).all()
+    projection = project(scenario, base, horizon=5, n_paths=10_000, seed=1)
+    assert np.isfinite(projection[['Mean', 'Std', 'q5', 'q95']].to_numpy()).all()
@@ -0,0 +1,76 @@
+"""ept command line: scoring, simulation, export and usage errors"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ept
+from cf_engine import constitutional_fitness
+from chile_h2_analysis import run_h2_chile
+
+
+def run(capsys, *argv):
+    ept.main(list(argv))
+    return capsys.readouterr().out
+
+
+def test_score_one_point(capsys):
+    out = run(capsys, 'score', 'cf', 'pe=0.62', 'gap=0.12', 'cd=0.35', 'sp=0.47', 'cli=0.45')
+    assert float(out) == pytest.approx(constitutional_fitness(0.62, 0.12, 0.35, 0.47, 0.45), rel=1e-9)
+    assert float(run(capsys, 'score', 'cf_chile')) == pytest.approx(run_h2_chile().cf[0], rel=1e-9)
+
+
+def test_score_csv_rows(tmp_path, capsys):
+    rows = pd.DataFrame({'pe': [0.62, 0.30], 'gap': [0.12, 0.50], 'sp': [0.47, 0.40]})
+    rows.to_csv(tmp_path / 'rows.csv', index=False)
+    run(capsys, 'score', 'cf', 'cd=0.35', 'cli=0.45', '--csv', str(tmp_path / 'rows.csv'),
+        '--out', str(tmp_path / 'scored.csv'))
+    scored = pd.read_csv(tmp_path / 'scored.csv')
+    np.testing.assert_allclose(scored['cf'], constitutional_fitness(rows['pe'], rows['gap'], 0.35,
+                                                                    rows['sp'], 0.45))
+
+
+@pytest.mark.parametrize('argv, message', [
+    (['score', 'nope'], 'unknown metric'),
+    (['score', 'cf', 'pe=0.5'], 'missing argument'),
+    (['score', 'cf', 'pe=high'], 'is not a number'),
+    (['simulate', 'fossilization', '--set', 'speed=1'], 'unknown parameter'),
+])
+def test_usage_errors_exit_2(argv, message, capsys):
+    with pytest.raises(SystemExit) as exc:
+        ept.main(argv)
+    assert exc.value.code == 2
+    assert message in capsys.readouterr().err
+
+
+def test_simulate_models(tmp_path, capsys):
+    run(capsys, 'simulate', 'fossilization', '--size', '2000', '--seed', '0', '--calibrated',
+        '--out', str(tmp_path / 'fossil.csv'))
+    summary = pd.read_csv(tmp_path / 'fossil.csv')
+    assert summary['countries'].iloc[0] == 2000
+
+    run(capsys, 'simulate', 'markov', '--size', '501', '--calibrated', '--out', str(tmp_path / 'markov.csv'))
+    absorption = pd.read_csv(tmp_path / 'markov.csv')
+    assert len(absorption) == 501
+
+    out = run(capsys, 'simulate', 'montecarlo', '--size', '20000', '--seed', '1', '--set', 'popular_support=0.58')
+    assert 'CF' in out
+
+
+def test_export_cases_json(tmp_path, capsys):
+    run(capsys, 'export', 'cases', '--format', 'json', '--out', str(tmp_path / 'cases.json'))
+    records = json.loads((tmp_path / 'cases.json').read_text(encoding='utf-8'))
+    assert {r['Country'] for r in records} == {'Colombia', 'Chile', 'Argentina'}
+
+
+def test_score_imports_no_pandas_or_scipy():
+    code = ("import sys, ept; ept.main(['score', 'sp']); "
+            "print(sorted(m for m in ('pandas', 'scipy', 'matplotlib') if m in sys.modules))")
+    out = subprocess.run([sys.executable, '-c', code], cwd=Path(ept.__file__).parent, capture_output=True,
+                         text=True, check=True).stdout.splitlines()
+    assert out[-1] == '[]'
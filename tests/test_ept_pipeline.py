@@ -0,0 +1,95 @@
+"""Pipeline cache hits, parameter and dependency invalidation, quiet runs"""
+
+import importlib
+import logging
+import sys
+import textwrap
+
+import pytest
+
+from ept_pipeline import Pipeline, colombia_pipeline, module_dependencies
+
+STAGES = '''
+import logging
+
+from pipeline_constants import RATE
+
+logger = logging.getLogger(__name__)
+
+
+def base(x=1, label=''):
+    logger.info("base x=%s", x)
+    return x * RATE
+
+
+def double(value):
+    return 2 * value
+'''
+
+
+@pytest.fixture
+def stages(tmp_path, monkeypatch):
+    (tmp_path / 'pipeline_constants.py').write_text('RATE = 3\n')
+    (tmp_path / 'pipeline_stages.py').write_text(textwrap.dedent(STAGES))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module('pipeline_stages')
+    yield module, tmp_path
+    for name in ('pipeline_stages', 'pipeline_constants'):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+
+
+def build(module, cache_dir):
+    return (Pipeline('toy', cache_dir)
+            .add('base', module.base)
+            .add('double', module.double, inputs={'value': ('base', None)}))
+
+
+def test_second_run_is_cached(stages, tmp_path):
+    module, _ = stages
+    assert build(module, tmp_path / 'cache').run() == {'base': 3, 'double': 6}
+    pipeline = build(module, tmp_path / 'cache')
+    assert pipeline.run() == {'base': 3, 'double': 6}
+    assert pipeline.last_run == {'base': 'cached', 'double': 'cached'}
+
+
+def test_param_change_recomputes(stages, tmp_path):
+    module, _ = stages
+    pipeline = build(module, tmp_path / 'cache')
+    pipeline.run()
+    assert pipeline.run(params={'base': {'x': 2}})['double'] == 12
+    assert pipeline.last_run == {'base': 'computed', 'double': 'computed'}
+    # Same output from new params: downstream is cut off
+    pipeline.run(params={'base': {'label': 'renamed'}})
+    assert pipeline.last_run == {'base': 'computed', 'double': 'cached'}
+
+
+def test_dependency_edit_invalidates(stages, tmp_path):
+    module, directory = stages
+    assert {path.name for path in module_dependencies('pipeline_stages')} == {
+        'pipeline_stages.py', 'pipeline_constants.py'}
+    build(module, tmp_path / 'cache').run()
+    (directory / 'pipeline_constants.py').write_text('RATE = 4\n')
+    importlib.reload(importlib.import_module('pipeline_constants'))
+    module = importlib.reload(module)
+    pipeline = build(module, tmp_path / 'cache')
+    assert pipeline.run() == {'base': 4, 'double': 8}
+    assert pipeline.last_run == {'base': 'computed', 'double': 'computed'}
+
+
+def test_quiet_silences_stage_logging(stages, tmp_path, caplog):
+    module, _ = stages
+    caplog.set_level(logging.INFO)
+    build(module, tmp_path / 'quiet').run(quiet=True)
+    assert not caplog.records
+    assert logging.getLogger('pipeline_stages').level == logging.NOTSET
+    build(module, tmp_path / 'loud').run(quiet=False)
+    assert [record.getMessage() for record in caplog.records] == ['base x=1']
+
+
+def test_colombia_pipeline_reuses_cache(tmp_path):
+    first = colombia_pipeline(tmp_path).run()
+    pipeline = colombia_pipeline(tmp_path)
+    second = pipeline.run()
+    assert set(pipeline.last_run.values()) == {'cached'}
+    assert second['cf'].equals(first['cf'])
+    assert 'cf_engine.py' in {path.name for path in module_dependencies('colombia_h1_analysis')}
@@ -0,0 +1,42 @@
+"""Print-free case API: typed results and lazily formatted logging"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from argentina_paradox_analysis import run_argentina_paradox
+from chile_h2_analysis import run_h2_chile
+from colombia_h1_analysis import run_h1_colombia
+from ept_results import METRICS, TableText
+
+
+@pytest.mark.parametrize('run', [run_h1_colombia, run_h2_chile, run_argentina_paradox])
+def test_case_results_are_aligned(run, capsys):
+    result = run()
+    n = len(result.years)
+    for name in METRICS:
+        assert result.metric(name).shape == (n,)
+    assert list(result.to_frame().columns[:2]) == ['Country', 'Year']
+    assert capsys.readouterr().out == ''
+
+
+def test_tables_are_not_rendered_below_info(monkeypatch, caplog):
+    rendered = []
+    original = pd.DataFrame.to_string
+    monkeypatch.setattr(pd.DataFrame, 'to_string', lambda self, *a, **k: rendered.append(1) or original(self, *a, **k))
+
+    caplog.set_level(logging.WARNING)
+    run_h1_colombia()
+    assert rendered == []
+
+    caplog.set_level(logging.INFO)
+    run_h1_colombia()
+    assert rendered
+    assert any('Constitutional Fitness Trajectory' in message for message in caplog.messages)
+
+
+def test_table_text_matches_to_string():
+    df = pd.DataFrame({'Year': [1991, 2025], 'CF': np.array([0.5, 0.25])})
+    assert str(TableText(df)) == df.to_string(index=False)
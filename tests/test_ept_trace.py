@@ -0,0 +1,89 @@
+"""Span timing, counters, bounded events and exports of the EPT tracer"""
+
+import csv
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from colombia_h1_analysis import run_h1_colombia
+from ept_trace import Tracer, save_frame, tracing
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer()
+
+    @tracer.traced
+    def calculate_something():
+        return np.zeros(5)
+
+    assert calculate_something().shape == (5,)
+    tracer.count('rows', 5)
+    assert tracer.events == [] and tracer.stats == {} and tracer.counters == {}
+
+
+def test_nested_spans_split_self_time():
+    tracer = Tracer().start()
+    with tracer.span('outer'):
+        time.sleep(0.01)
+        with tracer.span('inner', 'load'):
+            time.sleep(0.02)
+    stats = {row['Name']: row for row in tracer.summary()}
+    outer, inner = stats['outer'], stats['inner']
+    assert inner['Category'] == 'load'
+    assert outer['Total_ms'] >= inner['Total_ms'] + 10 * 0.9
+    assert abs(outer['Self_ms'] - (outer['Total_ms'] - inner['Total_ms'])) < 0.01
+    assert [row['Name'] for row in tracer.summary()] == ['outer', 'inner']
+
+
+def test_traced_records_rows_and_categories():
+    tracer = Tracer().start()
+
+    @tracer.traced
+    def calculate_panel():
+        return np.ones(3), pd.DataFrame({'x': range(7)})
+
+    @tracer.traced
+    def load_rows():
+        return np.ones((4, 2))
+
+    calculate_panel()
+    calculate_panel()
+    load_rows()
+    stats = {row['Name'].rsplit('.', 1)[-1]: row for row in tracer.summary()}
+    assert (stats['calculate_panel']['Category'], stats['calculate_panel']['Calls'],
+            stats['calculate_panel']['Rows']) == ('calculate', 2, 14)
+    assert (stats['load_rows']['Category'], stats['load_rows']['Rows']) == ('load', 4)
+    assert tracer.counters['rows'] == 18
+
+
+def test_events_are_bounded_but_statistics_are_not():
+    tracer = Tracer(max_events=5).start()
+    for _ in range(20):
+        with tracer.span('step'):
+            pass
+    assert len(tracer.events) == 5
+    assert tracer.dropped == 15
+    assert tracer.summary()[0]['Calls'] == 20
+
+
+def test_case_run_exports_trace_and_summary(tmp_path):
+    prefix = tmp_path / 'run'
+    with tracing(prefix) as tracer:
+        run_h1_colombia()
+        save_frame(pd.DataFrame({'a': range(10)}), tmp_path / 'out.csv')
+    assert not tracer.enabled
+
+    trace = json.loads((tmp_path / 'run.trace.json').read_text(encoding='utf-8'))
+    names = {event['name'] for event in trace['traceEvents']}
+    assert 'colombia_h1_analysis.calculate_fsi_colombia' in names
+    assert trace['metadata']['counters']['rows_written'] == 10
+    assert trace['metadata']['counters']['bytes_written'] == (tmp_path / 'out.csv').stat().st_size
+
+    with open(tmp_path / 'run.csv', encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    categories = {row['Name']: row['Category'] for row in rows}
+    assert categories['colombia_h1_analysis.calculate_cli_colombia_trajectory'] == 'calculate'
+    assert categories['save out.csv'] == 'save'
+    assert categories['bytes_written'] == 'counter'
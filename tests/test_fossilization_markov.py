@@ -0,0 +1,59 @@
+"""Exact Markov chain solutions against the fossilization_sim Monte Carlo"""
+
+import numpy as np
+import pytest
+
+from fossilization_markov import ReformChain, fossilization_profile
+from fossilization_sim import FOSSILIZED_CLI, calibrated_fail_increment, simulate
+
+PARAMS = {'fail_increment': calibrated_fail_increment()}
+
+
+@pytest.fixture(scope='module')
+def chain():
+    return ReformChain(PARAMS, n_states=5_001)
+
+
+@pytest.fixture(scope='module')
+def paths():
+    return simulate(200_000, PARAMS, seed=0, keep_paths=True)['CLI']
+
+
+def test_profile_matches_monte_carlo(chain, paths):
+    profile = fossilization_profile(chain)
+    hit = np.maximum.accumulate(paths >= FOSSILIZED_CLI, axis=1).mean(axis=0)
+    np.testing.assert_allclose(profile['CLI_Mean'], paths.mean(axis=0), atol=0.005)
+    np.testing.assert_allclose(profile['P_Fossilized'], hit, atol=0.01)
+
+
+def test_absorption_probabilities_sum_to_one(chain):
+    absorption = chain.absorption(reformed=0.20)
+    transient = absorption['Expected_Years'] > 0
+    total = absorption.loc[transient, 'P_Fossilized'] + absorption.loc[transient, 'P_Reformed']
+    np.testing.assert_allclose(total, 1.0, atol=1e-8)
+
+
+def test_absorption_matches_first_passage_monte_carlo():
+    # Start at CLI 0.30, where both outcomes are likely (~21% fossilize)
+    params = {**PARAMS, 'start_cli': 0.30}
+    n = 20_000
+    chain = ReformChain(params, n_states=5_001)
+    exact = chain.absorption(reformed=0.20).iloc[chain.state_of(0.30)]
+
+    paths = simulate(n, params, years=(0, 600), seed=0, keep_paths=True)['CLI']
+    never = paths.shape[1]
+    first = [np.where(hit.any(axis=1), hit.argmax(axis=1), never)
+             for hit in (paths >= FOSSILIZED_CLI, paths <= 0.20)]
+    fossilized = first[0] < first[1]
+    years = np.minimum(*first)
+    assert (years < never).all()
+
+    p = fossilized.mean()
+    assert abs(exact['P_Fossilized'] - p) < 3 * np.sqrt(p * (1 - p) / n)
+    assert abs(exact['Expected_Years'] - years.mean()) < 3 * years.std() / np.sqrt(n)
+
+
+def test_stationary_is_fixed_point(chain):
+    pi = chain.stationary()
+    assert pi.sum() == pytest.approx(1.0)
+    np.testing.assert_allclose(chain.P.T @ pi, pi, atol=1e-9)
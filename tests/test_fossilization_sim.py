@@ -0,0 +1,61 @@
+"""Lockstep reform-cycle simulation and its calibration"""
+
+import numpy as np
+import pytest
+
+import fossilization_sim
+from fossilization_sim import (CALIBRATED_FAIL_INCREMENT, CALIBRATION_INPUTS, DEFAULT_PARAMS,
+                               TARGET_GROWTH_RATE, YEARS, calibrate, calibrated_fail_increment,
+                               simulate, summarize)
+
+
+def test_running_slope_matches_stored_paths():
+    result = simulate(2_000, {'noise': 0.01}, seed=1, keep_paths=True)
+    x = np.arange(result['CLI'].shape[1])
+    slopes = np.polyfit(x, result['CLI'].T.astype(np.float64), 1)[0]
+    np.testing.assert_allclose(result['Slope'], slopes, atol=1e-6)
+    np.testing.assert_allclose(result['CLI_End'], result['CLI'][:, -1], atol=1e-6)
+    assert (result['Failures'] + result['Successes'] == result['Attempts']).all()
+
+
+def test_cli_stays_within_bounds():
+    cli = simulate(5_000, {'noise': 0.2, 'drift': 0.05}, seed=2, keep_paths=True)['CLI']
+    assert cli.min() >= 0.0
+    assert cli.max() <= DEFAULT_PARAMS['ceiling']
+
+
+def test_summary_is_reproducible_per_seed():
+    first = summarize(30_000, seed=3, chunk_size=10_000)
+    assert summarize(30_000, seed=3, chunk_size=10_000) == first
+    assert summarize(30_000, seed=4, chunk_size=10_000) != first
+
+
+def test_recorded_inputs_match_defaults():
+    # Fails when DEFAULT_PARAMS or the target change without re-recording
+    # the calibration, which would make calibrated_fail_increment re-run it
+    params = {key: value for key, value in DEFAULT_PARAMS.items()
+              if key != CALIBRATION_INPUTS['parameter']}
+    assert CALIBRATION_INPUTS['params'] == params
+    assert CALIBRATION_INPUTS['target'] == TARGET_GROWTH_RATE
+    assert CALIBRATION_INPUTS['years'] == YEARS
+    assert calibrated_fail_increment() == CALIBRATED_FAIL_INCREMENT
+
+
+def test_small_calibration_reproduces_recorded_value():
+    value, summary = calibrate(n_countries=20_000, seed=0, xtol=1e-5)
+    assert summary['growth_rate_mean'] == pytest.approx(TARGET_GROWTH_RATE, abs=1e-6)
+    # Seed-to-seed standard deviation is ~0.00006 at this sample size
+    assert value == pytest.approx(CALIBRATED_FAIL_INCREMENT, abs=3e-4)
+
+
+def test_stale_record_recalibrates(monkeypatch):
+    calls = []
+    monkeypatch.setitem(fossilization_sim.DEFAULT_PARAMS, 'attempt_prob', 0.5)
+    monkeypatch.setattr(fossilization_sim, 'calibrate', lambda *args, **kwargs: calls.append(kwargs) or (0.01, {}))
+    calibrated_fail_increment.cache_clear()
+    try:
+        assert calibrated_fail_increment() == 0.01
+    finally:
+        calibrated_fail_increment.cache_clear()
+    assert calls[0]['n_countries'] == CALIBRATION_INPUTS['n_countries']
+    assert calls[0]['seed'] == CALIBRATION_INPUTS['seed']
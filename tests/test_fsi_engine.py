@@ -0,0 +1,56 @@
+"""Panel FSI engine against calculate_fsi_colombia and its capacity schedules"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from colombia_h1_analysis import calculate_fsi_colombia
+from fsi_engine import (CAPACITY_COLUMN, colombia_fiscal_panel, crisis_summary, load_fiscal_panel,
+                        score_fiscal_panel, simulate_fiscal_panel)
+
+
+def test_colombia_panel_matches_case():
+    reference, _ = calculate_fsi_colombia()
+    scored = score_fiscal_panel(colombia_fiscal_panel())
+    np.testing.assert_allclose(scored['FSI'], reference, rtol=1e-12)
+    assert scored['Crisis'].tolist() == (np.asarray(reference) < 0.50).tolist()
+
+
+def test_capacity_schedule_is_an_as_of_join():
+    panel = pd.DataFrame({'Country': ['A', 'A', 'A', 'B', 'B'],
+                          'Year': [2018.0, 2020.0, 2021.5, 2015.0, 2022.0],
+                          'Revenue_GDP_%': 20.0, 'Spending_GDP_%': 25.0, 'Debt_GDP_%': 50.0})
+    schedule = pd.DataFrame({'Country': ['A', 'A', 'B'], 'Year': [2019, 2021, 2016],
+                             CAPACITY_COLUMN: [50.0, 40.0, 60.0]})
+    scored = score_fiscal_panel(panel, debt_capacity=schedule)
+    np.testing.assert_array_equal(scored[CAPACITY_COLUMN], [np.nan, 50.0, 40.0, np.nan, 60.0])
+    np.testing.assert_allclose(scored['FSI'].iloc[[1, 2, 4]], [0.8, 0.64, 0.96])
+
+    by_country = score_fiscal_panel(panel, debt_capacity={'A': 25.0, 'B': 100.0})
+    np.testing.assert_allclose(by_country['FSI'], [0.4, 0.4, 0.4, 1.6, 1.6])
+    np.testing.assert_allclose(by_country['Deficit_GDP_%'], 5.0)
+
+
+def test_load_renames_and_validates(tmp_path):
+    panel = simulate_fiscal_panel(countries=3, years=(2000, 2003), seed=1)
+    path = tmp_path / 'panel.csv.gz'
+    panel.rename(columns={'Country': 'iso3', 'Revenue_GDP_%': 'rev'}).to_csv(path, index=False)
+    loaded = load_fiscal_panel(path, columns={'iso3': 'Country', 'rev': 'Revenue_GDP_%'})
+    pd.testing.assert_frame_equal(loaded, panel, check_categorical=False, check_dtype=False)
+
+    panel.drop(columns='Debt_GDP_%').to_csv(tmp_path / 'bad.csv', index=False)
+    with pytest.raises(KeyError, match='Debt_GDP_%'):
+        load_fiscal_panel(tmp_path / 'bad.csv')
+
+
+def test_crisis_summary():
+    panel = pd.DataFrame({'Country': ['A', 'A', 'A', 'B'], 'Year': [2000, 2001, 2002, 2000],
+                          'Revenue_GDP_%': [20.0, 20.0, 20.0, 30.0], 'Spending_GDP_%': 25.0,
+                          'Debt_GDP_%': [40.0, 90.0, 60.0, 20.0]})
+    summary = crisis_summary(score_fiscal_panel(panel))
+    assert summary.loc['A', 'Crisis_Periods'] == 1
+    assert summary.loc['A', 'First_Crisis_Year'] == 2001
+    assert summary.loc['A', 'Latest_Year'] == 2002
+    assert not summary.loc['A', 'Latest_Crisis']
+    assert summary.loc['B', 'Crisis_Periods'] == 0
+    assert np.isnan(summary.loc['B', 'First_Crisis_Year'])
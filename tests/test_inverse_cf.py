@@ -0,0 +1,62 @@
+"""Inverse solver: required components reproduce the target CF"""
+
+import numpy as np
+import pytest
+
+from cf_engine import COMPONENTS, classify_cf, score_panel
+from inverse_cf import band_targets, minimal_change, required_popular_support, solve_component, solve_joint
+
+
+@pytest.fixture(scope='module')
+def panel():
+    rng = np.random.default_rng(0)
+    return rng.uniform([0.05, 0.05, 0.1, 0.2, 0.2], [0.95, 0.8, 0.7, 0.9, 0.9], (5_000, 5))
+
+
+@pytest.mark.parametrize('band', [0, 1, 2, 3])
+def test_targets_fall_in_band(panel, band):
+    target, sign = band_targets(score_panel(panel), band)
+    assert (classify_cf(target) == band).all()
+    assert ((sign == 0) == (classify_cf(score_panel(panel)) == band)).all()
+
+
+@pytest.mark.parametrize('component', COMPONENTS)
+def test_single_component_reproduces_target(panel, component):
+    target, sign = band_targets(score_panel(panel), 2)
+    required = solve_component(panel, component, target)
+    solved = np.isfinite(required)
+    assert solved[sign != 0].any()
+
+    moved = panel.copy()
+    moved[:, COMPONENTS.index(component)] = np.where(solved, required, moved[:, COMPONENTS.index(component)])
+    np.testing.assert_allclose(score_panel(moved)[solved], target[solved], rtol=1e-10)
+    assert (classify_cf(score_panel(moved)[solved]) == 2).all()
+    assert ((required[solved] >= 0) & (required[solved] <= 1)).all()
+
+
+def test_joint_step_is_minimal(panel):
+    target, sign = band_targets(score_panel(panel), 3)
+    delta, moved = solve_joint(panel, ['SP', 'CLI'], target, sign)
+    reached = np.isfinite(delta) & (sign != 0)
+    assert reached.any()
+    assert (classify_cf(score_panel(moved)[reached]) == 3).all()
+
+    # A slightly smaller step falls short of the target CF
+    smaller = panel.copy()
+    idx = [COMPONENTS.index('SP'), COMPONENTS.index('CLI')]
+    smaller[:, idx] = np.clip(panel[:, idx] + (delta * (1 - 1e-6))[:, None] * [1, -1], 0, 1)
+    assert (score_panel(smaller)[reached] < target[reached]).all()
+
+
+def test_cheapest_lever_has_smallest_change(panel):
+    result = minimal_change(panel, 1)
+    deltas = np.column_stack([np.abs(result['delta'][c]) for c in COMPONENTS])
+    for i in np.flatnonzero(result['cheapest'] != None):  # noqa: E711
+        assert abs(result['delta'][result['cheapest'][i]][i]) == np.nanmin(deltas[i])
+    assert (result['cheapest'][result['sign'] == 0] == None).all()  # noqa: E711
+
+
+def test_required_popular_support_inverts_sp():
+    support = required_popular_support((0.38 + 0.33 + 0.20) / 3, 0.33, 0.20)
+    assert support == pytest.approx(0.38)
+    assert np.isnan(required_popular_support(0.9, 0.33, 0.20))
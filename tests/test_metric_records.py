@@ -0,0 +1,75 @@
+"""Struct-of-arrays metric table: growth, record views, scoring and round trips"""
+
+import numpy as np
+import pytest
+
+from cf_engine import constitutional_fitness
+from chile_h2_analysis import run_h2_chile
+from colombia_h1_analysis import run_h1_colombia
+from metric_records import METRIC_FIELDS, PROJECTION, MetricTable
+
+
+@pytest.fixture
+def table():
+    rng = np.random.default_rng(0)
+    n = 3_000
+    return MetricTable(capacity=8).extend(
+        rng.choice(['Chile', 'Colombia', 'Argentina'], n), rng.integers(1990, 2026, n), np.arange(n),
+        PROJECTION, SP=rng.uniform(0.2, 0.9, n), CLI=rng.uniform(0.2, 0.9, n),
+        Gap=rng.uniform(0.05, 0.8, n), CD=rng.uniform(0.1, 0.7, n), PE=rng.uniform(0.05, 0.95, n))
+
+
+def test_grows_and_keeps_rows(table):
+    assert len(table) == 3_000
+    assert table.capacity >= 3_000
+    assert table.nbytes == 37 * 3_000
+    assert np.isnan(table.column('FSI')).all()
+
+
+def test_score_matches_cf_engine(table):
+    table.score(chunk_size=1_000)
+    expected = constitutional_fitness(*(table.column(name).astype(np.float64)
+                                        for name in ('PE', 'Gap', 'CD', 'SP', 'CLI')))
+    np.testing.assert_allclose(table.column('CF'), expected, rtol=1e-6)
+
+
+def test_record_view_reads_and_writes_in_place(table):
+    record = table[5]
+    assert record.year == table.column('year')[5]
+    assert record.provenance == PROJECTION
+    record.SP = 0.25
+    assert table.column('SP')[5] == np.float32(0.25)
+    assert table[-1].scenario == len(table) - 1
+    with pytest.raises(IndexError):
+        table[len(table)]
+    with pytest.raises(AttributeError):
+        record.Unknown
+
+
+def test_where_selects_keys(table):
+    chile = table.where(country='Chile', year=[2000, 2001])
+    assert len(chile) > 0
+    assert {r.country for r in chile} == {'Chile'}
+    assert set(chile.column('year')) <= {2000, 2001}
+    assert len(table.where(country='Peru')) == 0
+
+
+def test_case_results_round_trip(tmp_path):
+    colombia, chile = run_h1_colombia(), run_h2_chile()
+    table = MetricTable.from_results([colombia, chile], dtype=np.float64)
+    frame = table.to_frame()
+    np.testing.assert_allclose(frame.loc[frame['Country'] == 'Colombia', 'CF'], colombia.cf)
+    np.testing.assert_allclose(frame.loc[frame['Country'] == 'Colombia', 'FSI'], colombia.fsi)
+    assert np.isnan(frame.loc[frame['Country'] == 'Chile', 'FSI']).all()
+
+    table.save(tmp_path / 'metrics.npz')
+    loaded = MetricTable.load(tmp_path / 'metrics.npz')
+    assert loaded.dtype == np.float64
+    assert loaded.to_frame().equals(frame)
+    assert MetricTable.from_frame(frame, dtype=np.float64).to_frame()[list(METRIC_FIELDS)].equals(
+        frame[list(METRIC_FIELDS)])
+
+
+def test_unknown_metric_raises():
+    with pytest.raises(KeyError):
+        MetricTable().extend('Chile', 2022, Fitness=0.1)
@@ -0,0 +1,57 @@
+"""Chunked streaming propagation against an in-memory sample of the same draws"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cf_engine import COMPONENTS, constitutional_fitness
+from monte_carlo_cf import (CHILE_2022_INPUTS, ESTIMATION, VERIFIED, _draw_chunk, chile_2022_model, draw,
+                            propagate, propagate_panel, tagged)
+
+QS = (0.05, 0.50, 0.95)
+
+
+def test_propagate_matches_direct_sample():
+    n, chunk = 200_000, 50_000
+    summary = propagate(CHILE_2022_INPUTS, chile_2022_model, n_draws=n, chunk_size=chunk, seed=1, qs=QS)
+
+    # Same generator, same chunk order: the streamed draws are exactly these
+    rng = np.random.default_rng(1)
+    chunks = [_draw_chunk(CHILE_2022_INPUTS, chile_2022_model, rng, chunk) for _ in range(n // chunk)]
+    for name in COMPONENTS + ('CF',):
+        sample = np.concatenate([c[name] for c in chunks])
+        row = summary.loc[name]
+        assert row['Mean'] == pytest.approx(sample.mean(), rel=1e-9)
+        assert row['Std'] == pytest.approx(sample.std(ddof=1), rel=1e-6, abs=1e-12)
+        assert (row['Min'], row['Max']) == (sample.min(), sample.max())
+        # Histogram interpolation: within a small fraction of the spread
+        spread = max(sample.max() - sample.min(), 1e-12)
+        np.testing.assert_allclose([row[f'q{q*100:g}'] for q in QS], np.quantile(sample, QS),
+                                   atol=1e-3 * spread)
+
+
+def test_verified_inputs_are_fixed():
+    inputs = {name: tagged(value, VERIFIED) for name, value in
+              zip(COMPONENTS, (0.6, 0.3, 0.2, 0.5, 0.4))}
+    summary = propagate(inputs, n_draws=1_000, seed=0, qs=QS)
+    assert summary.loc['CF', 'Std'] == pytest.approx(0.0, abs=1e-12)
+    assert summary.loc['CF', 'q50'] == pytest.approx(constitutional_fitness(0.6, 0.3, 0.2, 0.5, 0.4))
+
+
+def test_propagate_panel_matches_direct_sample():
+    panel = pd.DataFrame({'Country': ['A', 'B', 'C'], 'Year': [2000, 2010, 2020],
+                          'PE': [0.62, 0.40, 0.15], 'Gap': [0.12, 0.45, 0.80],
+                          'CD': [0.35, 0.50, 0.60], 'SP': [0.47, 0.30, 0.38],
+                          'CLI': [0.45, 0.60, 0.81]})
+    n = 100_000
+    out = propagate_panel(panel, n_draws=n, chunk_size=120_000, seed=2, qs=QS)
+    np.testing.assert_allclose(out['CF_point'], constitutional_fitness(*panel[list(COMPONENTS)].to_numpy().T))
+
+    rng = np.random.default_rng(3)
+    for i, row in panel.iterrows():
+        cf = constitutional_fitness(*(draw(tagged(row[name], ESTIMATION), rng, n) for name in COMPONENTS))
+        # Independent samples: agree within Monte Carlo error
+        assert out.loc[i, 'Mean'] == pytest.approx(cf.mean(), abs=5 * cf.std() / np.sqrt(n))
+        assert out.loc[i, 'Std'] == pytest.approx(cf.std(), rel=0.02)
+        np.testing.assert_allclose(out.loc[i, [f'q{q*100:g}' for q in QS]].to_numpy(dtype=float),
+                                   np.quantile(cf, QS), rtol=0.02)
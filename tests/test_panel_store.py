@@ -0,0 +1,74 @@
+"""Panel store round trip, conflict detection and CSV staleness"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from panel_store import (ESTIMATION, PROJECTION, build_store_from_csv, current_store, open_store,
+                         write_store)
+
+
+@pytest.fixture
+def long_df():
+    rng = np.random.default_rng(4)
+    years = np.arange(1991, 2026)
+    frames = [
+        pd.DataFrame({'Country': country, 'Year': years, 'Metric': metric,
+                      'Provenance': ESTIMATION, 'Value': rng.random(len(years))})
+        for country in ('Colombia', 'Argentina') for metric in ('CF', 'CLI')
+    ]
+    df = pd.concat(frames, ignore_index=True)
+    return df.sample(frac=1, random_state=0, ignore_index=True)
+
+
+def test_round_trip(tmp_path, long_df):
+    store = open_store(write_store(long_df, tmp_path))
+    assert len(store) == len(long_df)
+    assert sorted(store.countries) == ['Argentina', 'Colombia']
+
+    expected = long_df.sort_values(['Metric', 'Country', 'Year'], ignore_index=True)
+    scanned = store.scan()
+    scanned['Year'] = scanned['Year'].astype(np.int64)
+    pd.testing.assert_frame_equal(scanned[list(expected.columns)], expected, check_dtype=False)
+
+    years, values = store.series('Colombia', 'CLI')
+    reference = long_df[(long_df['Country'] == 'Colombia') & (long_df['Metric'] == 'CLI')].sort_values('Year')
+    np.testing.assert_array_equal(years, reference['Year'])
+    np.testing.assert_array_equal(values, reference['Value'])
+
+    subset = store.scan(metric='CF', country='Argentina', years=(2000, 2004))
+    assert subset['Year'].tolist() == list(range(2000, 2005))
+
+
+def test_exact_repeats_are_dropped(tmp_path, long_df):
+    store = open_store(write_store(pd.concat([long_df, long_df.head(10)]), tmp_path))
+    assert len(store) == len(long_df)
+
+
+@pytest.mark.parametrize('column, value', [('Value', -1.0), ('Provenance', PROJECTION)])
+def test_conflicting_cells_raise(tmp_path, long_df, column, value):
+    conflict = long_df.head(1).copy()
+    conflict[column] = value
+    with pytest.raises(ValueError, match='conflicting rows'):
+        write_store(pd.concat([long_df, conflict]), tmp_path)
+
+
+def test_current_store_rebuilds_after_csv_change(tmp_path):
+    results, path = tmp_path / 'results', tmp_path / 'store'
+    results.mkdir()
+    sources = (('cf.csv', 'Colombia', ESTIMATION),)
+    pd.DataFrame({'Year': [1991, 2025], 'CF': [0.2, 0.5]}).to_csv(results / 'cf.csv', index=False)
+
+    assert current_store(path, results, sources) is None
+    store = current_store(path, results, sources, build=True)
+    assert store.series('Colombia', 'CF')[1].tolist() == [0.2, 0.5]
+
+    pd.DataFrame({'Year': [1991, 2025], 'CF': [0.2, 0.6]}).to_csv(results / 'cf.csv', index=False)
+    assert open_store(path).series('Colombia', 'CF')[1].tolist() == [0.2, 0.5]
+    assert current_store(path, results, sources).series('Colombia', 'CF')[1].tolist() == [0.2, 0.6]
+
+
+def test_case_csvs_build_without_conflicts(tmp_path):
+    store = open_store(build_store_from_csv(path=tmp_path))
+    assert {'Colombia', 'Chile', 'Argentina'} <= set(store.countries)
+    assert store.manifest['sources']
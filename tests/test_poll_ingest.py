@@ -0,0 +1,44 @@
+"""poll_ingest results do not depend on the chunk size"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from poll_ingest import ingest
+
+
+@pytest.fixture(scope='module')
+def poll_file(tmp_path_factory):
+    rng = np.random.default_rng(3)
+    n = 600
+    df = pd.DataFrame({
+        'country': rng.choice(['Chile', 'Colombia'], n),
+        'date': rng.choice(['2022-08-15', '2022-09-01', '2025-06-30'], n),
+        'weight': rng.uniform(0.2, 3.0, n),
+        'support': rng.choice(['Apruebo', 'Rechazo', 'no sabe'], n),
+        'group': rng.choice(['elite', 'public', None], n, p=[0.1, 0.8, 0.1])
+    })
+    path = tmp_path_factory.mktemp('polls') / 'poll.csv'
+    df.to_csv(path, index=False)
+    return path, df
+
+
+def test_chunk_size_invariant(poll_file):
+    path, _ = poll_file
+    reference = ingest(path, chunk_size=10_000)
+    for chunk_size in (1, 7, 333, 599):
+        result = ingest(path, chunk_size=chunk_size)
+        pd.testing.assert_index_equal(result.index, reference.index)
+        assert result['N'].dtype == np.int64
+        np.testing.assert_array_equal(result['N'], reference['N'])
+        np.testing.assert_allclose(result[['W', 'W2', 'Mean', 'M2']], reference[['W', 'W2', 'Mean', 'M2']],
+                                   rtol=1e-9)
+
+
+def test_missing_group_counts_as_popular(poll_file):
+    path, df = poll_file
+    answered = df[df['support'] != 'no sabe']
+    result = ingest(path)
+    assert result['N'].sum() == len(answered)
+    popular = result.xs('popular', level='Group')['N'].sum()
+    assert popular == (answered['group'] != 'elite').sum()
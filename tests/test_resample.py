@@ -0,0 +1,74 @@
+"""Lazy resampling: interpolation methods, caching and the common time base"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from panel_store import ESTIMATION, open_store, write_store
+from resample import Resampler, fit_interpolator
+
+
+@pytest.fixture
+def long_df():
+    rows = []
+    for year, cli in zip([1991, 1995, 2000, 2005, 2010], [0.30, 0.36, 0.40, 0.41, 0.45]):
+        rows.append(('Colombia', year, 'CLI', cli))
+    for year, cli in zip([1949, 1976, 1994, 2002], [0.45, 0.60, 0.70, 0.78]):
+        rows.append(('Argentina', year, 'CLI', cli))
+    for year, cf in zip([1991, 2000, 2010], [0.50, 0.40, 0.20]):
+        rows.append(('Colombia', year, 'CF', cf))
+    df = pd.DataFrame(rows, columns=['Country', 'Year', 'Metric', 'Value'])
+    return df.assign(Provenance=ESTIMATION)
+
+
+def test_linear_matches_interp_and_is_nan_outside(long_df):
+    resampler = Resampler.from_long(long_df)
+    years, values = resampler.series('Colombia', 'CLI')
+    assert (years[0], years[-1]) == (1991, 2010)
+    np.testing.assert_allclose(values, np.interp(years, [1991, 1995, 2000, 2005, 2010],
+                                                 [0.30, 0.36, 0.40, 0.41, 0.45]))
+    assert np.isnan(resampler.at('Colombia', 'CLI', [1990, 2011])).all()
+
+    extrapolating = Resampler.from_long(long_df, extrapolate=True)
+    assert extrapolating.at('Colombia', 'CLI', 2015)[()] == pytest.approx(0.45 + 5 * 0.04 / 5)
+
+
+@pytest.mark.parametrize('method', ['pchip', 'spline'])
+def test_cubic_methods_hit_observations(method):
+    years = np.array([1991, 1995, 2000, 2005, 2010])
+    values = np.array([0.30, 0.36, 0.40, 0.41, 0.45])
+    func, _ = fit_interpolator(years, values, method)
+    np.testing.assert_allclose(func(years.astype(float)), values, atol=1e-12)
+    if method == 'pchip':
+        assert (np.diff(func(np.arange(1991, 2010.01, 0.25))) >= 0).all()
+
+
+def test_series_are_fitted_lazily_and_cached(long_df):
+    resampler = Resampler.from_long(long_df, max_cached=1)
+    assert resampler.stats == {'fits': 0, 'grid_hits': 0, 'grid_misses': 0}
+
+    first = resampler.series('Colombia', 'CLI')
+    assert resampler.series('Colombia', 'CLI')[1] is first[1]
+    resampler.series('Argentina', 'CLI')      # evicts Colombia's grid
+    resampler.series('Colombia', 'CLI')       # rebuilt, interpolator reused
+    assert resampler.stats == {'fits': 2, 'grid_hits': 1, 'grid_misses': 3}
+    with pytest.raises(ValueError):
+        first[1][0] = 0.0
+
+
+def test_frame_puts_series_on_a_common_grid(long_df):
+    frame = Resampler.from_long(long_df).frame(years=(1990, 2010))
+    colombia = frame[frame['Country'] == 'Colombia'].set_index('Year')
+    argentina = frame[frame['Country'] == 'Argentina'].set_index('Year')
+    assert colombia.index.tolist() == list(range(1990, 2011))
+    assert np.isnan(colombia.loc[1990, 'CLI'])
+    assert colombia.loc[1993, 'CLI'] == pytest.approx(0.33)
+    assert colombia.loc[2005, 'CF'] == pytest.approx(0.30)
+    assert np.isnan(argentina.loc[2005, 'CLI'])
+    assert 'CF' not in argentina.dropna(axis=1, how='all').columns
+
+
+def test_store_and_frame_sources_agree(tmp_path, long_df):
+    from_store = Resampler.from_store(open_store(write_store(long_df, tmp_path)), step=0.5)
+    from_long = Resampler.from_long(long_df, step=0.5)
+    pd.testing.assert_frame_equal(from_store.frame(), from_long.frame())
@@ -0,0 +1,71 @@
+"""Score cache: hit/miss/eviction accounting, quantized keys and scorer defaults"""
+
+import numpy as np
+import pytest
+from scipy.special import expit
+
+from argentina_paradox_analysis import run_argentina_paradox
+from cf_engine import constitutional_fitness
+from chile_h2_analysis import run_h2_chile
+from colombia_h1_analysis import run_h1_colombia
+from score_cache import ScoreCache
+
+ARGS = dict(pe=0.62, gap=0.12, cd=0.35, sp=0.47, cli=0.45)
+
+
+def test_hits_misses_and_evictions():
+    cache = ScoreCache(maxsize=2)
+    cache.cf(**ARGS)
+    cache.cf(**ARGS)
+    assert (cache.hits, cache.misses, cache.evictions, len(cache)) == (1, 1, 0, 1)
+
+    cache.cf(**{**ARGS, 'sp': 0.50})
+    cache.cf(**ARGS)                          # refreshes ARGS: sp=0.50 is now oldest
+    cache.cf(**{**ARGS, 'sp': 0.55})          # evicts sp=0.50
+    assert (cache.hits, cache.misses, cache.evictions, len(cache)) == (2, 3, 1, 2)
+    cache.cf(**ARGS)
+    cache.cf(**{**ARGS, 'sp': 0.50})
+    assert cache.stats == {'hits': 3, 'misses': 4, 'evictions': 2, 'size': 2, 'maxsize': 2,
+                           'hit_rate': 3 / 7}
+
+    cache.clear()
+    assert cache.stats['size'] == cache.stats['hits'] == 0
+
+
+def test_quantized_keys_share_entries():
+    cache = ScoreCache(quantum=1e-3)
+    first = cache.cf(**ARGS)
+    assert cache.cf(**{**ARGS, 'sp': 0.47 + 4e-4}) == first
+    assert cache.hits == 1
+    assert cache.cf(**{**ARGS, 'sp': 0.47 + 6e-4}) != first
+    assert cache.misses == 2
+    # Argument order and defaults do not change the key
+    assert cache.key('cf', dict(reversed(list(ARGS.items())))) == cache.key('cf', ARGS)
+    assert cache.key('success', {'support': 0.5}) == cache.key('success', {'support': 0.5, 'steepness': 15.0})
+
+
+def test_hit_equals_fresh_computation_on_snapped_inputs():
+    cache = ScoreCache(quantum=1e-2)
+    value = cache.cf(pe=0.623, gap=0.12, cd=0.35, sp=0.468, cli=0.45)
+    assert value == pytest.approx(constitutional_fitness(0.62, 0.12, 0.35, 0.47, 0.45), rel=1e-12)
+    assert ScoreCache(quantum=1e-2).cf(pe=0.62, gap=0.12, cd=0.35, sp=0.47, cli=0.45) == value
+
+
+def test_defaults_reproduce_case_analyses():
+    cache = ScoreCache()
+    chile, colombia, argentina = run_h2_chile(), run_h1_colombia(), run_argentina_paradox()
+    assert cache.cf_chile() == pytest.approx(chile.cf[0], rel=1e-5)
+    assert cache.cli_colombia() == pytest.approx(colombia.cli[-1], rel=1e-5)
+    assert cache.fsi() == pytest.approx(colombia.fsi[-1], rel=1e-5)
+    assert cache.cf_argentina() == pytest.approx(argentina.cf[-1], rel=1e-5)
+    supports = np.linspace(0.2, 0.95, 7)
+    np.testing.assert_allclose([cache.success(support=s) for s in supports],
+                               expit(15 * (supports - 0.58)), rtol=1e-5)
+
+
+def test_bad_arguments_raise():
+    cache = ScoreCache()
+    with pytest.raises(TypeError, match='missing'):
+        cache.cf(pe=0.5)
+    with pytest.raises(TypeError, match='unexpected'):
+        cache.sp(popular=0.5)
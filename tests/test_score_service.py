@@ -0,0 +1,106 @@
+"""score_service input validation, failure isolation and JSON safety"""
+
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from score_service import MicroBatcher, ScoreService, dump_json, validate
+
+
+def _request(service, metric, payload):
+    async def run():
+        service.batchers = {metric: MicroBatcher(metric, max_delay=0.0)}
+        task = asyncio.create_task(service.batchers[metric].run())
+        try:
+            return await service.dispatch('POST', f'/score/{metric}', json.dumps(payload).encode())
+        finally:
+            task.cancel()
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize('inputs, message', [
+    ({'debt': 'x'}, 'must be a number'),
+    ({'debt': True}, 'must be a number'),
+    ({'debt': 10 ** 400}, 'out of range'),
+    ({'debt': 50, 'bogus': 1}, 'unknown argument'),
+    ([1, 2], 'JSON object')
+])
+def test_bad_input_is_400(inputs, message):
+    status, payload = _request(ScoreService(), 'fsi', inputs)
+    assert status == 400
+    assert message in payload['error']
+
+
+def test_non_finite_arguments_rejected():
+    row, error = validate('fsi', {'debt': float('inf')})
+    assert row is None and 'finite' in error
+
+
+def test_non_finite_result_is_null():
+    status, payload = _request(ScoreService(), 'fsi', {'debt': 0})
+    assert status == 200
+    assert payload['value'] is None
+    assert b'Infinity' not in dump_json(payload)
+
+
+def test_list_request():
+    status, payload = _request(ScoreService(), 'fsi', [{'debt': 50}, {'debt': 60}])
+    assert status == 200
+    assert [item['value'] for item in payload] == pytest.approx([19.7 / 31.7, 19.7 / 31.7 * 50 / 60])
+
+
+def test_failing_request_does_not_fail_batch():
+    batcher = MicroBatcher('fsi')
+
+    def fragile(revenue, spending, debt, debt_capacity):
+        if (debt < 0).any():
+            raise ValueError("negative debt")
+        return revenue / spending * debt_capacity / debt
+    batcher.func = fragile
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        good, bad = loop.create_future(), loop.create_future()
+        batcher.score([([[20.0, 30.0, 50.0, 50.0]], good), ([[20.0, 30.0, -1.0, 50.0]], bad)])
+        return good, bad
+    good, bad = asyncio.run(run())
+    assert good.result() == pytest.approx([20 / 30])
+    with pytest.raises(ValueError):
+        bad.result()
+
+
+def test_unexpected_error_is_500():
+    async def run():
+        service = ScoreService()
+
+        async def broken(method, path, body):
+            raise RuntimeError("boom")
+        service.dispatch = broken
+        reader = asyncio.StreamReader()
+        reader.feed_data(b'GET /health HTTP/1.1\r\nConnection: close\r\n\r\n')
+        reader.feed_eof()
+        sent = bytearray()
+
+        class Writer:
+            def write(self, data):
+                sent.extend(data)
+
+            async def drain(self):
+                pass
+
+            def close(self):
+                pass
+        await service.handle(reader, Writer())
+        return bytes(sent)
+    response = asyncio.run(run())
+    assert response.startswith(b'HTTP/1.1 500 Internal Server Error')
+    assert json.loads(response.split(b'\r\n\r\n', 1)[1])['error'] == 'RuntimeError: boom'
+
+
+def test_score_values_match_scorer():
+    status, payload = _request(ScoreService(), 'success', {'support': 0.58})
+    assert status == 200
+    assert payload['value'] == pytest.approx(0.5)
+    assert np.isfinite(payload['value'])
@@ -0,0 +1,47 @@
+"""Sobol indices on an analytic model, batched bootstrap, Colombia nominals"""
+
+import numpy as np
+import pytest
+
+from colombia_h1_analysis import run_h1_colombia
+from sensitivity_analysis import (COLOMBIA_NAMES, colombia_cf, colombia_nominal, make_problem,
+                                  sensitivity_report, sobol_indices)
+
+COEFFICIENTS = np.array([4.0, 2.0, 1.0, 0.0])
+
+
+def linear(X):
+    return X @ COEFFICIENTS
+
+
+def test_additive_model_indices():
+    # Uniform inputs of equal width: S1 = ST = a_i² / Σ a²
+    problem = {'names': ['a', 'b', 'c', 'd'], 'bounds': np.tile([0.0, 1.0], (4, 1))}
+    report = sensitivity_report(problem, linear, n=2**12, workers=1, seed=0).set_index('Input')
+    expected = COEFFICIENTS ** 2 / np.sum(COEFFICIENTS ** 2)
+    np.testing.assert_allclose(report.loc[['a', 'b', 'c', 'd'], 'S1'], expected, atol=0.02)
+    np.testing.assert_allclose(report.loc[['a', 'b', 'c', 'd'], 'ST'], expected, atol=0.02)
+    assert report.loc['d', 'ST'] == 0.0            # f(AB_d) == f(A) exactly
+    assert (report.loc[['a', 'b', 'c'], 'ST_conf'] > 0).all()
+
+
+def test_bootstrap_batches_do_not_change_result():
+    rng = np.random.default_rng(1)
+    f_a, f_b, f_ab = rng.random(300), rng.random(300), rng.random((5, 300))
+    whole = sobol_indices(f_a, f_b, f_ab, n_bootstrap=50, seed=2, batch_elements=10**9)
+    batched = sobol_indices(f_a, f_b, f_ab, n_bootstrap=50, seed=2, batch_elements=5 * 300 * 3)
+    for key in whole:
+        np.testing.assert_array_equal(whole[key], batched[key])
+
+
+@pytest.mark.parametrize('year_index', [0, 4, -1])
+def test_colombia_nominal_reproduces_case(year_index):
+    nominal = colombia_nominal(year_index)
+    assert tuple(nominal) == COLOMBIA_NAMES
+    cf = colombia_cf(np.array([list(nominal.values())]))
+    assert cf[0] == pytest.approx(run_h1_colombia().cf[year_index], rel=1e-12)
+
+
+def test_make_problem_clips_bounded_inputs():
+    problem = make_problem({'share': 0.9, 'w_share': 0.9}, rel=0.2, unbounded=('w_share',))
+    np.testing.assert_allclose(problem['bounds'], [[0.72, 1.0], [0.72, 1.08]])
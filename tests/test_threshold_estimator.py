@@ -0,0 +1,83 @@
+"""Batched IRLS logistic fits and the bootstrap threshold estimate"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.optimize import minimize
+from scipy.special import log_expit
+
+from threshold_estimator import (estimate_by_region, estimate_threshold, fit_logistic_batch,
+                                 simulate_reform_attempts)
+
+
+@pytest.fixture(scope='module')
+def cases():
+    return simulate_reform_attempts(400, threshold=0.58, steepness=15, seed=1)
+
+
+def test_batch_fit_matches_direct_mle(cases):
+    x, y = cases['Support'].to_numpy(), cases['Success'].to_numpy()
+    weights = np.random.default_rng(2).multinomial(len(x), np.full(len(x), 1 / len(x)), size=3)
+    beta, converged = fit_logistic_batch(x, y, weights)
+    assert converged.all()
+    for w, b in zip(weights, beta):
+        def nll(params):
+            eta = params[0] + params[1] * x
+            return -(w * (y * log_expit(eta) + (1 - y) * log_expit(-eta))).sum()
+        direct = minimize(nll, np.zeros(2), method='BFGS', options={'gtol': 1e-8}).x
+        np.testing.assert_allclose(b, direct, rtol=1e-4)
+
+
+def test_case_weights_equal_repeated_rows(cases):
+    x, y = cases['Support'].to_numpy(), cases['Success'].to_numpy()
+    counts = np.random.default_rng(3).integers(0, 3, len(x))
+    weighted, _ = fit_logistic_batch(x, y, counts[None, :])
+    repeated, _ = fit_logistic_batch(np.repeat(x, counts), np.repeat(y, counts),
+                                     np.ones((1, counts.sum())))
+    np.testing.assert_allclose(weighted, repeated, rtol=1e-8)
+
+
+def test_separated_samples_are_not_converged():
+    x = np.array([0.2, 0.3, 0.4, 0.6, 0.7, 0.8])
+    y = (x > 0.5).astype(float)
+    weights = np.array([
+        np.ones(6),                   # complete separation
+        [1, 1, 1, 1, 1, 0],           # still separated
+        [0, 0, 0, 1, 1, 1],           # one class only
+        [1, 1, 1, 1, 1, 1] * (1 - y),  # no successes
+    ])
+    _, converged = fit_logistic_batch(x, y, weights)
+    assert not converged.any()
+
+    # Swapping one pair makes the classes overlap: finite MLE again
+    y[[2, 3]] = y[[3, 2]]
+    _, converged = fit_logistic_batch(x, y, np.ones((1, 6)))
+    assert converged[0]
+
+
+def test_separated_replicates_are_dropped():
+    cases = pd.DataFrame({'Support': [0.2, 0.3, 0.45, 0.55, 0.5, 0.7, 0.8],
+                          'Success': [0, 0, 1, 0, 1, 1, 1]})
+    result = estimate_threshold(cases, n_bootstrap=300, seed=8)
+    assert result['converged']
+    assert 0 < result['n_valid'] < 300
+
+
+def test_estimate_recovers_simulated_threshold(cases):
+    result = estimate_threshold(cases, n_bootstrap=400, seed=4)
+    assert result['converged']
+    assert result['n_valid'] == 400
+    low, high = result['threshold_ci']
+    assert low < 0.58 < high
+    assert low < result['threshold'] < high
+    assert result['steepness_ci'][0] < 15 < result['steepness_ci'][1]
+
+
+def test_by_region_fits_each_group():
+    frames = [simulate_reform_attempts(300, threshold=t, seed=s).assign(Region=r)
+              for t, s, r in ((0.45, 5, 'Andes'), (0.70, 6, 'Cono Sur'))]
+    table = estimate_by_region(pd.concat(frames, ignore_index=True), n_bootstrap=200, seed=7)
+    assert list(table['Region']) == ['Andes', 'Cono Sur']
+    assert table['N'].tolist() == [300, 300]
+    assert table.loc[0, 'Threshold'] < table.loc[1, 'Threshold']
+    np.testing.assert_allclose(table['Threshold'], [0.45, 0.70], atol=0.05)
@@ -0,0 +1,83 @@
+"""Dashboard tiles: level-of-detail aggregation, budgets, rebuilds and the HTTP routes"""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+from trajectory_dashboard import (DashboardHandler, TileStore, build_tiles, load_or_build, simulate_panel,
+                                  tile_source)
+
+
+@pytest.fixture(scope='module')
+def panel():
+    return simulate_panel(countries=20, years=(1950, 2025), seed=3)
+
+
+@pytest.fixture(scope='module')
+def store(panel, tmp_path_factory):
+    path = tmp_path_factory.mktemp('tiles')
+    return TileStore(build_tiles(panel, path, tile_source(20, 3)))
+
+
+def test_level_zero_is_the_panel(panel, store):
+    view = store.series('CLI', ['C007'], budget=10**6)
+    assert view['level'] == 0 and view['bin_years'] == 1
+    rows = panel[(panel['Country'] == 'C007') & (panel['Metric'] == 'CLI')].sort_values('Year')
+    np.testing.assert_allclose(view['x'], rows['Year'])
+    np.testing.assert_allclose(view['bands']['C007'], rows[['q5', 'q50', 'q95']], rtol=1e-6)
+
+
+def test_coarse_levels_keep_the_envelope(panel, store):
+    rows = panel[(panel['Country'] == 'C011') & (panel['Metric'] == 'CF')].sort_values('Year')
+    fine = rows[['q5', 'q50', 'q95']].to_numpy()
+    coarse = np.load(store.path / 'CF_L3.npy')[store.countries.index('C011')]
+    for b, block in enumerate(np.array_split(fine, np.arange(8, len(fine), 8))):
+        assert coarse[b, 0] == pytest.approx(block[:, 0].min(), rel=1e-6)
+        assert coarse[b, 1] == pytest.approx(block[:, 1].mean(), rel=1e-5)
+        assert coarse[b, 2] == pytest.approx(block[:, 2].max(), rel=1e-6)
+
+
+def test_level_choice_respects_the_budget(store):
+    everyone = store.series('SP', store.countries, budget=400)
+    assert (len(store.countries) + 1) * len(everyone['x']) <= 400
+    assert everyone['level'] > 0
+    zoomed = store.series('SP', ['C001'], x0=2000, x1=2010, budget=400)
+    assert zoomed['level'] == 0
+    assert zoomed['x'][0] <= 2000 and zoomed['x'][-1] >= 2010
+    assert len(zoomed['x']) <= 13
+    with pytest.raises(KeyError):
+        store.series('SP', ['Atlantis'])
+
+
+def test_tiles_rebuild_when_the_source_changes(tmp_path):
+    first = load_or_build(tmp_path, synthetic=5, seed=1)
+    mtime = (tmp_path / 'CF_L0.npy').stat().st_mtime_ns
+    assert load_or_build(tmp_path, synthetic=5, seed=1).manifest['source'] == first.manifest['source']
+    assert (tmp_path / 'CF_L0.npy').stat().st_mtime_ns == mtime
+    rebuilt = load_or_build(tmp_path, synthetic=6, seed=1)
+    assert len(rebuilt.countries) == 6
+
+
+def test_http_routes(store):
+    handler = type('Handler', (DashboardHandler,), {'store': store})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    try:
+        with urllib.request.urlopen(f'{base}/manifest') as response:
+            assert json.load(response)['countries'] == store.countries
+        with urllib.request.urlopen(f'{base}/figure?metric=CF&countries=C001,C002&budget=500') as response:
+            figure = json.load(response)
+        assert figure['data']
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            urllib.request.urlopen(f'{base}/figure?metric=GDP')
+        assert exc.value.code == 400
+    finally:
+        server.shutdown()
+        server.server_close()